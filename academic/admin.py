@@ -1,10 +1,139 @@
 from django.contrib import admin
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils import timezone
+from django.utils.functional import cached_property
 
-# Register your models here.
-from django.contrib import admin
-from .models import Faculty, Paper, Project, Patent
+from .models import Faculty, Paper, PaperAuthorship, Project, Patent, PaperDuplicate
+from . import dataset, dedup
+
+
+# ----------------------------------------
+# Big changelists
+# ----------------------------------------
+# search_fields only use "=" (iexact) and "^" (istartswith): on PostgreSQL
+# both compile to UPPER(col) = / LIKE 'X%', which migration 0006 indexes.
+# Plain "icontains" would scan the whole table on every search.
+
+class EstimatedCountPaginator(Paginator):
+    """
+    COUNT(*) on a few million rows is most of a changelist page. For an
+    unfiltered list on PostgreSQL take the planner's row estimate once the
+    table is past ESTIMATE_ABOVE rows; filtered/searched lists and small
+    tables still get an exact count.
+    """
+    ESTIMATE_ABOVE = 100_000
+
+    @cached_property
+    def count(self):
+        qs = self.object_list
+        connection = connections[qs.db]
+        if connection.vendor == "postgresql" and not qs.query.where:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                    [qs.model._meta.db_table],
+                )
+                row = cursor.fetchone()
+            if row and row[0] > self.ESTIMATE_ABOVE:
+                return row[0]
+        return super().count
+
+
+class LargeTableAdmin(admin.ModelAdmin):
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False  # skips the second, unfiltered COUNT(*)
+    list_per_page = 50
+
+
+@admin.register(Faculty)
+class FacultyAdmin(LargeTableAdmin):
+    list_display = ("__str__", "faculty_id", "department", "total_citations", "is_approved", "profile_visibility")
+    list_filter = ("is_approved", "profile_visibility")
+    search_fields = ("^name", "^last_name", "=faculty_id", "=email")
+    autocomplete_fields = ("user",)
+
+
+class PaperAuthorshipInline(admin.TabularInline):
+    model = PaperAuthorship
+    extra = 0
+    autocomplete_fields = ("faculty",)
+    fields = ("faculty", "status", "decided_at")
+
+
+@admin.register(Paper)
+class PaperAdmin(LargeTableAdmin):
+    list_display = ("title", "doi", "journal", "tc_count", "date_published_online")
+    search_fields = ("=doi", "^title")
+    inlines = [PaperAuthorshipInline]  # authors go through PaperAuthorship
+
+
+@admin.register(PaperAuthorship)
+class PaperAuthorshipAdmin(LargeTableAdmin):
+    list_display = ("paper", "faculty", "status", "decided_at")
+    list_filter = ("status",)
+    list_select_related = ("paper", "faculty")
+    search_fields = ("=paper__doi", "^paper__title", "^faculty__name")
+    autocomplete_fields = ("paper", "faculty")
+    actions = ["mark_approved", "mark_rejected", "mark_pending"]
+
+    def get_queryset(self, request):
+        # the list only shows paper titles; don't drag every abstract along
+        return super().get_queryset(request).defer("paper__abstract")
+
+    def _set_status(self, request, queryset, status):
+        decided = None if status == "pending" else timezone.now()
+        n = queryset.exclude(status=status).update(status=status, decided_at=decided)
+        if n:
+            dataset.mark_changed(directory=True)  # .update() sends no signals
+        self.message_user(request, f"Marked {n} authorship(s) as {status}.")
+
+    @admin.action(description="Approve selected authorships")
+    def mark_approved(self, request, queryset):
+        self._set_status(request, queryset, "approved")
+
+    @admin.action(description="Reject selected authorships")
+    def mark_rejected(self, request, queryset):
+        self._set_status(request, queryset, "rejected")
+
+    @admin.action(description="Reset selected authorships to pending")
+    def mark_pending(self, request, queryset):
+        self._set_status(request, queryset, "pending")
+
+
+@admin.register(Project)
+class ProjectAdmin(admin.ModelAdmin):
+    list_display = ("title", "status", "start_date", "end_date")
+    search_fields = ("^title",)
+    autocomplete_fields = ("faculty",)
+
+
+@admin.register(Patent)
+class PatentAdmin(admin.ModelAdmin):
+    list_display = ("title", "patent_number", "filing_date", "issue_date")
+    search_fields = ("=patent_number", "^title")
+    autocomplete_fields = ("faculty",)
+
+
+@admin.register(PaperDuplicate)
+class PaperDuplicateAdmin(admin.ModelAdmin):
+    list_display = ("paper", "duplicate_of", "similarity", "status", "created_at")
+    list_filter = ("status",)
+    list_select_related = ("paper", "duplicate_of")
+    raw_id_fields = ("paper", "duplicate_of")
+    actions = ["merge_into_original", "dismiss"]
+
+    @admin.action(description="Merge paper into the one it duplicates")
+    def merge_into_original(self, request, queryset):
+        merged = 0
+        for pair in queryset.filter(status="pending").select_related("paper", "duplicate_of"):
+            if not PaperDuplicate.objects.filter(pk=pair.pk).exists():
+                continue  # its paper was already merged away earlier in this loop
+            dedup.merge_papers(pair.duplicate_of, pair.paper)
+            merged += 1
+        self.message_user(request, f"Merged {merged} duplicate paper(s).")
 
-admin.site.register(Faculty)
-admin.site.register(Paper)
-admin.site.register(Project)
-admin.site.register(Patent)
+    @admin.action(description="Not a duplicate")
+    def dismiss(self, request, queryset):
+        n = queryset.update(status="dismissed")
+        self.message_user(request, f"Dismissed {n} pair(s).")
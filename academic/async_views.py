@@ -0,0 +1,108 @@
+"""
+Async versions of the hot public read endpoints.
+
+Only useful when served by an ASGI server (see scoupdb/asgi.py): rows are
+fetched with Django's async ORM so a slow client or a slow query parks a
+coroutine instead of holding a whole worker. Responses have the same shape
+as the sync DRF views they mirror.
+"""
+from asgiref.sync import sync_to_async
+from django.db.models import Q
+from django.http import HttpResponse
+from django.views.decorators.http import require_GET
+from rest_framework.exceptions import AuthenticationFailed
+
+from .authentication import FacultyJWTAuthentication
+from .db_router import use_primary
+from .fastpath import cached_list, plan_for
+from .models import Faculty, Paper
+from .renderers import ORJSONRenderer
+from .serializers import (
+    FacultyProfileSerializer,
+    FacultySerializer,
+    prefetch_faculty_includes,
+    requested_includes,
+)
+
+SEARCH_LIMIT = 20
+
+
+def _json(data, status=200):
+    # the same orjson encoder the DRF views render with
+    return HttpResponse(ORJSONRenderer().render(data), status=status, content_type="application/json")
+
+
+async def _authenticate(request):
+    """Runs FacultyJWTAuthentication off the event loop; returns user or None."""
+    try:
+        result = await sync_to_async(FacultyJWTAuthentication().authenticate)(request)
+    except AuthenticationFailed:
+        return None
+    return result[0] if result else None
+
+
+def _faculty_rows(request, includes):
+    qs = prefetch_faculty_includes(Faculty.objects.filter(is_approved=True, profile_visibility=True), includes)
+    if includes:  # the derived lists need the full serializer, as in the sync view
+        return FacultySerializer(qs, many=True, context={"request": request}).data
+    return plan_for(FacultySerializer).rows(qs, request)
+
+
+@require_GET
+async def faculty_list(request):
+    # same .values() fast path and list cache as /api/faculty/, built in a
+    # thread: rendering the list on the event loop would stall every other
+    # request this worker is serving
+    includes = requested_includes(request)
+    data, outcome = await sync_to_async(cached_list)(
+        (request.path, tuple(sorted(includes))), request, FacultySerializer,
+        lambda: _faculty_rows(request, includes),
+    )
+    response = _json(data)
+    response["X-Cache"] = outcome
+    return response
+
+
+@use_primary
+@require_GET
+async def faculty_me(request):
+    user = await _authenticate(request)
+    if user is None:
+        return _json({"detail": "Authentication credentials were not provided."}, status=401)
+
+    faculty = getattr(user, "faculty", None)
+    if faculty is None:
+        return _json({"detail": "No faculty profile for this user."}, status=404)
+
+    # the lazy handle loads through the auth cache, so usually no query at all
+    def serialize():
+        try:
+            return FacultyProfileSerializer(faculty, context={"request": request}).data
+        except Faculty.DoesNotExist:
+            return None
+
+    data = await sync_to_async(serialize)()
+    if data is None:
+        return _json({"detail": "No faculty profile for this user."}, status=404)
+    return _json(data)
+
+
+@require_GET
+async def search(request):
+    q = (request.GET.get("q") or "").strip()
+    if not q:
+        return _json({"faculty": [], "papers": []})
+
+    faculty_qs = Faculty.objects.filter(
+        Q(name__icontains=q) | Q(first_name__icontains=q)
+        | Q(last_name__icontains=q) | Q(department__icontains=q),
+        is_approved=True, profile_visibility=True,
+    ).values("id", "name", "first_name", "last_name", "department", "title")[:SEARCH_LIMIT]
+    paper_qs = Paper.objects.filter(title__icontains=q).values(
+        "id", "doi", "title", "journal", "tc_count"
+    )[:SEARCH_LIMIT]
+
+    return _json({
+        "faculty": [f async for f in faculty_qs],
+        "papers": [p async for p in paper_qs],
+    })
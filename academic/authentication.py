@@ -0,0 +1,88 @@
+from django.conf import settings
+from django.utils.functional import SimpleLazyObject
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+
+from .cache import TTLCache
+from .models import Faculty
+
+FACULTY_ID_CLAIM = "faculty_id"            # Faculty pk (not the AcademicMetrics slug)
+
+# faculty rows looked up by authenticated requests, dropped on save (see
+# academic.signals) and after AUTH_CACHE_TTL seconds at the latest. Changes
+# made by other processes can be missed until then, so the cached rows are
+# for reads only; views load a fresh row before saving (views.get_faculty). The
+# User row itself is not cached: it is read on every request so that
+# deactivating an account takes effect in every worker at once.
+auth_cache = TTLCache(ttl=getattr(settings, "AUTH_CACHE_TTL", 30))
+
+
+def get_cached_faculty(pk=None, user_id=None):
+    key = ("faculty", pk) if pk is not None else ("faculty_of_user", user_id)
+    faculty = auth_cache.get(key)
+    if faculty is None:
+        lookup = {"pk": pk} if pk is not None else {"user_id": user_id}
+        faculty = Faculty.objects.get(**lookup)
+        auth_cache.set(key, faculty)
+    return faculty
+
+
+def invalidate_faculty(faculty):
+    auth_cache.delete(("faculty", faculty.pk))
+    if faculty.user_id:
+        auth_cache.delete(("faculty_of_user", faculty.user_id))
+
+
+def invalidate_user(user):
+    auth_cache.delete(("faculty_of_user", user.pk))
+
+
+class FacultyHandle(SimpleLazyObject):
+    """
+    request.user.faculty: the logged-in Faculty, loaded on first attribute
+    access. The pk is known from the token, so filtering by it
+    (Paper.objects.filter(authors=faculty.pk)) never needs a query.
+    """
+
+    def __init__(self, pk=None, user_id=None):
+        self.__dict__["_faculty_pk"] = pk
+        super().__init__(lambda: get_cached_faculty(pk=pk, user_id=user_id))
+
+    @property
+    def pk(self):
+        if self._faculty_pk is None:
+            self._setup()
+            self.__dict__["_faculty_pk"] = self._wrapped.pk
+        return self._faculty_pk
+
+    id = pk
+
+
+class FacultyTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """Adds the faculty pk to refresh + access tokens."""
+
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        token[FACULTY_ID_CLAIM] = Faculty.objects.filter(user=user).values_list("id", flat=True).first()
+        return token
+
+
+class FacultyJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that attaches a lazy faculty handle built from the
+    token claims, so an authenticated list request costs one user lookup
+    (is_active is checked by simplejwt) and no profile query.
+
+    Tokens issued before the faculty claims existed still work: the handle
+    falls back to looking the profile up by user id.
+    """
+
+    def get_user(self, validated_token):
+        user = super().get_user(validated_token)
+        if FACULTY_ID_CLAIM in validated_token:
+            fac_pk = validated_token[FACULTY_ID_CLAIM]
+            user.faculty = FacultyHandle(pk=fac_pk) if fac_pk is not None else None
+        else:
+            user.faculty = FacultyHandle(user_id=user.pk)
+        return user
@@ -0,0 +1,139 @@
+"""
+Single-flight cache for expensive public reads (the faculty list).
+
+Each key holds the last built value, the dataset version it was built
+from, and how long the build took. For a request:
+
+- fresh (same dataset version, within LIST_CACHE_TTL): served as is. Close
+  to expiry one request may rebuild early: the chance grows as expiry
+  nears and with how slow the build is (XFetch: rebuild when
+  now + build_time * BETA * -log(random()) >= expires), so a hot key is
+  usually refreshed before it ever expires.
+- expired or built from an older dataset version: one request (the
+  leader) rebuilds. While it does, everyone else gets the previous value
+  if it is less than LIST_CACHE_STALE seconds past expiry
+  (stale-while-revalidate), otherwise waits up to LIST_CACHE_WAIT seconds
+  for the leader's result and only then builds on its own.
+
+So after a cache expiry or an import (dataset version bump) each worker
+process runs one rebuild per key instead of one per concurrent request.
+Outcomes are counted (stats()) and sent back in the X-Cache header;
+`loadtest` tallies that header. LIST_CACHE_TTL = 0 turns caching off.
+"""
+import math
+import random
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+
+BETA = 1.0          # > 1 favours earlier refreshes
+MAX_KEYS = 256
+
+OUTCOMES = ("hit", "early", "stale", "coalesced", "miss", "timeout")
+
+
+class _Entry:
+    __slots__ = ("value", "version", "expires", "delta")
+
+    def __init__(self, value, version, expires, delta):
+        self.value = value
+        self.version = version
+        self.expires = expires
+        self.delta = delta
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.ok = False
+
+
+class SingleFlightCache:
+    def __init__(self, ttl, stale, wait):
+        self.ttl = ttl
+        self.stale = stale
+        self.wait = wait
+        self._entries = {}
+        self._flights = {}
+        self._lock = threading.Lock()
+        self.counts = Counter()
+
+    def _early(self, entry, now):
+        return now - entry.delta * BETA * math.log(1.0 - random.random()) >= entry.expires
+
+    def get(self, key, version, build):
+        """(value, outcome); build() is only called by the request that leads."""
+        if self.ttl <= 0:
+            value = build()
+            with self._lock:
+                return self._count(value, "miss")
+
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            flight = self._flights.get(key)
+            fresh = entry is not None and entry.version == version and now < entry.expires
+            if fresh and (flight is not None or not self._early(entry, now)):
+                return self._count(entry.value, "hit")
+            if flight is not None and entry is not None and now < entry.expires + self.stale:
+                return self._count(entry.value, "stale")
+            if flight is None:
+                flight = self._flights[key] = _Flight()
+                return self._lead(key, flight, version, build, "early" if fresh else "miss")
+
+        # someone else is building and there is nothing we may serve meanwhile
+        if flight.done.wait(self.wait) and flight.ok:
+            value, outcome = flight.value, "coalesced"
+        else:
+            value, outcome = build(), "timeout"
+        with self._lock:
+            return self._count(value, outcome)
+
+    def _lead(self, key, flight, version, build, outcome):
+        # called with the lock held; releases it around the build
+        self._lock.release()
+        try:
+            started = time.monotonic()
+            flight.value = build()
+            flight.ok = True
+            finished = time.monotonic()
+        finally:
+            self._lock.acquire()
+            del self._flights[key]
+            flight.done.set()
+        if flight.ok:
+            if key not in self._entries and len(self._entries) >= MAX_KEYS:
+                del self._entries[min(self._entries, key=lambda k: self._entries[k].expires)]
+            self._entries[key] = _Entry(flight.value, version, finished + self.ttl, finished - started)
+        return self._count(flight.value, outcome)
+
+    def _count(self, value, outcome):
+        # lock held
+        self.counts[outcome] += 1
+        return value, outcome
+
+    def stats(self):
+        with self._lock:
+            counts = {name: self.counts[name] for name in OUTCOMES}
+            counts["keys"] = len(self._entries)
+        requests = sum(counts[name] for name in OUTCOMES)
+        # served without a build of their own
+        counts["coalesced_total"] = counts["stale"] + counts["coalesced"]
+        counts["builds"] = counts["early"] + counts["miss"] + counts["timeout"]
+        counts["requests"] = requests
+        return counts
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.counts.clear()
+
+
+lists = SingleFlightCache(
+    ttl=getattr(settings, "LIST_CACHE_TTL", 60),
+    stale=getattr(settings, "LIST_CACHE_STALE", 300),
+    wait=getattr(settings, "LIST_CACHE_WAIT", 5),
+)
@@ -0,0 +1,74 @@
+"""
+Dataset version: one counter for "the public faculty/paper data changed".
+
+Writers call mark_changed() (the Faculty/Paper/PaperAuthorship signals do
+it for normal saves; bulk jobs call it themselves). Readers call current_version(),
+which hits the DB at most once every DATASET_VERSION_POLL seconds per
+process, and rebuild whatever they derived from the data when it moves.
+
+Changes that show in the public faculty directory or profiles (faculty
+rows, authorship decisions) pass directory=True, which also moves
+current_directory_version(): the static snapshot only rebuilds for those,
+not for every paper save.
+"""
+import threading
+import time
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import DatasetVersion
+
+_lock = threading.Lock()
+_cached = {"version": None, "directory_version": None, "checked": 0.0}
+
+
+def bump(directory=False):
+    changes = {"version": F("version") + 1, "updated_at": timezone.now()}
+    if directory:
+        changes["directory_version"] = F("directory_version") + 1
+    with transaction.atomic():
+        updated = DatasetVersion.objects.filter(pk=1).update(**changes)
+        if not updated:
+            DatasetVersion.objects.get_or_create(
+                pk=1, defaults={"version": 1, "directory_version": int(directory)}
+            )
+    with _lock:
+        _cached["checked"] = 0.0  # this process sees its own change right away
+
+
+def bump_directory():
+    bump(directory=True)
+
+
+def mark_changed(directory=False):
+    """Bump the version once the current transaction commits (once per transaction)."""
+    func = bump_directory if directory else bump
+    conn = transaction.get_connection()
+    if conn.in_atomic_block and any(f is func or f is bump_directory for _, f, _ in conn.run_on_commit):
+        return
+    transaction.on_commit(func)
+
+
+def _current():
+    poll = getattr(settings, "DATASET_VERSION_POLL", 10)
+    now = time.monotonic()
+    with _lock:
+        if _cached["version"] is not None and now - _cached["checked"] < poll:
+            return dict(_cached)
+    version, directory = (
+        DatasetVersion.objects.filter(pk=1).values_list("version", "directory_version").first() or (0, 0)
+    )
+    with _lock:
+        _cached.update(version=version, directory_version=directory, checked=now)
+        return dict(_cached)
+
+
+def current_version():
+    return _current()["version"]
+
+
+def current_directory_version():
+    return _current()["directory_version"]
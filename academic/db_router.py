@@ -0,0 +1,215 @@
+"""
+Primary / read-replica routing.
+
+Replicas come from DATABASE_REPLICA_URLS (comma separated) and show up as
+DATABASES["replica1"], ["replica2"], ... Nothing reads from them unless
+ReplicaRoutingMiddleware says the current request may:
+
+- only GET/HEAD/OPTIONS requests, plus views marked @replica_safe /
+  `replica_safe = True`: lookups that take a POST body but write nothing
+  (resolve_dois). Those don't pin the client either
+- not views marked with @use_primary / `use_primary = True` (the "my" views)
+- not session-cookie requests (the admin)
+- not a client that wrote within the last REPLICA_PIN_SECONDS
+  (read-your-writes). A successful write answers with a signed,
+  short-lived pin in two forms:
+  - the X-Primary-Pin response header. Cross-site API clients (the
+    frontend, calling with Bearer tokens) echo it back on their next
+    requests. The SameSite=Lax cookie never reaches us from another site.
+    It works across workers and instances without any shared state.
+  - a pin cookie, for same-site clients (the browsable API, anonymous
+    writers).
+  Bearer clients that send neither are also pinned by their
+  Authorization header, but only when the default cache is shared
+  between processes (REDIS_URL): a per-process LocMem pin would miss
+  whenever the next request lands on another worker.
+
+Everything else (writes, management commands such as import_full_dataset,
+the admin, anything inside transaction.atomic) stays on "default".
+
+Local check with two SQLite files:
+    export DATABASE_URL=sqlite:///primary.sqlite3
+    export DATABASE_REPLICA_URLS=sqlite:///replica.sqlite3
+    python manage.py runserver
+(copy primary.sqlite3 over replica.sqlite3 to "replicate").
+"""
+import hashlib
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core import signing
+from django.core.cache import cache
+from django.db import connections
+
+PRIMARY = "default"
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+_replica_reads_allowed = ContextVar("replica_reads_allowed", default=False)
+
+
+def replica_aliases():
+    return [alias for alias in settings.DATABASES if alias.startswith("replica")]
+
+
+@contextmanager
+def use_replicas(allowed=True):
+    token = _replica_reads_allowed.set(allowed)
+    try:
+        yield
+    finally:
+        _replica_reads_allowed.reset(token)
+
+
+def use_primary(view):
+    """Marks a view (function or class) as always reading from the primary."""
+    view.use_primary = True
+    return view
+
+
+def replica_safe(view):
+    """Marks a view (function or class) as read-only whatever its method: it may use replicas."""
+    view.replica_safe = True
+    return view
+
+
+def _marked(view_func, name):
+    view_class = getattr(view_func, "cls", None) or getattr(view_func, "view_class", None)
+    return getattr(view_func, name, False) or getattr(view_class, name, False)
+
+
+class PrimaryReplicaRouter:
+    def __init__(self, replicas=None):
+        self.replicas = replica_aliases() if replicas is None else list(replicas)
+
+    def db_for_read(self, model, **hints):
+        if not self.replicas or not _replica_reads_allowed.get():
+            return PRIMARY
+        if connections[PRIMARY].in_atomic_block:
+            # reads inside a write transaction must see its own rows
+            return PRIMARY
+        return random.choice(self.replicas)
+
+    def db_for_write(self, model, **hints):
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        pool = {PRIMARY, *self.replicas}
+        if obj1._state.db in pool and obj2._state.db in pool:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return None
+
+
+PIN_COOKIE = "primary_pin"
+PIN_HEADER = "X-Primary-Pin"
+_pin_signer = signing.TimestampSigner(salt="academic.db_router.pin")
+
+
+def _pin_key(request):
+    auth = request.META.get("HTTP_AUTHORIZATION", "")
+    if not auth or not cache_is_shared():
+        return None
+    return "primary-pin:" + hashlib.sha1(auth.encode()).hexdigest()
+
+
+def cache_is_shared():
+    backend = settings.CACHES["default"]["BACKEND"]
+    return not backend.endswith((".locmem.LocMemCache", ".dummy.DummyCache"))
+
+
+class ReplicaRoutingMiddleware:
+    # sync and async: under ASGI a sync-only middleware would push the
+    # async views into a thread
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.pin_seconds = getattr(settings, "REPLICA_PIN_SECONDS", 10)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+            self.process_view = self.aprocess_view  # else the handler runs it in a thread
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        request.replica_ok = self.replica_ok(request)
+        token = _replica_reads_allowed.set(False)
+        try:
+            response = self.get_response(request)
+        finally:
+            _replica_reads_allowed.reset(token)
+        self.pin(request, response)
+        return response
+
+    async def __acall__(self, request):
+        # the pin lookups go to the cache, which is a network hop when shared
+        shared = cache_is_shared()
+        if shared:
+            request.replica_ok = await sync_to_async(self.replica_ok)(request)
+        else:
+            request.replica_ok = self.replica_ok(request)
+        token = _replica_reads_allowed.set(False)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _replica_reads_allowed.reset(token)
+        if shared:
+            await sync_to_async(self.pin)(request, response)
+        else:
+            self.pin(request, response)
+        return response
+
+    def replica_ok(self, request, any_method=False):
+        return (
+            (any_method or request.method in SAFE_METHODS)
+            and settings.SESSION_COOKIE_NAME not in request.COOKIES
+            and not self.recently_wrote(request)
+        )
+
+    def pin(self, request, response):
+        wrote = request.method not in SAFE_METHODS and not getattr(request, "replica_safe", False)
+        if wrote and response.status_code < 400:
+            response[PIN_HEADER] = _pin_signer.sign("1")
+            response.set_cookie(
+                PIN_COOKIE, "1", max_age=self.pin_seconds, httponly=True,
+                samesite="Lax", secure=settings.SESSION_COOKIE_SECURE,
+            )
+            key = _pin_key(request)
+            if key:
+                cache.set(key, True, self.pin_seconds)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.replica_safe = _marked(view_func, "replica_safe")
+        if request.replica_safe and request.method not in SAFE_METHODS:
+            request.replica_ok = self.replica_ok(request, any_method=True)
+        _replica_reads_allowed.set(request.replica_ok and not _marked(view_func, "use_primary"))
+        return None
+
+    async def aprocess_view(self, request, view_func, view_args, view_kwargs):
+        request.replica_safe = _marked(view_func, "replica_safe")
+        if request.replica_safe and request.method not in SAFE_METHODS:
+            if cache_is_shared():
+                request.replica_ok = await sync_to_async(self.replica_ok)(request, any_method=True)
+            else:
+                request.replica_ok = self.replica_ok(request, any_method=True)
+        _replica_reads_allowed.set(request.replica_ok and not _marked(view_func, "use_primary"))
+        return None
+
+    def recently_wrote(self, request):
+        if PIN_COOKIE in request.COOKIES:
+            return True
+        pin = request.headers.get(PIN_HEADER)
+        if pin:
+            try:
+                _pin_signer.unsign(pin, max_age=self.pin_seconds)
+                return True
+            except signing.BadSignature:  # also expired ones
+                pass
+        key = _pin_key(request)
+        return bool(key and cache.get(key))
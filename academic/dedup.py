@@ -0,0 +1,410 @@
+"""
+Near-duplicate paper detection (MinHash + LSH).
+
+Each paper gets two MinHash signatures: one over word 2-grams of its
+normalized title, one over word 3-grams of title + abstract. Both are cut
+into LSH bands; every band becomes a PaperLSHBucket row with an indexed
+64-bit key, so finding candidates for a new paper is a single
+`key IN (...)` lookup instead of a scan. Candidates are then checked on
+their estimated Jaccard similarity and stored as PaperDuplicate rows for
+review; merge_papers() folds a duplicate into the paper that is kept and
+remembers the merged-away DOI (MergedPaperDOI) so imports don't bring the
+duplicate back.
+
+Two signatures because preprint/published pairs often differ in whether
+an abstract was imported at all; the title signature still catches those
+(titles need at least MIN_TITLE_WORDS words, so "Editorial" is not one
+giant duplicate cluster).
+"""
+import functools
+import hashlib
+import re
+import unicodedata
+import zlib
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Lower
+
+from . import dataset
+from .models import (
+    Faculty, MergedPaperDOI, Paper, PaperAuthorship, PaperDuplicate, PaperLSHBucket, PaperSignature,
+)
+
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS        # LSH recall threshold ~ (1/BANDS) ** (1/ROWS) = 0.5
+TITLE_THRESHOLD = 0.85
+TEXT_THRESHOLD = 0.75
+MIN_TITLE_WORDS = 4
+
+_MERSENNE = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+_paused = ContextVar("dedup_paused", default=False)
+
+
+@contextmanager
+def indexing_paused():
+    """Skip per-save indexing (bulk imports index once at the end via scan())."""
+    token = _paused.set(True)
+    try:
+        yield
+    finally:
+        _paused.reset(token)
+
+
+def is_paused():
+    return _paused.get()
+
+
+# ----------------------------------------
+# Signatures
+# ----------------------------------------
+
+@functools.cache
+def _numpy():
+    """
+    numpy and the MinHash permutations, loaded on first use: this module is
+    imported at startup (signals, admin, typeahead) by every worker and
+    management command, most of which never hash a paper.
+    """
+    import numpy as np
+
+    rng = np.random.RandomState(20240601)  # fixed: signatures must be stable across runs
+    a = rng.randint(1, _MERSENNE, size=NUM_PERM, dtype=np.uint64)
+    b = rng.randint(0, _MERSENNE, size=NUM_PERM, dtype=np.uint64)
+    return np, a, b
+
+
+_non_alnum = re.compile(r"[^a-z0-9]+")
+
+
+def normalize(text):
+    text = unicodedata.normalize("NFKD", text or "").encode("ascii", "ignore").decode()
+    return _non_alnum.sub(" ", text.lower()).strip()
+
+
+def shingles(words, n):
+    if len(words) < n:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + n]) for i in range(len(words) - n + 1)}
+
+
+def minhash(tokens):
+    if not tokens:
+        return None
+    np, a, b = _numpy()
+    hv = np.fromiter((zlib.crc32(t.encode()) for t in tokens), dtype=np.uint64, count=len(tokens))
+    # (a*x + b) mod p for all permutations at once; uint64 wraparound is fine here
+    phv = ((np.outer(hv, a) + b) % np.uint64(_MERSENNE)) & np.uint64(_MAX_HASH)
+    return phv.min(axis=0).astype(np.uint32)
+
+
+def similarity(sig_a, sig_b):
+    if sig_a is None or sig_b is None:
+        return 0.0
+    return float((sig_a == sig_b).sum()) / NUM_PERM
+
+
+class Signature:
+    __slots__ = ("paper_id", "text_hash", "title", "text")
+
+    def __init__(self, paper_id, title, abstract):
+        title_words = normalize(title).split()
+        text_words = title_words + normalize(abstract).split()
+        self.paper_id = paper_id
+        self.text_hash = hashlib.sha1(" ".join(text_words).encode()).hexdigest()
+        self.title = minhash(shingles(title_words, 2)) if len(title_words) >= MIN_TITLE_WORDS else None
+        self.text = minhash(shingles(text_words, 3))
+
+    @classmethod
+    def from_row(cls, row):
+        sig = cls.__new__(cls)
+        sig.paper_id = row.paper_id
+        sig.text_hash = row.text_hash
+        sig.title = _unpack(row.title_minhash)
+        sig.text = _unpack(row.text_minhash)
+        return sig
+
+    def band_keys(self):
+        keys = []
+        for kind, sig in ((1, self.title), (2, self.text)):
+            if sig is None:
+                continue
+            for band in range(BANDS):
+                chunk = sig[band * ROWS:(band + 1) * ROWS].tobytes()
+                digest = hashlib.blake2b(bytes((kind, band)) + chunk, digest_size=8).digest()
+                keys.append(int.from_bytes(digest, "big") >> 1)  # fits a signed BIGINT
+        return keys
+
+    def score(self, other):
+        """estimated Jaccard similarity if either signature clears its threshold, else 0"""
+        title = similarity(self.title, other.title)
+        text = similarity(self.text, other.text)
+        return max(
+            title if title >= TITLE_THRESHOLD else 0.0,
+            text if text >= TEXT_THRESHOLD else 0.0,
+        )
+
+    def to_row(self):
+        return PaperSignature(
+            paper_id=self.paper_id,
+            text_hash=self.text_hash,
+            title_minhash=_pack(self.title),
+            text_minhash=_pack(self.text),
+        )
+
+
+def _pack(sig):
+    return None if sig is None else sig.tobytes()
+
+
+def _unpack(raw):
+    return None if raw is None else _numpy()[0].frombuffer(bytes(raw), dtype="uint32")
+
+
+# ----------------------------------------
+# Indexing
+# ----------------------------------------
+
+def _record_duplicates(pairs):
+    """pairs: {(newer_id, older_id): similarity}"""
+    PaperDuplicate.objects.bulk_create(
+        [PaperDuplicate(paper_id=a, duplicate_of_id=b, similarity=s) for (a, b), s in pairs.items()],
+        ignore_conflicts=True,
+    )
+
+
+def _pair(id_a, id_b):
+    return (id_a, id_b) if id_a > id_b else (id_b, id_a)
+
+
+def _lookup_candidates(keys, exclude_ids):
+    """paper ids already in the index sharing any of the given LSH keys"""
+    found = {}
+    keys = list(keys)
+    for i in range(0, len(keys), 500):
+        for key, paper_id in PaperLSHBucket.objects.filter(key__in=keys[i:i + 500]).values_list("key", "paper_id"):
+            if paper_id not in exclude_ids:
+                found.setdefault(key, set()).add(paper_id)
+    return found
+
+
+def _load_signatures(paper_ids):
+    paper_ids = list(paper_ids)
+    out = {}
+    for i in range(0, len(paper_ids), 500):
+        for row in PaperSignature.objects.filter(paper_id__in=paper_ids[i:i + 500]):
+            out[row.paper_id] = Signature.from_row(row)
+    return out
+
+
+def index_paper(paper):
+    """
+    (Re)index one paper after it was saved and flag duplicate candidates.
+    No-op when its normalized text did not change. Returns the new
+    PaperDuplicate pairs found.
+    """
+    sig = Signature(paper.pk, paper.title, paper.abstract)
+    current = PaperSignature.objects.filter(paper_id=paper.pk).values_list("text_hash", flat=True).first()
+    if current == sig.text_hash:
+        return {}
+
+    keys = sig.band_keys()
+    with transaction.atomic():
+        PaperSignature.objects.update_or_create(
+            paper_id=paper.pk,
+            defaults={"text_hash": sig.text_hash, "title_minhash": _pack(sig.title), "text_minhash": _pack(sig.text)},
+        )
+        PaperLSHBucket.objects.filter(paper_id=paper.pk).delete()
+        PaperLSHBucket.objects.bulk_create([PaperLSHBucket(key=k, paper_id=paper.pk) for k in keys])
+
+        candidate_ids = set().union(*_lookup_candidates(keys, {paper.pk}).values()) if keys else set()
+        pairs = {}
+        for other in _load_signatures(candidate_ids).values():
+            score = sig.score(other)
+            if score:
+                pairs[_pair(paper.pk, other.paper_id)] = score
+        _record_duplicates(pairs)
+    return pairs
+
+
+def _index_committed(paper_id):
+    paper = Paper.objects.filter(pk=paper_id).only("pk", "title", "abstract").first()
+    if paper is not None:  # merged away / deleted before the commit
+        index_paper(paper)
+
+
+def index_on_commit(paper):
+    """
+    index_paper() once the current transaction commits, so saves don't pay
+    for hashing and candidate lookups inline. Once per paper per transaction.
+    """
+    conn = transaction.get_connection()
+    if conn.in_atomic_block and any(
+        getattr(func, "func", None) is _index_committed and func.args == (paper.pk,)
+        for _, func, _ in conn.run_on_commit
+    ):
+        return
+    transaction.on_commit(functools.partial(_index_committed, paper.pk))
+
+
+def scan(queryset=None, rebuild=False, chunk_size=2000, progress=None):
+    """
+    Index many papers in one pass and flag duplicates among them and against
+    what is already indexed. rebuild=True drops the whole index first.
+    Returns (papers indexed, duplicate pairs flagged).
+    """
+    if queryset is None:
+        queryset = Paper.objects.all()
+    if rebuild:
+        PaperLSHBucket.objects.all().delete()
+        PaperSignature.objects.all().delete()
+
+    buckets = {}     # key -> paper ids indexed during this scan
+    sigs = {}        # paper id -> Signature, for this scan
+    pairs = {}
+    indexed = 0
+
+    rows = queryset.order_by("pk").values_list("pk", "title", "abstract")
+    batch = []
+    for row in rows.iterator(chunk_size=chunk_size):
+        batch.append(row)
+        if len(batch) >= chunk_size:
+            indexed += _scan_chunk(batch, buckets, sigs, pairs, rebuild)
+            batch = []
+            if progress:
+                progress(indexed)
+    if batch:
+        indexed += _scan_chunk(batch, buckets, sigs, pairs, rebuild)
+        if progress:
+            progress(indexed)
+
+    _record_duplicates(pairs)
+    return indexed, len(pairs)
+
+
+def _scan_chunk(rows, buckets, sigs, pairs, rebuild):
+    ids = [r[0] for r in rows]
+    known = {} if rebuild else dict(
+        PaperSignature.objects.filter(paper_id__in=ids).values_list("paper_id", "text_hash")
+    )
+    fresh = []
+    for pk, title, abstract in rows:
+        sig = Signature(pk, title, abstract)
+        if known.get(pk) != sig.text_hash:
+            fresh.append(sig)
+    if not fresh:
+        return 0
+
+    fresh_ids = {s.paper_id for s in fresh}
+    keys_by_paper = {s.paper_id: s.band_keys() for s in fresh}
+    all_keys = {k for keys in keys_by_paper.values() for k in keys}
+
+    # candidates already in the DB index (earlier runs / earlier chunks of this one)
+    in_db = {} if rebuild else _lookup_candidates(all_keys, fresh_ids)
+    db_sigs = _load_signatures(set().union(*in_db.values())) if in_db else {}
+
+    for sig in fresh:
+        seen = set()
+        for key in keys_by_paper[sig.paper_id]:
+            seen |= buckets.get(key, set())
+            seen |= in_db.get(key, set())
+        seen.discard(sig.paper_id)
+        for other_id in seen:
+            other = sigs.get(other_id) or db_sigs.get(other_id)
+            if other is None:
+                continue
+            score = sig.score(other)
+            if score:
+                pairs[_pair(sig.paper_id, other_id)] = score
+        for key in keys_by_paper[sig.paper_id]:
+            buckets.setdefault(key, set()).add(sig.paper_id)
+        sigs[sig.paper_id] = sig
+
+    with transaction.atomic():
+        if not rebuild:
+            PaperSignature.objects.filter(paper_id__in=fresh_ids).delete()
+            PaperLSHBucket.objects.filter(paper_id__in=fresh_ids).delete()
+        PaperSignature.objects.bulk_create([s.to_row() for s in fresh])
+        PaperLSHBucket.objects.bulk_create(
+            [PaperLSHBucket(key=k, paper_id=pid) for pid, keys in keys_by_paper.items() for k in keys],
+            batch_size=5000,
+        )
+    return len(fresh)
+
+
+# ----------------------------------------
+# Merge
+# ----------------------------------------
+
+# when both copies have an authorship for the same faculty, the more decided one wins
+_STATUS_RANK = {"pending": 0, "rejected": 1, "approved": 2}
+_FILL_FIELDS = ("abstract", "journal", "date_published", "date_published_online",
+                "date_published_print", "download_url", "license_url", "url")
+
+
+@transaction.atomic
+def merge_papers(keep, dup):
+    """
+    Fold `dup` into `keep`: authorships move over, blank fields on `keep`
+    are filled from `dup`, then `dup` is deleted (which also drops the
+    PaperDuplicate rows pointing at it). dup's DOI (and any merged into
+    it before) now points at `keep`.
+
+    Faculty credited with both copies lose one from article_count; the
+    ones whose authorship just moved still have one paper and keep theirs.
+    """
+    if keep.pk == dup.pk:
+        raise ValueError("Cannot merge a paper into itself")
+
+    mine = {a.faculty_id: a for a in keep.authorships.all()}
+    both = []
+    for a in dup.authorships.all():
+        cur = mine.get(a.faculty_id)
+        if cur is None:
+            PaperAuthorship.objects.filter(pk=a.pk).update(paper=keep)
+            continue
+        both.append(a.faculty_id)
+        if _STATUS_RANK[a.status] > _STATUS_RANK[cur.status]:
+            cur.status, cur.decided_at = a.status, a.decided_at
+            cur.save(update_fields=["status", "decided_at"])
+    if both:
+        Faculty.objects.filter(pk__in=both, article_count__gt=0).update(article_count=F("article_count") - 1)
+        dataset.mark_changed(directory=True)  # .update() sends no signals
+
+    MergedPaperDOI.objects.filter(paper=dup).update(paper=keep)
+    MergedPaperDOI.objects.update_or_create(doi=dup.doi.lower(), defaults={"paper": keep})
+
+    for field in _FILL_FIELDS:
+        if not getattr(keep, field) and getattr(dup, field):
+            setattr(keep, field, getattr(dup, field))
+    keep.tc_count = max(keep.tc_count, dup.tc_count)
+
+    dup.delete()
+    keep.save()  # after the delete, so re-indexing can't flag dup again
+    return keep
+
+
+def merged_into(dois):
+    """{lowercased DOI: id of the paper it was merged into} for the given DOIs."""
+    dois = {d.lower() for d in dois}
+    return dict(MergedPaperDOI.objects.filter(doi__in=dois).values_list("doi", "paper_id")) if dois else {}
+
+
+def double_counted(source_dois):
+    """
+    How many merges a faculty's source DOI list (lowercased) counts twice:
+    it lists both the merged-away DOI and the one it went into, so the
+    record's article_count has the paper twice.
+    """
+    if not source_dois:
+        return 0
+    return (
+        MergedPaperDOI.objects.filter(doi__in=source_dois)
+        .alias(kept=Lower("paper__doi")).filter(kept__in=source_dois)
+        .count()
+    )
@@ -0,0 +1,105 @@
+"""
+Batch DOI resolution: "is this DOI in Scoup, and who authored it?"
+
+resolve() maps up to MAX_DOIS DOIs to {id, doi, tc_count, authors} (None
+for DOIs we don't have). Misses are looked up QUERY_BATCH at a time, one
+query per batch: the case-insensitive DOI match joined to the approved
+authorships of public faculty. On PostgreSQL the UPPER(doi::text) index
+from migration 0006 serves the match.
+
+Results, including "not found", are kept in a per-process LRU cache that
+is cleared whenever the dataset version moves. Paper, Faculty and
+PaperAuthorship changes all mark the dataset changed (see
+academic.signals; the admin's bulk status actions do it themselves), so
+the process that made a change sees it on its next lookup and the other
+workers within DATASET_VERSION_POLL seconds.
+"""
+from django.conf import settings
+from django.db.models import FilteredRelation, Q, TextField
+from django.db.models.functions import Cast, Upper
+
+from . import dataset
+from .cache import LRUCache
+from .models import Faculty, Paper
+
+MAX_DOIS = 5000
+QUERY_BATCH = 1000
+
+_PREFIXES = ("https://doi.org/", "http://doi.org/", "https://dx.doi.org/", "http://dx.doi.org/", "doi:")
+
+_cache = LRUCache(maxsize=getattr(settings, "DOI_CACHE_SIZE", 50000))
+_state = {"version": None}
+
+
+def normalize_doi(value):
+    """Cache/lookup key of a DOI as sent by a client ('' when it can't be one)."""
+    doi = str(value).strip()
+    for prefix in _PREFIXES:
+        if doi.lower().startswith(prefix):
+            doi = doi[len(prefix):].strip()
+            break
+    return doi.upper()
+
+
+def _author(faculty_id, code, name, first_name, last_name):
+    return {
+        "id": faculty_id,
+        "faculty_id": code,
+        "name": str(Faculty(faculty_id=code, name=name, first_name=first_name, last_name=last_name)),
+    }
+
+
+def _fetch(keys):
+    """{key: result or None} straight from the database."""
+    found = dict.fromkeys(keys)
+    for i in range(0, len(keys), QUERY_BATCH):
+        rows = (
+            Paper.objects
+            .alias(doi_key=Upper(Cast("doi", output_field=TextField())))
+            .filter(doi_key__in=keys[i:i + QUERY_BATCH])
+            .annotate(approved=FilteredRelation(
+                "authorships",
+                condition=Q(authorships__status="approved"),
+            ))
+            .order_by("pk")
+            .values_list(
+                "pk", "doi", "tc_count",
+                "approved__faculty_id", "approved__faculty__faculty_id", "approved__faculty__name",
+                "approved__faculty__first_name", "approved__faculty__last_name",
+                "approved__faculty__is_approved", "approved__faculty__profile_visibility",
+            )
+        )
+        for pk, doi, tc_count, fac_pk, code, name, first, last, fac_approved, visible in rows:
+            key = doi.upper()
+            entry = found.get(key)
+            if entry is None:
+                entry = found[key] = {"id": pk, "doi": doi, "tc_count": tc_count, "authors": []}
+            elif entry["id"] != pk:
+                continue  # two stored spellings of one DOI: the older paper wins
+            if fac_pk is not None and fac_approved and visible:
+                entry["authors"].append(_author(fac_pk, code, name, first, last))
+    return found
+
+
+def resolve(dois):
+    """{doi as sent: result or None}, in the order given."""
+    version = dataset.current_version()
+    if _state["version"] != version:
+        _cache.clear()
+        _state["version"] = version
+
+    keys = {doi: normalize_doi(doi) for doi in dois}
+    wanted = list(dict.fromkeys(k for k in keys.values() if k))
+    hits = _cache.get_many(wanted)
+    missing = [k for k in wanted if k not in hits]
+    if missing:
+        fetched = _fetch(missing)
+        if _state["version"] == version:  # don't file old rows under a newer version
+            _cache.set_many(fetched)
+        hits.update(fetched)
+    return {doi: hits.get(key) for doi, key in keys.items()}
+
+
+def clear():
+    _cache.clear()
+    _state["version"] = None
@@ -0,0 +1,256 @@
+"""
+Read-only fast path for big list responses.
+
+DRF's ModelSerializer instantiates every model and walks every field through
+to_representation; for 10k-row lists that is most of the request. Here rows
+come straight from .values() and are mapped to dicts by converters compiled
+once per serializer class, producing the same keys, order and values as the
+serializer. Anything the fast path does not understand raises
+FastPathUnsupported and the view falls back to the normal serializer.
+"""
+from datetime import date
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.utils.encoding import filepath_to_uri
+from rest_framework import ISO_8601, serializers
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+# serializer fields whose value needs no conversion once read from .values()
+PASSTHROUGH = (
+    serializers.BooleanField,
+    serializers.CharField,      # also Email/URL/Slug/...
+    serializers.ChoiceField,
+    serializers.FloatField,
+    serializers.IntegerField,
+    serializers.JSONField,
+    serializers.ReadOnlyField,
+)
+
+
+FILE_URL = object()  # converter marker: media URL, needs the request
+
+
+class FastPathUnsupported(Exception):
+    pass
+
+
+class RowPlan:
+    """
+    Precompiled mapping from a serializer class to .values() columns.
+
+    columns:   what to ask .values() for
+    fields:    (output key, column, converter or None) in serializer order
+    many:      (output key, m2m model field) for many-to-many pk lists
+    """
+
+    def __init__(self, serializer):
+        model = serializer.Meta.model
+        self.model = model
+        self.columns = []
+        self.fields = []
+        self.many = []
+
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            source = field.source
+            if "." in source or source == "*":
+                raise FastPathUnsupported(f"{name}: nested source")
+            try:
+                model_field = model._meta.get_field(source)
+            except Exception:
+                raise FastPathUnsupported(f"{name}: not a model field")
+
+            if isinstance(field, serializers.ManyRelatedField):
+                self.many.append((name, model_field))
+                self.fields.append((name, None, None))
+            elif isinstance(field, serializers.PrimaryKeyRelatedField):
+                self._add(name, model_field.attname, None)
+            elif isinstance(field, serializers.ImageField) or isinstance(field, serializers.FileField):
+                self._add(name, model_field.attname, FILE_URL)
+            elif isinstance(field, serializers.DateTimeField):
+                self._add(name, model_field.attname, _datetime_converter(field))
+            elif isinstance(field, serializers.DateField):
+                self._add(name, model_field.attname, _date_converter(field))
+            elif isinstance(field, serializers.TimeField):
+                self._add(name, model_field.attname, field.to_representation)
+            elif isinstance(field, PASSTHROUGH) and not isinstance(field, serializers.SerializerMethodField):
+                self._add(name, model_field.attname, None)
+            else:
+                raise FastPathUnsupported(f"{name}: {type(field).__name__}")
+
+        if "id" not in self.columns:
+            self.columns.append("id")  # needed to attach m2m lists
+
+    def _add(self, name, column, convert):
+        self.columns.append(column)
+        self.fields.append((name, column, convert))
+
+    def rows(self, queryset, request=None):
+        queryset = queryset.prefetch_related(None)
+        values = list(queryset.values(*self.columns))
+        m2m = {name: self._many_map(mf, queryset) for name, mf in self.many} if values else {}
+
+        url_base = _media_base(request)
+        fields = [
+            (name, column, (lambda v: url_base + filepath_to_uri(v)) if convert is FILE_URL else convert)
+            for name, column, convert in self.fields
+        ]
+
+        out = []
+        append = out.append
+        for v in values:
+            row = {}
+            for name, column, convert in fields:
+                if column is None:
+                    row[name] = m2m[name].get(v["id"], [])
+                    continue
+                value = v[column]
+                if convert is not None:
+                    # DRF returns None for empty dates/files too
+                    value = convert(value) if value else None
+                row[name] = value
+            append(row)
+        return out
+
+    @staticmethod
+    def _many_map(model_field, queryset):
+        # one query over the through table, filtered by the list's own
+        # queryset as a subquery (no giant IN (...) parameter lists)
+        through = model_field.remote_field.through
+        src = model_field.m2m_field_name()
+        dst = model_field.m2m_reverse_field_name()
+        grouped = {}
+        pks = queryset.order_by().values("pk")
+        for a, b in through.objects.filter(**{f"{src}__in": pks}).order_by("pk").values_list(
+            f"{src}_id", f"{dst}_id"
+        ).iterator(chunk_size=5000):
+            grouped.setdefault(a, []).append(b)
+        return grouped
+
+
+def _datetime_converter(field):
+    # DRF's DateTimeField resolves the timezone + format on every call;
+    # resolve once and keep just the isoformat / 'Z' part
+    fmt = getattr(field, "format", api_settings.DATETIME_FORMAT)
+    if fmt is None or fmt.lower() != ISO_8601 or not settings.USE_TZ:
+        return field.to_representation
+    tz = field.timezone if hasattr(field, "timezone") else field.default_timezone()
+
+    def convert(value):
+        value = value.astimezone(tz).isoformat()
+        return value[:-6] + "Z" if value.endswith("+00:00") else value
+    return convert
+
+
+def _date_converter(field):
+    fmt = getattr(field, "format", api_settings.DATE_FORMAT)
+    if fmt is None or fmt.lower() != ISO_8601:
+        return field.to_representation
+    return date.isoformat
+
+
+def _media_base(request):
+    # storage.url('') == MEDIA_URL; DRF makes it absolute when it has a request
+    base = default_storage.url("")
+    if request is not None:
+        base = request.build_absolute_uri(base)
+    return base
+
+
+_media_names = {}
+
+
+def media_fields(serializer_class):
+    """Names of the file/image fields: their URLs carry the request's host."""
+    if serializer_class not in _media_names:
+        _media_names[serializer_class] = tuple(
+            name for name, field in serializer_class(context={}).fields.items()
+            if isinstance(field, serializers.FileField)
+        )
+    return _media_names[serializer_class]
+
+
+def _swap_media_base(rows, names, old, new):
+    """rows with media URLs starting with `old` moved to `new`; touched rows are copies."""
+    if old == new or not names:
+        return rows
+    out = []
+    for row in rows:
+        moved = {n: new + row[n][len(old):] for n in names if isinstance(row.get(n), str) and row[n].startswith(old)}
+        out.append({**row, **moved} if moved else row)
+    return out
+
+
+def cached_list(key, request, serializer_class, build):
+    """
+    (rows for `request`, X-Cache outcome) through coalesce.lists. build()
+    renders the rows for `request`; they are stored with relative media
+    URLs and made absolute again for each response, so a list cached from
+    one host or scheme is served with the right URLs on another.
+    """
+    from . import coalesce, dataset
+
+    names = media_fields(serializer_class)
+    relative = _media_base(None)
+    data, outcome = coalesce.lists.get(
+        key, dataset.current_version(),
+        lambda: _swap_media_base(build(), names, _media_base(request), relative),
+    )
+    return _swap_media_base(data, names, relative, _media_base(request)), outcome
+
+
+_plans = {}
+
+
+def plan_for(serializer_class):
+    """Compiled once per serializer class, from its request-less field set."""
+    if serializer_class not in _plans:
+        try:
+            _plans[serializer_class] = RowPlan(serializer_class(context={}))
+        except FastPathUnsupported:
+            _plans[serializer_class] = None
+    return _plans[serializer_class]
+
+
+class FastListMixin:
+    """
+    For generics.ListAPIView subclasses: GET lists go through RowPlan when
+    the serializer allows it. Set `fast_list = False` (or override
+    use_fast_list) where a request needs the full serializer.
+
+    `cache_list = True` (public lists only: the key is not per user) keeps
+    the built list in coalesce.lists, so concurrent requests share one
+    rebuild per key (see cached_list). The key is cache_key(): the path
+    alone by default; views whose output depends on query params add just
+    those, normalized, so unrelated params can't bust the cache or crowd
+    out other keys.
+    """
+
+    fast_list = True
+    cache_list = False
+
+    def use_fast_list(self, request):
+        return self.fast_list and self.paginator is None
+
+    def cache_key(self, request):
+        return request.path
+
+    def list(self, request, *args, **kwargs):
+        if self.cache_list and self.paginator is None:
+            data, outcome = cached_list(
+                self.cache_key(request), request, self.get_serializer_class(),
+                lambda: self.list_data(request, *args, **kwargs),
+            )
+            return Response(data, headers={"X-Cache": outcome})
+        return Response(self.list_data(request, *args, **kwargs))
+
+    def list_data(self, request, *args, **kwargs):
+        if self.use_fast_list(request):
+            plan = plan_for(self.get_serializer_class())
+            if plan is not None:
+                queryset = self.filter_queryset(self.get_queryset())
+                return plan.rows(queryset, request)
+        return super().list(request, *args, **kwargs).data
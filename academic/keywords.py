@@ -0,0 +1,310 @@
+"""
+Offline keyword extraction for Paper.ai_keywords, Patent.aiKeywords and
+Faculty.ai_keywords.
+
+Candidates are RAKE-style phrases: runs of up to MAX_PHRASE content words
+between stopwords and punctuation. A candidate scores tf * idf * rake, where
+rake is the summed degree/frequency of its words within the document and idf
+comes from corpus document frequencies. Frequencies live in a fixed vector of
+N_FEATURES hashed buckets, so memory does not grow with the vocabulary.
+
+A chunk of documents is one sparse (doc, feature, tf) matrix held as COO
+arrays; idf weighting and per-document top-k run vectorized over it.
+Faculty keywords are aggregated from their papers' keywords plus their bio.
+KeywordSourceHash remembers the text each row's keywords came from, so
+reruns only touch rows whose text changed.
+
+Only management commands import this module (numpy is not a startup cost).
+"""
+import hashlib
+import re
+import zlib
+from itertools import islice
+
+import numpy as np
+from django.db import transaction
+
+from . import dataset
+from .dedup import normalize
+from .models import Faculty, KeywordSourceHash, KeywordStats, Paper, PaperAuthorship, Patent
+
+VERSION = "1"            # bump after changing the scoring to force re-extraction
+N_FEATURES = 1 << 20     # hashed idf buckets (4 MB of int32)
+TOP_K = 10
+MAX_PHRASE = 3
+
+STOPWORDS = frozenset("""
+a about above across after again against all almost along also although am among an and another any
+are around as at be because been before being below between both but by can could did do does doing
+done down during each either else etc even ever every few for from further had has have having he her
+here hers him his how however i if in into is it its itself just least less like made make many may me
+might more most much must my neither no nor not now of off often on once one only onto or other others
+otherwise our ours out over own per perhaps rather same several shall she should since so some such
+than that the their theirs them then there therefore these they this those though through thus to too
+toward towards under until up upon us use used uses using very via was we well were what when where
+whether which while who whom whose why will with within without would yet you your
+abstract approach approaches article based case cases different findings first found further high
+however including introduce introduced investigate investigated low method methods new novel paper
+present presented presents propose proposed provide provides research result results second show shown
+shows significant significantly studies study three two various work
+""".split())
+
+_fragments = re.compile(r"[.,;:!?()\[\]{}\"“”‘’/\\|\n\t]+|\s[-–—]+\s")
+
+DOCUMENTS = {
+    # kind: (model, keyword field)
+    "paper": (Paper, "ai_keywords"),
+    "patent": (Patent, "aiKeywords"),
+}
+
+
+# ----------------------------------------
+# Candidates / scoring
+# ----------------------------------------
+
+def candidates(text):
+    """RAKE candidate phrases of a text in order of appearance (repeats kept)."""
+    out = []
+    for fragment in _fragments.split(text or ""):
+        run = []
+        for word in normalize(fragment).split():
+            if word in STOPWORDS or word.isdigit() or len(word) < 2:
+                out.extend(_cut(run))
+                run = []
+            else:
+                run.append(word)
+        out.extend(_cut(run))
+    return out
+
+
+def _cut(run):
+    return [" ".join(run[i:i + MAX_PHRASE]) for i in range(0, len(run), MAX_PHRASE)]
+
+
+def _feature(phrase):
+    return zlib.crc32(phrase.encode()) & (N_FEATURES - 1)
+
+
+def _matrix(texts):
+    """
+    COO entries for a chunk of documents, one per distinct phrase per
+    document: (doc index, feature, tf, rake score) arrays plus the phrases.
+    """
+    docs, feats, tf, rake, phrases = [], [], [], [], []
+    for d, text in enumerate(texts):
+        cands = candidates(text)
+        freq, degree, counts = {}, {}, {}
+        for phrase in cands:
+            counts[phrase] = counts.get(phrase, 0) + 1
+            words = phrase.split()
+            for w in words:
+                freq[w] = freq.get(w, 0) + 1
+                degree[w] = degree.get(w, 0) + len(words)
+        for phrase, n in counts.items():
+            docs.append(d)
+            feats.append(_feature(phrase))
+            tf.append(n)
+            rake.append(sum(degree[w] / freq[w] for w in phrase.split()))
+            phrases.append(phrase)
+    return (
+        np.array(docs, dtype=np.int64), np.array(feats, dtype=np.int64),
+        np.array(tf, dtype=np.float64), np.array(rake, dtype=np.float64), phrases,
+    )
+
+
+class Stats:
+    """Document frequencies over the corpus, hashed into N_FEATURES buckets."""
+
+    def __init__(self, docs=0, df=None):
+        self.docs = docs
+        self.df = df if df is not None else np.zeros(N_FEATURES, dtype=np.int32)
+
+    def add(self, texts):
+        d, f, *_ = _matrix(texts)
+        present = np.unique(d * N_FEATURES + f) % N_FEATURES  # each feature once per doc
+        self.df += np.bincount(present, minlength=N_FEATURES).astype(np.int32)
+        self.docs += len(texts)
+
+    def idf(self, feats):
+        return np.log((1.0 + self.docs) / (1.0 + self.df[feats])) + 1.0
+
+    @classmethod
+    def load(cls):
+        row = KeywordStats.objects.filter(pk=1).first()
+        if row is None:
+            return None
+        return cls(row.docs, np.frombuffer(zlib.decompress(bytes(row.df)), dtype=np.int32).copy())
+
+    def save(self):
+        KeywordStats.objects.update_or_create(
+            pk=1, defaults={"docs": self.docs, "df": zlib.compress(self.df.tobytes())}
+        )
+
+
+def extract(texts, stats, top_k=TOP_K):
+    """Top-k keyword phrases for each text, best first."""
+    out = [[] for _ in texts]
+    d, f, tf, rake, phrases = _matrix(texts)
+    if not len(d):
+        return out
+    score = tf * stats.idf(f) * rake
+    order = np.lexsort((-score, d))                      # by document, best first
+    d_sorted = d[order]
+    rank = np.arange(len(order)) - np.searchsorted(d_sorted, d_sorted)  # position within its document
+    for i in order[rank < top_k]:
+        out[d[i]].append(phrases[i])
+    return out
+
+
+# ----------------------------------------
+# Corpus passes
+# ----------------------------------------
+
+def _text(title, abstract):
+    return f"{title or ''}. {abstract or ''}"
+
+
+def _hash(*parts):
+    return hashlib.sha1("\x1f".join((VERSION, *parts)).encode()).hexdigest()
+
+
+def _chunks(iterable, size):
+    it = iter(iterable)
+    while batch := list(islice(it, size)):
+        yield batch
+
+
+def _known_hashes(kind, ids):
+    return dict(
+        KeywordSourceHash.objects.filter(kind=kind, object_id__in=ids).values_list("object_id", "text_hash")
+    )
+
+
+def _save_hashes(kind, hashes):
+    KeywordSourceHash.objects.bulk_create(
+        [KeywordSourceHash(kind=kind, object_id=pk, text_hash=h) for pk, h in hashes.items()],
+        update_conflicts=True, unique_fields=["kind", "object_id"], update_fields=["text_hash"],
+    )
+
+
+def build_stats(chunk_size=2000, progress=None):
+    """Recount document frequencies over every paper and patent."""
+    stats = Stats()
+    for model, _ in DOCUMENTS.values():
+        rows = model.objects.order_by("pk").values_list("title", "abstract").iterator(chunk_size=chunk_size)
+        for batch in _chunks(rows, chunk_size):
+            stats.add([_text(t, a) for t, a in batch])
+            if progress:
+                progress(stats.docs)
+    stats.save()
+    return stats
+
+
+def get_stats():
+    """(stats, just built): freshly built stats already count every document."""
+    stats = Stats.load()
+    return (stats, False) if stats is not None else (build_stats(), True)
+
+
+def update_documents(kind, queryset=None, stats=None, count_new=True, force=False,
+                     chunk_size=1000, progress=None):
+    """
+    (Re)extract keywords for papers or patents whose title/abstract changed
+    since the last run (all of them with force=True). With count_new,
+    documents seen for the first time are added to the idf counts.
+    Returns the number updated.
+    """
+    model, field = DOCUMENTS[kind]
+    if stats is None:
+        stats, built = get_stats()
+        count_new = count_new and not built
+    count_new = count_new and not force
+    queryset = model.objects.all() if queryset is None else queryset
+    rows = queryset.order_by("pk").values_list("pk", "title", "abstract").iterator(chunk_size=chunk_size)
+
+    updated = seen = 0
+    for batch in _chunks(rows, chunk_size):
+        texts = {pk: _text(title, abstract) for pk, title, abstract in batch}
+        hashes = {pk: _hash(text) for pk, text in texts.items()}
+        known = _known_hashes(kind, list(texts))
+        ids = [pk for pk in texts if force or known.get(pk) != hashes[pk]]
+        seen += len(batch)
+        if ids:
+            new = [texts[pk] for pk in ids if pk not in known]
+            if new and count_new:
+                stats.add(new)
+            found = extract([texts[pk] for pk in ids], stats)
+            with transaction.atomic():
+                model.objects.bulk_update(
+                    [model(pk=pk, **{field: kws}) for pk, kws in zip(ids, found)], [field], batch_size=500
+                )
+                _save_hashes(kind, {pk: hashes[pk] for pk in ids})
+                if new and count_new:
+                    stats.save()
+            updated += len(ids)
+        if progress:
+            progress(seen)
+    if updated:
+        dataset.mark_changed()
+    return updated
+
+
+def update_faculty(queryset=None, stats=None, force=False, chunk_size=500, progress=None):
+    """
+    Faculty.ai_keywords from the keywords of their (not rejected) papers
+    plus their bio, rank-weighted: a phrase's k-th place in a list is worth
+    1 / (k + 1). Stored comma-separated (the field is a TextField).
+    Faculty whose bio and papers' keywords are unchanged are skipped.
+    """
+    stats = stats or get_stats()[0]
+    queryset = Faculty.objects.all() if queryset is None else queryset
+    rows = queryset.order_by("pk").values_list("pk", "bio").iterator(chunk_size=chunk_size)
+
+    updated = seen = 0
+    for batch in _chunks(rows, chunk_size):
+        bios = dict(batch)
+        papers = {}  # faculty id -> [(paper id, keywords)]
+        links = (
+            PaperAuthorship.objects.filter(faculty_id__in=list(bios)).exclude(status="rejected")
+            .values_list("faculty_id", "paper_id", "paper__ai_keywords")
+        )
+        for fac_id, paper_id, kws in links:
+            papers.setdefault(fac_id, []).append((paper_id, kws or []))
+        paper_hashes = _known_hashes("paper", [p for lst in papers.values() for p, _ in lst])
+
+        hashes = {
+            pk: _hash(bio or "", *sorted(f"{p}:{paper_hashes.get(p, '')}" for p, _ in papers.get(pk, [])))
+            for pk, bio in bios.items()
+        }
+        known = _known_hashes("faculty", list(bios))
+        ids = [pk for pk in bios if force or known.get(pk) != hashes[pk]]
+        seen += len(batch)
+        if ids:
+            bio_keywords = extract([bios[pk] or "" for pk in ids], stats)
+            values = []
+            for pk, from_bio in zip(ids, bio_keywords):
+                weights = {}
+                for kws in [from_bio] + [kws for _, kws in papers.get(pk, [])]:
+                    for rank, phrase in enumerate(kws):
+                        weights[phrase] = weights.get(phrase, 0.0) + 1.0 / (rank + 1)
+                best = sorted(weights, key=lambda p: (-weights[p], p))[:TOP_K]
+                values.append(Faculty(pk=pk, ai_keywords=", ".join(best) or None))
+            with transaction.atomic():
+                Faculty.objects.bulk_update(values, ["ai_keywords"], batch_size=500)
+                _save_hashes("faculty", {pk: hashes[pk] for pk in ids})
+            updated += len(ids)
+        if progress:
+            progress(seen)
+    if updated:
+        dataset.mark_changed(directory=True)
+    return updated
+
+
+def rebuild(chunk_size=1000, progress=None):
+    """Forget all hashes, recount idf and re-extract everything."""
+    KeywordSourceHash.objects.all().delete()
+    stats = build_stats()
+    counts = {kind: update_documents(kind, stats=stats, force=True, chunk_size=chunk_size, progress=progress)
+              for kind in DOCUMENTS}
+    counts["faculty"] = update_faculty(stats=stats, force=True, progress=progress)
+    return counts
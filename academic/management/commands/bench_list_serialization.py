@@ -0,0 +1,87 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import RequestFactory
+from rest_framework.renderers import JSONRenderer
+
+from academic.fastpath import plan_for
+from academic.models import Faculty, Paper
+from academic.renderers import ORJSONRenderer
+from academic.serializers import FacultySerializer, PaperSerializer
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the stock DRF serializer + JSONRenderer with the .values() fast path "
+        "+ orjson for the faculty and paper lists. Sample rows are created inside a "
+        "transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=10000)
+        parser.add_argument("--repeat", type=int, default=3, help="Best of N")
+
+    def handle(self, *args, **opts):
+        n = opts["rows"]
+        try:
+            with transaction.atomic():
+                self.seed(n)
+                self.run(n, opts["repeat"])
+                raise _Rollback
+        except _Rollback:
+            pass
+
+    def seed(self, n):
+        faculty = Faculty.objects.bulk_create([
+            Faculty(
+                faculty_id=f"bench-{i}", name=f"Bench Faculty {i}", is_approved=True,
+                department="Computer Science", keywords=["machine learning", "databases"],
+                photo=f"faculty_photos/{i:064x}.jpg" if i % 2 else None,
+            )
+            for i in range(n)
+        ])
+        papers = Paper.objects.bulk_create([
+            Paper(doi=f"10.0/bench.{i}", title=f"Bench paper {i}", tc_count=i % 97,
+                  keywords=["systems"], themes=["performance"])
+            for i in range(n)
+        ])
+        Through = Paper.authors.through
+        Through.objects.bulk_create([
+            Through(paper_id=p.id, faculty_id=faculty[i].id) for i, p in enumerate(papers)
+        ])
+
+    def run(self, n, repeat):
+        request = RequestFactory().get("/api/faculty/", HTTP_HOST="localhost")
+        cases = [
+            ("faculty", FacultySerializer, Faculty.objects.filter(faculty_id__startswith="bench-")),
+            ("papers", PaperSerializer, Paper.objects.filter(doi__startswith="10.0/bench.")),
+        ]
+        self.stdout.write(f"{n} rows per response, best of {repeat}")
+        for label, serializer_class, qs in cases:
+            def slow():
+                data = serializer_class(qs.prefetch_related("authors") if label == "papers" else qs,
+                                        many=True, context={"request": request}).data
+                return JSONRenderer().render(data)
+
+            def fast():
+                return ORJSONRenderer().render(plan_for(serializer_class).rows(qs, request))
+
+            t_slow, t_fast = self.best(slow, repeat), self.best(fast, repeat)
+            self.stdout.write(
+                f"  {label:8} drf: {t_slow * 1000:8.1f} ms   fast: {t_fast * 1000:8.1f} ms   "
+                f"x{t_slow / t_fast:.1f}"
+            )
+
+    @staticmethod
+    def best(fn, repeat):
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            times.append(time.perf_counter() - start)
+        return min(times)
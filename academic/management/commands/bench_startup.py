@@ -0,0 +1,103 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# what a fresh worker does before it can serve: load the app (django.setup)
+# and the URLconf (every view module). Runs in a clean interpreter.
+PROBE = r"""
+import json, os, sys, time
+t0 = time.perf_counter()
+import django
+django.setup()
+setup_loaded = sorted(m for m in sys.argv[2:] if m in sys.modules)
+import importlib
+importlib.import_module(sys.argv[1])
+t1 = time.perf_counter()
+from django.urls import get_resolver
+get_resolver().url_patterns
+t2 = time.perf_counter()
+try:
+    with open("/proc/self/statm") as f:
+        rss = int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+except OSError:
+    import resource
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / (2**20 if sys.platform == "darwin" else 1024)
+print(json.dumps({
+    "setup_ms": (t1 - t0) * 1000, "urls_ms": (t2 - t1) * 1000, "rss_mb": rss,
+    "modules": len(sys.modules), "loaded": sorted(m for m in sys.argv[2:] if m in sys.modules),
+    "setup_loaded": setup_loaded,
+}))
+"""
+
+# imports that should only happen on first use, never at worker startup
+WATCH = ("numpy", "pdfplumber", "pdfminer", "PIL")
+# the serializer/JWT stack is for serving: django.setup() alone (migrate and
+# every other manage.py command) shouldn't import it
+SETUP_WATCH = ("rest_framework.serializers", "rest_framework_simplejwt.tokens", "orjson", "academic.snapshot")
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure worker startup: import time of the WSGI/ASGI app and URLconf, RSS, "
+        "and which heavy modules got imported. Each run is a fresh interpreter."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--app", choices=("wsgi", "asgi"), default="wsgi")
+        parser.add_argument("--repeat", type=int, default=5, help="Report the median of N runs")
+        parser.add_argument("--importtime", type=int, default=0, metavar="N",
+                            help="Also list the N slowest imports (python -X importtime)")
+
+    def handle(self, *args, **opts):
+        module = f"scoupdb.{opts['app']}"
+        runs = [self.probe(module) for _ in range(max(1, opts["repeat"]))]
+
+        med = {k: statistics.median(r[k] for r in runs) for k in ("setup_ms", "urls_ms", "rss_mb", "modules")}
+        self.stdout.write(
+            f"{module}: setup {med['setup_ms']:.0f} ms + urls {med['urls_ms']:.0f} ms = "
+            f"{med['setup_ms'] + med['urls_ms']:.0f} ms | rss {med['rss_mb']:.0f} MB | "
+            f"{med['modules']:.0f} modules (median of {len(runs)})"
+        )
+        loaded = [m for m in runs[-1]["loaded"] if m in WATCH]
+        if loaded:
+            self.stdout.write(self.style.WARNING(f"heavy modules imported at startup: {', '.join(loaded)}"))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"none of {', '.join(WATCH)} imported at startup"))
+        setup_loaded = [m for m in runs[-1]["setup_loaded"] if m in SETUP_WATCH]
+        if setup_loaded:
+            self.stdout.write(self.style.WARNING(f"imported by django.setup(): {', '.join(setup_loaded)}"))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"none of {', '.join(SETUP_WATCH)} imported by django.setup()"))
+
+        if opts["importtime"]:
+            self.stdout.write("slowest imports (cumulative):")
+            for us, name in self.slowest_imports(module, opts["importtime"]):
+                self.stdout.write(f"  {us / 1000:8.1f} ms  {name}")
+
+    def run_probe(self, module, *flags):
+        env = {**os.environ, "DJANGO_SETTINGS_MODULE": os.environ.get("DJANGO_SETTINGS_MODULE", "scoupdb.settings")}
+        proc = subprocess.run(
+            [sys.executable, *flags, "-c", PROBE, module, *WATCH, *SETUP_WATCH],
+            cwd=settings.BASE_DIR, env=env, capture_output=True, text=True,
+        )
+        if proc.returncode:
+            raise CommandError(f"startup probe failed:\n{proc.stderr[-2000:]}")
+        return proc
+
+    def probe(self, module):
+        return json.loads(self.run_probe(module).stdout.strip().splitlines()[-1])
+
+    def slowest_imports(self, module, n):
+        stderr = self.run_probe(module, "-X", "importtime").stderr
+        rows = []
+        for line in stderr.splitlines():
+            # "import time: self [us] | cumulative | imported package"
+            parts = line.split("|")
+            if len(parts) == 3 and parts[1].strip().isdigit():
+                rows.append((int(parts[1]), parts[2].strip()))
+        return sorted(rows, reverse=True)[:n]
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from academic import snapshot
+
+
+class Command(BaseCommand):
+    help = (
+        "Render the public faculty directory and profiles into hashed, precompressed JSON "
+        "under STATIC_ROOT/snapshot/ and update its manifest.json."
+    )
+
+    def handle(self, *args, **opts):
+        manifest = snapshot.build(force=True)
+        self.stdout.write(self.style.SUCCESS(
+            f"DONE. {manifest['count']} faculty, directory {manifest['directory']} "
+            f"(manifest {snapshot.url_prefix()}{snapshot.MANIFEST}, directory version {manifest['version']})"
+        ))
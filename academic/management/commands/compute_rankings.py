@@ -0,0 +1,32 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from academic import ranking
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute Paper.pub_year / citation_score (citations normalized by field and year) "
+        "and Faculty.citation_score, which back /api/rankings/. import_full_dataset runs "
+        "this at the end of every import."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=2000)
+
+    def handle(self, *args, **opts):
+        started = time.monotonic()
+        last = [0.0]
+
+        def progress(n):
+            now = time.monotonic()
+            if now - last[0] >= 5:
+                last[0] = now
+                self.stdout.write(f"  papers: {n} rows scored ({now - started:.0f}s)")
+
+        counts = ranking.recompute(chunk_size=opts["chunk_size"], progress=progress)
+        self.stdout.write(self.style.SUCCESS(
+            f"DONE. updated papers={counts['papers']}, faculty={counts['faculty']} "
+            f"in {time.monotonic() - started:.1f}s"
+        ))
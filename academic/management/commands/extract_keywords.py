@@ -0,0 +1,49 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from academic import keywords
+
+
+class Command(BaseCommand):
+    help = (
+        "Fill Paper.ai_keywords, Patent.aiKeywords and Faculty.ai_keywords with TF-IDF/RAKE "
+        "keywords. Only rows whose text changed since the last run are processed; "
+        "--rebuild recounts the corpus statistics and redoes everything."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rebuild", action="store_true", help="Recount idf and re-extract every row")
+        parser.add_argument("--chunk-size", type=int, default=1000)
+
+    def handle(self, *args, **opts):
+        chunk = opts["chunk_size"]
+        started = time.monotonic()
+
+        def progress(label):
+            last = [0.0]
+
+            def report(n):
+                now = time.monotonic()
+                if now - last[0] >= 5:
+                    last[0] = now
+                    self.stdout.write(f"  {label}: {n} rows scanned ({now - started:.0f}s)")
+            return report
+
+        if opts["rebuild"]:
+            counts = keywords.rebuild(chunk_size=chunk, progress=progress("rebuild"))
+        else:
+            stats, built = keywords.get_stats()
+            if built:
+                self.stdout.write(f"Counted document frequencies over {stats.docs} documents.")
+            counts = {
+                kind: keywords.update_documents(kind, stats=stats, count_new=not built, chunk_size=chunk,
+                                                progress=progress(kind))
+                for kind in keywords.DOCUMENTS
+            }
+            counts["faculty"] = keywords.update_faculty(stats=stats, progress=progress("faculty"))
+
+        self.stdout.write(self.style.SUCCESS(
+            "DONE. updated " + ", ".join(f"{kind}={n}" for kind, n in counts.items())
+            + f" in {time.monotonic() - started:.1f}s"
+        ))
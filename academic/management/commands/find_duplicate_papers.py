@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from academic import dedup
+from academic.models import PaperDuplicate
+
+
+class Command(BaseCommand):
+    help = (
+        "Index every paper's MinHash signature in one pass and flag near-duplicate "
+        "papers (same work under another DOI / lightly edited title) for review."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rebuild", action="store_true", help="Drop the LSH index and re-index everything")
+        parser.add_argument("--chunk-size", type=int, default=2000)
+
+    def handle(self, *args, **opts):
+        def progress(n):
+            self.stdout.write(f"  indexed {n} papers", ending="\r")
+            self.stdout.flush()
+
+        indexed, pairs = dedup.scan(rebuild=opts["rebuild"], chunk_size=opts["chunk_size"], progress=progress)
+        pending = PaperDuplicate.objects.filter(status="pending").count()
+        self.stdout.write("")
+        self.stdout.write(self.style.SUCCESS(
+            f"DONE. indexed={indexed} | pairs flagged={pairs} | pending review={pending}"
+        ))
@@ -1,11 +1,23 @@
+import hashlib
 import json
+import os
+import sys
+import time
+from collections import Counter
+from contextlib import nullcontext
 from pathlib import Path
-from datetime import datetime, date
+from datetime import datetime, date, timedelta
 
 from django.core.management.base import BaseCommand, CommandError
 from django.db import transaction
+from django.utils import timezone
 
-from academic.models import Faculty, Paper, PaperAuthorship
+from academic import dedup, keywords, ranking, snapshot
+from academic.models import (
+    Faculty, FacultySourceDOI, ImportCheckpoint, MergedPaperDOI, Paper, PaperAuthorship,
+)
+
+PHASES = ("faculty", "papers", "link_doi", "link_name", "dedup", "keywords", "faculty_keywords")
 
 
 def parse_date_any(value):
@@ -60,8 +72,82 @@ def merge_keywords_from_record(rec):
     return out
 
 
+def record_doi(rec):
+    value = rec.get("doi") or rec.get("id")
+    if isinstance(value, list):
+        value = value[0] if value else ""
+    return str(value or "").strip()
+
+
+def record_title(rec):
+    value = rec.get("title")
+    if isinstance(value, list):
+        return " ".join(str(t) for t in value)
+    return str(value or "").strip()
+
+
+def source_dois(dois):
+    """The record's 'dois' list, lowercased and deduped."""
+    wanted = set()
+    for d in as_list(dois):
+        d = str(d or "").strip().lower()[:255]
+        if d:
+            wanted.add(d)
+    return wanted
+
+
+def sync_source_dois(fac, wanted):
+    """Make fac's FacultySourceDOI rows match `wanted` (see source_dois)."""
+    have = set(fac.source_dois.values_list("doi", flat=True))
+    if have - wanted:
+        fac.source_dois.filter(doi__in=have - wanted).delete()
+    if wanted - have:
+        FacultySourceDOI.objects.bulk_create(
+            [FacultySourceDOI(faculty=fac, doi=d) for d in wanted - have],
+            ignore_conflicts=True,
+        )
+
+
+def rss_mb():
+    """Current resident set size in MB (peak RSS where /proc isn't available)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError, IndexError):
+        import resource  # Unix only, and only needed off Linux
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 2**20 if sys.platform == "darwin" else peak / 1024
+
+
+class Progress:
+    """Prints done/total, rows/s, ETA and RSS at most every `every` seconds."""
+
+    def __init__(self, out, phase, total, done=0, every=5.0):
+        self.out, self.phase, self.total, self.every = out, phase, total, every
+        self.first = done
+        self.started = self.last = time.monotonic()
+
+    def update(self, done, force=False):
+        now = time.monotonic()
+        if not force and now - self.last < self.every:
+            return
+        self.last = now
+        elapsed = now - self.started
+        rate = (done - self.first) / elapsed if elapsed > 0 else 0.0
+        eta = str(timedelta(seconds=int((self.total - done) / rate))) if rate else "?"
+        pct = 100.0 * done / self.total if self.total else 100.0
+        self.out.write(
+            f"  [{self.phase}] {done}/{self.total} ({pct:.0f}%)  {rate:,.0f} rows/s  "
+            f"ETA {eta}  rss {rss_mb():.0f} MB"
+        )
+
+
 class Command(BaseCommand):
-    help = "Import AcademicMetrics faculty + article JSON into Django models and link authorships."
+    help = (
+        "Import AcademicMetrics faculty + article JSON into Django models and link authorships. "
+        "By default everything runs in one transaction; --checkpoint commits every chunk and "
+        "records progress so an interrupted run can continue with --resume."
+    )
 
     def add_arguments(self, parser):
         parser.add_argument("--faculty", required=True, help="Path to faculty_data.json")
@@ -69,6 +155,14 @@ class Command(BaseCommand):
         parser.add_argument("--dry-run", action="store_true")
         parser.add_argument("--reset",   action="store_true", help="Delete existing Faculty/Paper/PaperAuthorship first")
         parser.add_argument("--max",     type=int, default=0, help="Import at most N papers (for testing)")
+        parser.add_argument("--checkpoint", action="store_true", help="Commit per chunk and record progress")
+        parser.add_argument("--resume",  action="store_true",
+                            help="Continue the last interrupted --checkpoint run over the same files")
+        parser.add_argument("--chunk-size", type=int, default=500, help="Records per chunk / commit")
+        parser.add_argument("--no-snapshot", action="store_true",
+                            help="Don't rebuild the static directory snapshot at the end")
+        parser.add_argument("--report",  default=None,
+                            help="Also write the JSON metrics report to this file")
 
     def handle(self, *args, **opts):
         fpath = Path(opts["faculty"])
@@ -76,19 +170,43 @@ class Command(BaseCommand):
         dry   = opts["dry_run"]
         reset = opts["reset"]
         max_n = int(opts["max"] or 0)
+        self.chunk = max(1, opts["chunk_size"])
+        self.checkpointed = opts["checkpoint"] or opts["resume"]
 
         if not fpath.exists(): raise CommandError(f"Faculty file not found: {fpath}")
         if not ppath.exists(): raise CommandError(f"Papers file not found: {ppath}")
+        if dry and self.checkpointed:
+            raise CommandError("--dry-run can't be combined with --checkpoint/--resume")
+        if reset and opts["resume"]:
+            raise CommandError("--reset would wipe the import being resumed")
 
         try:
-            faculty_json = json.loads(fpath.read_text())
-            papers_json  = json.loads(ppath.read_text())
+            fraw, praw = fpath.read_bytes(), ppath.read_bytes()
+            faculty_json = json.loads(fraw)
+            papers_json  = json.loads(praw)
         except Exception as e:
             raise CommandError(f"Failed to parse JSON: {e}")
 
         if not isinstance(faculty_json, list) or not isinstance(papers_json, list):
             raise CommandError("Both JSON files must contain top-level lists")
 
+        fsha, psha = hashlib.sha256(fraw).hexdigest(), hashlib.sha256(praw).hexdigest()
+        del fraw, praw
+        options = {"max": max_n}
+
+        self.cp = None
+        self.metrics = {}
+        start_phase, start_offset = PHASES[0], 0
+        if opts["resume"]:
+            self.cp = self.find_checkpoint(fsha, psha, options)
+            self.metrics = self.cp.metrics or {}
+            start_phase, start_offset = self.cp.phase, self.cp.offset
+            self.stdout.write(f"Resuming checkpoint #{self.cp.pk} at {start_phase}, record {start_offset}")
+        elif self.checkpointed:
+            self.cp = ImportCheckpoint.objects.create(
+                faculty_sha256=fsha, papers_sha256=psha, options=options, phase=start_phase,
+            )
+
         # Reset (optional)
         if reset and not dry:
             PaperAuthorship.objects.all().delete()
@@ -96,150 +214,283 @@ class Command(BaseCommand):
             Faculty.objects.all().delete()
             self.stdout.write(self.style.WARNING("Existing Faculty/Paper/PaperAuthorship deleted."))
 
-        created_fac = updated_fac = 0
-        created_pap = updated_pap = 0
-        linked = 0
-
-        ctx = transaction.atomic() if not dry else _NullCtx()
-        with ctx:
-            # 1) FACULTY
-            for i, rec in enumerate(faculty_json, 1):
-                fid  = (rec.get("_id") or "").strip()  # AcademicMetrics slug
-                name = (rec.get("name") or "").strip()
-                if not fid or not name:
-                    continue
-
-                fac, made = Faculty.objects.get_or_create(faculty_id=fid, defaults={"name": name})
-                if made:
-                    created_fac += 1
-                else:
-                    updated_fac += 1
-
-                fac.name = name
-                fac.total_citations   = rec.get("total_citations") or 0
-                fac.article_count     = rec.get("article_count") or 0
-                fac.average_citations = float(rec.get("average_citations") or 0.0)
-
-                fac.department_affiliations = as_list(rec.get("department_affiliations"))
-                fac.dois   = as_list(rec.get("dois"))
-                fac.titles = as_list(rec.get("titles"))
-                fac.categories = as_list(rec.get("categories"))
-
-                # merged flat keywords
-                fac.keywords = merge_keywords_from_record(rec)
-
-                # try to backfill first/last if missing
-                if not fac.first_name or not fac.last_name:
-                    parts = name.split()
-                    if len(parts) == 1:
-                        fac.last_name = parts[0]
-                    elif len(parts) > 1:
-                        fac.first_name = " ".join(parts[:-1])
-                        fac.last_name  = parts[-1]
-
-                fac.save()
-
-            # Build quick lookup for Faculty by name (case-insensitive)
-            # and a DOI->Faculty list map from fac.dois for linking.
-            fac_by_name = {}
-            doi_to_faculty_ids = {}
-            for fac in Faculty.objects.all():
-                key = (fac.name or "").strip().lower()
-                if key:
-                    fac_by_name.setdefault(key, []).append(fac)
-                # Map all known DOIs for this faculty
-                for d in fac.dois or []:
-                    if not d: continue
-                    doi_to_faculty_ids.setdefault(d.lower(), set()).add(fac.id)
-
-            # 2) PAPERS
-            for j, rec in enumerate(papers_json, 1):
-                if max_n and j > max_n:
-                    break
-
-                doi = (rec.get("doi") or rec.get("id") or "").strip()
-                title_value = rec.get("title")
-                if isinstance(title_value, list):
-                    title = " ".join(str(t) for t in title_value)
-                else:
-                    title = str(title_value or "").strip()
-                if not doi or not title:
-                    continue
-
-                paper, made = Paper.objects.get_or_create(doi=doi, defaults={"title": title[:500]})
-                if made:
-                    created_pap += 1
-                else:
-                    updated_pap += 1
-
-                paper.title    = title[:500]
-                paper.abstract = rec.get("abstract") or None
-                paper.journal  = rec.get("journal") or None
-                paper.tc_count = rec.get("tc_count") or 0
-
-                # dates
-                paper.date_published_online = parse_date_any(rec.get("date_published_online"))
-                paper.date_published_print  = parse_date_any(rec.get("date_published_print"))
-
-                # urls
-                paper.license_url = rec.get("license_url") or None
-                paper.download_url= rec.get("download_url") or None
-                paper.url         = rec.get("url") or None
-
-                # themes + merged keywords
-                paper.themes   = as_list(rec.get("themes"))
-                paper.keywords = merge_keywords_from_record(rec)
-
-                paper.save()
-
-            # 3) LINKING (two strategies for robustness)
-
-            # (a) By DOI crosswalk from Faculty.dois
-            doi_lower_to_paper = {p.doi.lower(): p for p in Paper.objects.all()}
-            for dlower, fac_ids in doi_to_faculty_ids.items():
-                p = doi_lower_to_paper.get(dlower)
-                if not p:
-                    continue
-                for fid in fac_ids:
-                    fac = Faculty.objects.filter(id=fid).first()
-                    if not fac: continue
-                    p.authors.add(fac)
-                    # Ensure a pending authorship record
-                    PaperAuthorship.objects.get_or_create(paper=p, faculty=fac, defaults={"status":"pending"})
-                    linked += 1
-
-            # (b) By article faculty_members names (if present)
-            for rec in papers_json:
-                doi_value = rec.get("doi") or rec.get("id")
-                if isinstance(doi_value, list):
-                    doi = str(doi_value[0]) if doi_value else ""
-                else:
-                    doi = str(doi_value or "").strip()
-                if not doi:
-                    continue
-                p = Paper.objects.filter(doi=doi).first()
-                if not p:
-                    continue
-
-                names = as_list(rec.get("faculty_members"))
-                for nm in names:
-                    key = (nm or "").strip().lower()
-                    if not key:
-                        continue
-                    for fac in fac_by_name.get(key, []):
-                        p.authors.add(fac)
-                        PaperAuthorship.objects.get_or_create(paper=p, faculty=fac, defaults={"status":"pending"})
-                        linked += 1
-
-            if dry:
-                raise CommandError("Dry run complete — rolled back.")
-
+        papers_in = papers_json[:max_n] if max_n else papers_json
+        steps = {
+            "faculty":   (lambda: faculty_json, self.import_faculty),
+            "papers":    (lambda: papers_in, self.import_papers),
+            "link_doi":  (self.doi_links, self.link_by_doi),
+            "link_name": (lambda: papers_json, self.link_by_name),
+            "dedup":     (lambda: [d for d in map(record_doi, papers_in) if d], self.scan_duplicates),
+            "keywords":  (lambda: [d for d in map(record_doi, papers_in) if d], self.extract_keywords),
+            "faculty_keywords": (lambda: list(Faculty.objects.order_by("pk").values_list("pk", flat=True)),
+                                 self.extract_faculty_keywords),
+        }
+        started = timezone.now()
+
+        # one transaction for the whole run unless checkpointing
+        outer = nullcontext() if self.checkpointed else transaction.atomic()
+        # papers are indexed for duplicates in their own phase, not on every
+        # save; the directory snapshot is rebuilt once at the end
+        with outer, dedup.indexing_paused(), snapshot.deferred():
+            for phase in PHASES[PHASES.index(start_phase):]:
+                if phase == "dedup" and dry:  # dedup / keywords only for data that stays
+                    raise CommandError("Dry run complete — rolled back.")
+                offset = start_offset if phase == start_phase else 0
+                items, handler = steps[phase]
+                self.run_phase(phase, items(), handler, offset)
+
+            # scores are normalized over the whole catalog: one pass after all phases
+            t0 = time.monotonic()
+            counts = ranking.recompute(chunk_size=self.chunk * 4)
+            self.metrics["ranking"] = {**counts, "seconds": round(time.monotonic() - t0, 3)}
+
+        if self.cp:
+            self.cp.phase, self.cp.offset, self.cp.metrics = "done", 0, self.metrics
+            self.cp.finished_at = timezone.now()
+            self.cp.save()
+
+        self.write_report(opts["report"], started, fpath, ppath, fsha, psha, options)
+
+        if not opts["no_snapshot"]:
+            manifest = snapshot.build(force=True)
+            self.stdout.write(f"Directory snapshot: {manifest['count']} faculty, {manifest['directory']}")
+
+        m = lambda phase, key: self.metrics.get(phase, {}).get(key, 0)
         self.stdout.write(self.style.SUCCESS(
-            f"DONE. faculty: created={created_fac}, updated={updated_fac} | "
-            f"papers: created={created_pap}, updated={updated_pap} | links={linked}"
+            f"DONE. faculty: created={m('faculty', 'created')}, updated={m('faculty', 'updated')} | "
+            f"papers: created={m('papers', 'created')}, updated={m('papers', 'updated')} | "
+            f"links={m('link_doi', 'links') + m('link_name', 'links')} | "
+            f"duplicate candidates={m('dedup', 'duplicates')}"
         ))
 
-
-class _NullCtx:
-    def __enter__(self): return None
-    def __exit__(self, *exc): return False
\ No newline at end of file
+    # ----------------------------------------
+    # Checkpoints / progress / report
+    # ----------------------------------------
+
+    def find_checkpoint(self, fsha, psha, options):
+        last = ImportCheckpoint.objects.filter(finished_at__isnull=True).order_by("-updated_at").first()
+        if last is None:
+            raise CommandError("Nothing to resume: no unfinished checkpointed import.")
+        if (last.faculty_sha256, last.papers_sha256) != (fsha, psha):
+            raise CommandError(
+                f"Source files changed since checkpoint #{last.pk}; start over with --checkpoint."
+            )
+        if last.options != options:
+            raise CommandError(f"Checkpoint #{last.pk} was started with {last.options}, not {options}.")
+        return last
+
+    def save_checkpoint(self, phase, offset):
+        if self.cp is None:
+            return
+        self.cp.phase, self.cp.offset = phase, offset
+        ImportCheckpoint.objects.filter(pk=self.cp.pk).update(
+            phase=phase, offset=offset, metrics=self.metrics, updated_at=timezone.now(),
+        )
+
+    def run_phase(self, phase, items, handler, offset=0):
+        """
+        Feed `items[offset:]` to handler in chunks. In checkpoint mode each
+        chunk and its checkpoint row commit together, so a crash loses at
+        most the chunk in flight.
+        """
+        m = Counter(self.metrics.get(phase, {}))
+        seconds = m["seconds"]
+        started = time.monotonic()
+        progress = Progress(self.stdout, phase, len(items), offset)
+        self.stdout.write(f"{phase}: {len(items)} records" + (f", from {offset}" if offset else ""))
+
+        for lo in range(offset, len(items), self.chunk):
+            batch = items[lo:lo + self.chunk]
+            with transaction.atomic() if self.checkpointed else nullcontext():
+                handler(batch, m)
+                m["rows"] += len(batch)
+                m["seconds"] = round(seconds + time.monotonic() - started, 3)
+                m["peak_rss_mb"] = max(m["peak_rss_mb"], round(rss_mb(), 1))
+                self.metrics[phase] = dict(m)
+                self.save_checkpoint(phase, lo + len(batch))
+            progress.update(lo + len(batch))
+        if len(items) > offset:
+            progress.update(len(items), force=True)
+
+        m["seconds"] = round(seconds + time.monotonic() - started, 3)
+        m["rows_per_sec"] = round(m["rows"] / m["seconds"], 1) if m["seconds"] else 0.0
+        self.metrics[phase] = dict(m)
+        nxt = PHASES.index(phase) + 1
+        if nxt < len(PHASES):
+            self.save_checkpoint(PHASES[nxt], 0)
+
+    def write_report(self, path, started, fpath, ppath, fsha, psha, options):
+        report = {
+            "started_at": started.isoformat(),
+            "finished_at": timezone.now().isoformat(),
+            "checkpoint": self.cp.pk if self.cp else None,
+            "faculty_file": {"path": str(fpath), "sha256": fsha},
+            "papers_file": {"path": str(ppath), "sha256": psha},
+            "options": options,
+            "phases": {p: self.metrics[p] for p in (*PHASES, "ranking") if p in self.metrics},
+        }
+
+        self.stdout.write(f"{'phase':10} {'rows':>9} {'seconds':>9} {'rows/s':>9} {'peak MB':>8}  counts")
+        for phase, m in report["phases"].items():
+            counts = ", ".join(
+                f"{k}={v}" for k, v in m.items()
+                if k not in ("rows", "seconds", "rows_per_sec", "peak_rss_mb")
+            )
+            self.stdout.write(
+                f"{phase:10} {m.get('rows', 0):>9} {m.get('seconds', 0):>9.1f} "
+                f"{m.get('rows_per_sec', 0):>9.1f} {m.get('peak_rss_mb', 0):>8.0f}  {counts}"
+            )
+        if path:
+            Path(path).write_text(json.dumps(report, indent=2))
+            self.stdout.write(f"Metrics report written to {path}")
+
+    # ----------------------------------------
+    # Phases: handler(batch, counters)
+    # ----------------------------------------
+
+    def import_faculty(self, batch, m):
+        for rec in batch:
+            fid  = (rec.get("_id") or "").strip()  # AcademicMetrics slug
+            name = (rec.get("name") or "").strip()
+            if not fid or not name:
+                m["skipped"] += 1
+                continue
+
+            fac, made = Faculty.objects.get_or_create(faculty_id=fid, defaults={"name": name})
+            m["created" if made else "updated"] += 1
+
+            fac.name = name
+            fac.total_citations   = rec.get("total_citations") or 0
+            dois = source_dois(rec.get("dois"))
+            # papers merged as duplicates are in the source count twice
+            fac.article_count     = max(0, (rec.get("article_count") or 0) - dedup.double_counted(dois))
+            fac.average_citations = float(rec.get("average_citations") or 0.0)
+
+            fac.department_affiliations = as_list(rec.get("department_affiliations"))
+            fac.categories = as_list(rec.get("categories"))
+
+            # merged flat keywords
+            fac.keywords = merge_keywords_from_record(rec)
+
+            # try to backfill first/last if missing
+            if not fac.first_name or not fac.last_name:
+                parts = name.split()
+                if len(parts) == 1:
+                    fac.last_name = parts[0]
+                elif len(parts) > 1:
+                    fac.first_name = " ".join(parts[:-1])
+                    fac.last_name  = parts[-1]
+
+            fac.save()
+            sync_source_dois(fac, dois)
+
+    def import_papers(self, batch, m):
+        merged = dedup.merged_into(record_doi(rec) for rec in batch)
+        for rec in batch:
+            doi = record_doi(rec)
+            title = record_title(rec)
+            if not doi or not title:
+                m["skipped"] += 1
+                continue
+            if doi.lower() in merged:
+                m["merged"] += 1  # folded into another paper; don't bring the duplicate back
+                continue
+
+            paper, made = Paper.objects.get_or_create(doi=doi, defaults={"title": title[:500]})
+            m["created" if made else "updated"] += 1
+
+            paper.title    = title[:500]
+            paper.abstract = rec.get("abstract") or None
+            paper.journal  = rec.get("journal") or None
+            paper.tc_count = rec.get("tc_count") or 0
+
+            # dates
+            paper.date_published_online = parse_date_any(rec.get("date_published_online"))
+            paper.date_published_print  = parse_date_any(rec.get("date_published_print"))
+
+            # urls
+            paper.license_url = rec.get("license_url") or None
+            paper.download_url= rec.get("download_url") or None
+            paper.url         = rec.get("url") or None
+
+            # themes + merged keywords
+            paper.themes   = as_list(rec.get("themes"))
+            paper.keywords = merge_keywords_from_record(rec)
+
+            paper.save()
+
+    def link(self, pairs, m):
+        """pairs: {(paper_id, faculty_id)} -> pending authorship (existing ones keep their status)"""
+        PaperAuthorship.objects.bulk_create(
+            [PaperAuthorship(paper_id=p, faculty_id=f, status="pending") for p, f in pairs],
+            ignore_conflicts=True,
+        )
+        m["links"] += len(pairs)
+
+    def doi_links(self):
+        """
+        (a) By DOI crosswalk from FacultySourceDOI: sorted
+        [(doi, paper_id, [faculty ids])] for staged DOIs we have a paper for.
+        Sorted so offsets mean the same thing when resuming.
+        """
+        paper_by_doi = {}
+        for pid, d in Paper.objects.values_list("id", "doi").iterator(chunk_size=5000):
+            paper_by_doi[d.lower()] = pid
+        for d, pid in MergedPaperDOI.objects.values_list("doi", "paper_id").iterator(chunk_size=5000):
+            paper_by_doi.setdefault(d, pid)
+        by_doi = {}
+        for d, fac_id in FacultySourceDOI.objects.values_list("doi", "faculty_id").iterator(chunk_size=5000):
+            if d in paper_by_doi:
+                by_doi.setdefault(d, set()).add(fac_id)
+        return [(d, paper_by_doi[d], sorted(fids)) for d, fids in sorted(by_doi.items())]
+
+    def link_by_doi(self, batch, m):
+        self.link({(pid, fid) for _, pid, fids in batch for fid in fids}, m)
+
+    def link_by_name(self, batch, m):
+        # (b) By article faculty_members names (if present)
+        if not hasattr(self, "fac_by_name"):
+            self.fac_by_name = {}
+            for fac_id, name in Faculty.objects.values_list("id", "name").iterator(chunk_size=5000):
+                key = (name or "").strip().lower()
+                if key:
+                    self.fac_by_name.setdefault(key, []).append(fac_id)
+
+        dois = {record_doi(rec) for rec in batch} - {""}
+        paper_ids = dict(Paper.objects.filter(doi__in=dois).values_list("doi", "id"))
+        merged = dedup.merged_into(dois)
+        pairs = set()
+        for rec in batch:
+            doi = record_doi(rec)
+            pid = paper_ids.get(doi) or merged.get(doi.lower())
+            if not pid:
+                continue
+            for nm in as_list(rec.get("faculty_members")):
+                key = (nm or "").strip().lower()
+                for fac_id in self.fac_by_name.get(key, []) if key else []:
+                    pairs.add((pid, fac_id))
+        self.link(pairs, m)
+
+    def scan_duplicates(self, batch, m):
+        # duplicates among the imported papers and against the catalog
+        indexed, pairs = dedup.scan(Paper.objects.filter(doi__in=batch))
+        m["indexed"] += indexed
+        m["duplicates"] += pairs
+
+    def keyword_stats(self):
+        # idf counts, built over the whole corpus on the first import; after
+        # that, newly imported papers are added to them as they are processed
+        if not hasattr(self, "kw_stats"):
+            self.kw_stats, built = keywords.get_stats()
+            self.kw_count_new = not built
+        return self.kw_stats
+
+    def extract_keywords(self, batch, m):
+        # only papers whose title/abstract changed are re-extracted
+        m["updated"] += keywords.update_documents(
+            "paper", Paper.objects.filter(doi__in=batch),
+            stats=self.keyword_stats(), count_new=self.kw_count_new, chunk_size=len(batch),
+        )
+
+    def extract_faculty_keywords(self, batch, m):
+        m["updated"] += keywords.update_faculty(Faculty.objects.filter(pk__in=batch), stats=self.keyword_stats())
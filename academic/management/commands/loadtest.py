@@ -0,0 +1,169 @@
+import asyncio
+import time
+from collections import Counter
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    k = min(len(sorted_values) - 1, int(round(pct / 100.0 * (len(sorted_values) - 1))))
+    return sorted_values[k]
+
+
+async def _read_response(reader):
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError("connection closed")
+    status = int(status_line.split()[1])
+
+    length = None
+    chunked = False
+    keep_alive = True
+    x_cache = None
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        name = name.strip().lower()
+        value = value.strip().lower()
+        if name == "content-length":
+            length = int(value)
+        elif name == "transfer-encoding" and "chunked" in value:
+            chunked = True
+        elif name == "connection" and value == "close":
+            keep_alive = False
+        elif name == "x-cache":
+            x_cache = value
+
+    if chunked:
+        while True:
+            size = int((await reader.readline()).strip() or b"0", 16)
+            await reader.readexactly(size + 2)
+            if size == 0:
+                break
+    elif length is not None:
+        await reader.readexactly(length)
+    else:
+        await reader.read()
+        keep_alive = False
+    return status, keep_alive, x_cache
+
+
+# X-Cache values (academic.coalesce) for which the server built the response itself
+BUILD_OUTCOMES = ("miss", "early", "timeout")
+
+
+async def _worker(host, port, request_bytes, started, deadline, remaining, latencies, errors, outcomes, builds):
+    reader = writer = None
+    while time.perf_counter() < deadline and remaining[0] > 0:
+        remaining[0] -= 1
+        try:
+            if writer is None:
+                reader, writer = await asyncio.open_connection(host, port)
+            start = time.perf_counter()
+            writer.write(request_bytes)
+            await writer.drain()
+            status, keep_alive, x_cache = await _read_response(reader)
+            latencies.append(time.perf_counter() - start)
+            if x_cache:
+                outcomes[x_cache] += 1
+                if x_cache in BUILD_OUTCOMES:
+                    builds[int(start - started)] += 1  # by second of the run
+            if status >= 400:
+                errors[0] += 1
+            if not keep_alive:
+                writer.close()
+                writer = None
+        except (OSError, ConnectionError, asyncio.IncompleteReadError, ValueError, IndexError):
+            errors[0] += 1
+            if writer is not None:
+                writer.close()
+            writer = None
+    if writer is not None:
+        writer.close()
+
+
+async def run_load(url, concurrency, total, duration, headers):
+    parts = urlsplit(url)
+    if parts.scheme != "http":
+        raise CommandError("Only plain http:// targets are supported")
+    host = parts.hostname
+    port = parts.port or 80
+    path = parts.path or "/"
+    if parts.query:
+        path += "?" + parts.query
+
+    head = [f"GET {path} HTTP/1.1", f"Host: {parts.netloc}", "Connection: keep-alive"]
+    head.extend(headers)
+    request_bytes = ("\r\n".join(head) + "\r\n\r\n").encode("latin-1")
+
+    latencies, errors, remaining = [], [0], [total or float("inf")]
+    outcomes, builds = Counter(), Counter()
+    started = time.perf_counter()
+    deadline = started + duration
+    await asyncio.gather(*[
+        _worker(host, port, request_bytes, started, deadline, remaining, latencies, errors, outcomes, builds)
+        for _ in range(concurrency)
+    ])
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "url": url,
+        "requests": len(latencies),
+        "errors": errors[0],
+        "rps": len(latencies) / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "max_ms": (latencies[-1] * 1000) if latencies else 0.0,
+        "x_cache": dict(outcomes),
+        "builds_per_s": [builds[s] for s in range(int(elapsed) + 1)],
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        "Fire concurrent keep-alive GETs at one or more running servers and report "
+        "throughput and latency percentiles. Compare the sync and async stacks with e.g.\n"
+        "  gunicorn scoupdb.wsgi:application -b :8000 &\n"
+        "  gunicorn scoupdb.asgi:application -k uvicorn.workers.UvicornWorker -b :8001 &\n"
+        "  manage.py loadtest --url http://127.0.0.1:8000/api/faculty/ "
+        "--url http://127.0.0.1:8001/api/async/faculty/ -c 500\n"
+        "Responses carrying X-Cache (academic.coalesce) are tallied, with the number of "
+        "server-side rebuilds per second: run longer than LIST_CACHE_TTL (e.g. "
+        "LIST_CACHE_TTL=5 -d 30) to see a cache expiry, and with LIST_CACHE_TTL=0 to compare."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--url", action="append", required=True, help="Target URL (repeatable)")
+        parser.add_argument("-c", "--concurrency", type=int, default=500)
+        parser.add_argument("-n", "--requests", type=int, default=0, help="Total requests per URL (0 = until --duration)")
+        parser.add_argument("-d", "--duration", type=float, default=30.0, help="Seconds per URL")
+        parser.add_argument("-H", "--header", action="append", default=[], help="Extra header, e.g. 'Authorization: Bearer ...'")
+
+    def handle(self, *args, **opts):
+        rows = []
+        for url in opts["url"]:
+            self.stdout.write(f"-> {url} (c={opts['concurrency']})")
+            rows.append(asyncio.run(run_load(
+                url, opts["concurrency"], opts["requests"], opts["duration"], opts["header"]
+            )))
+
+        self.stdout.write(f"{'requests':>9} {'errors':>7} {'req/s':>9} {'p50 ms':>9} {'p99 ms':>9} {'max ms':>9}  url")
+        for r in rows:
+            self.stdout.write(
+                f"{r['requests']:>9} {r['errors']:>7} {r['rps']:>9.1f} {r['p50_ms']:>9.1f} "
+                f"{r['p99_ms']:>9.1f} {r['max_ms']:>9.1f}  {r['url']}"
+            )
+        for r in rows:
+            if r["x_cache"]:
+                counts = ", ".join(f"{k}={v}" for k, v in sorted(r["x_cache"].items()))
+                builds = r["builds_per_s"]
+                self.stdout.write(f"X-Cache {counts}  {r['url']}")
+                self.stdout.write(
+                    f"  rebuilds/s: max {max(builds)}, mean {sum(builds) / len(builds):.1f}  "
+                    f"[{' '.join(map(str, builds))}]"
+                )
@@ -0,0 +1,101 @@
+import os
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from whitenoise.middleware import WhiteNoiseMiddleware
+from whitenoise.string_utils import ensure_leading_trailing_slash
+
+from . import snapshot
+from .storage import ContentHashStorage
+
+
+class MediaWhiteNoiseMiddleware(WhiteNoiseMiddleware):
+    """
+    WhiteNoise that also serves MEDIA_ROOT, so photos never go through a view,
+    and the directory snapshot under STATIC_ROOT/snapshot/ (see
+    academic.snapshot), which is rewritten while the worker runs.
+
+    Files written after the worker started are not in WhiteNoise's startup
+    scan, so on a miss we look the file up on disk once and keep it.
+    Content-hashed names (ContentHashStorage, snapshot files) are immutable,
+    which makes that cache safe and lets us send far-future Cache-Control
+    headers; the snapshot manifest is looked up fresh every time.
+    ETag / Last-Modified / Range handling all come from WhiteNoise itself.
+
+    Sync and async capable (WhiteNoise itself is sync only), so under ASGI
+    the async views are not pushed into a thread by this middleware.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None, settings=settings):
+        # set before super().__init__, which already asks immutable_file_test
+        self.media_prefix = ensure_leading_trailing_slash(settings.MEDIA_URL or "/media/")
+        self.media_root = os.path.abspath(settings.MEDIA_ROOT) + os.path.sep
+        self.snapshot_prefix = snapshot.url_prefix()
+        self.snapshot_root = os.path.abspath(snapshot.root()) + os.path.sep
+        super().__init__(get_response, settings=settings)
+        if os.path.isdir(self.media_root):
+            self.update_files_dictionary(self.media_root, self.media_prefix)
+        # the startup scan of STATIC_ROOT picked up the manifest as it was then
+        for url in [u for u in self.files if u.startswith(self.snapshot_prefix)]:
+            if not snapshot.is_hashed_name(url):
+                del self.files[url]
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self.file_response(request) or self.get_response(request)
+
+    async def __acall__(self, request):
+        if request.path_info == self.snapshot_prefix + snapshot.MANIFEST:
+            # ensure_current() may ask the DB for the directory version
+            response = await sync_to_async(self.file_response)(request)
+        else:
+            response = self.file_response(request)  # dict lookups, at most a stat()
+        return response or await self.get_response(request)
+
+    def file_response(self, request):
+        """The response for a media, snapshot or static file; None for everything else."""
+        url = request.path_info
+        if url.startswith(self.media_prefix):
+            media_file = self.files.get(url) or self.find_on_disk(
+                url, self.media_prefix, self.media_root, ContentHashStorage.is_hashed_name
+            )
+            if media_file is not None:
+                return self.serve(media_file, request)
+        elif url.startswith(self.snapshot_prefix):
+            if url == self.snapshot_prefix + snapshot.MANIFEST:
+                snapshot.ensure_current()
+            snapshot_file = self.files.get(url) or self.find_on_disk(
+                url, self.snapshot_prefix, self.snapshot_root, snapshot.is_hashed_name
+            )
+            if snapshot_file is not None:
+                return self.serve(snapshot_file, request)
+        # WhiteNoiseMiddleware.__call__, minus the call down the chain
+        static_file = self.find_file(url) if self.autorefresh else self.files.get(url)
+        return self.serve(static_file, request) if static_file is not None else None
+
+    def find_on_disk(self, url, prefix, root, is_immutable):
+        if not self.url_is_canonical(url) or url.endswith("/"):
+            return None
+        path = os.path.join(root, url[len(prefix):])
+        if os.path.commonprefix((root, path)) != root:
+            return None
+        if not os.path.isfile(path):
+            return None
+        found = self.get_static_file(path, url)
+        if is_immutable(path):
+            # only immutable names are safe to remember between requests
+            self.files[url] = found
+        return found
+
+    def immutable_file_test(self, path, url):
+        if url.startswith(self.media_prefix):
+            return ContentHashStorage.is_hashed_name(url)
+        if url.startswith(self.snapshot_prefix):
+            return snapshot.is_hashed_name(url)
+        return super().immutable_file_test(path, url)
@@ -0,0 +1,71 @@
+# Generated by Django 5.2.7 on 2026-10-19 18:23
+"""
+Moves Faculty.dois into the FacultySourceDOI table and drops the
+denormalized Faculty.dois / Faculty.titles JSON columns.
+
+Data loss: Faculty.titles (the AcademicMetrics title list) is dropped
+without a copy. Titles now come from the linked papers (Faculty.titles
+property), which is a different list: AcademicMetrics titles without a
+matching Paper row are gone. The source JSON still has them. Back up the
+column first if you need it. Reversing restores the dois but leaves
+titles empty; it does not make up a list from the papers.
+"""
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def copy_dois_to_staging(apps, schema_editor):
+    Faculty = apps.get_model('academic', 'Faculty')
+    FacultySourceDOI = apps.get_model('academic', 'FacultySourceDOI')
+
+    batch = []
+    for fac_id, dois in Faculty.objects.values_list('id', 'dois').iterator(chunk_size=500):
+        seen = set()
+        for d in dois or []:
+            d = str(d or '').strip().lower()[:255]
+            if d and d not in seen:
+                seen.add(d)
+                batch.append(FacultySourceDOI(faculty_id=fac_id, doi=d))
+        if len(batch) >= 5000:
+            FacultySourceDOI.objects.bulk_create(batch, ignore_conflicts=True)
+            batch = []
+    FacultySourceDOI.objects.bulk_create(batch, ignore_conflicts=True)
+
+
+def copy_staging_to_dois(apps, schema_editor):
+    # the dropped titles are not recoverable (see the module docstring);
+    # the re-added column keeps its default (empty list)
+    Faculty = apps.get_model('academic', 'Faculty')
+    for fac in Faculty.objects.prefetch_related('source_dois'):
+        fac.dois = [s.doi for s in fac.source_dois.all()]
+        fac.save(update_fields=['dois'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academic', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FacultySourceDOI',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('doi', models.CharField(db_index=True, max_length=255)),
+                ('faculty', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='source_dois', to='academic.faculty')),
+            ],
+            options={
+                'unique_together': {('faculty', 'doi')},
+            },
+        ),
+        migrations.RunPython(copy_dois_to_staging, copy_staging_to_dois),
+        migrations.RemoveField(
+            model_name='faculty',
+            name='dois',
+        ),
+        migrations.RemoveField(
+            model_name='faculty',
+            name='titles',
+        ),
+    ]
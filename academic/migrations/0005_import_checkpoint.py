@@ -0,0 +1,28 @@
+# Generated by Django 5.2.7 on 2026-10-19 18:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academic', '0004_dataset_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('faculty_sha256', models.CharField(max_length=64)),
+                ('papers_sha256', models.CharField(max_length=64)),
+                ('options', models.JSONField(blank=True, default=dict)),
+                ('phase', models.CharField(max_length=20)),
+                ('offset', models.IntegerField(default=0)),
+                ('metrics', models.JSONField(blank=True, default=dict)),
+                ('started_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,50 @@
+"""
+Indexes behind the admin's search_fields on PostgreSQL.
+
+Django compiles "=field" / "^field" searches to UPPER(col::text) = ... and
+UPPER(col::text) LIKE 'X%'; an expression index with text_pattern_ops
+serves both. Other databases don't need (or can't use) these, so this is
+a no-op there.
+"""
+from django.db import migrations
+
+INDEXES = [
+    ("academic_faculty", "name"),
+    ("academic_faculty", "last_name"),
+    ("academic_faculty", "faculty_id"),
+    ("academic_faculty", "email"),
+    ("academic_paper", "doi"),
+    ("academic_paper", "title"),
+]
+
+
+def _name(table, column):
+    return f"{table}_{column}_upper_idx"
+
+
+def create_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for table, column in INDEXES:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS "{_name(table, column)}" '
+            f'ON "{table}" (UPPER("{column}"::text) text_pattern_ops)'
+        )
+
+
+def drop_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for table, column in INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS "{_name(table, column)}"')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("academic", "0005_import_checkpoint"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_indexes, drop_indexes),
+    ]
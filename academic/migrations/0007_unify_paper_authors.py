@@ -0,0 +1,74 @@
+"""
+Paper.authors now goes through PaperAuthorship instead of its own
+auto-created table.
+
+Django can't ALTER an m2m to add `through=`, so: copy every link that only
+exists in the old table into PaperAuthorship, drop the old field/table,
+and re-add `authors` on top of PaperAuthorship. Backwards, the old table
+is recreated and refilled from PaperAuthorship.
+
+Links with no authorship row were added by the faculty themselves (my
+papers, CV upload; the importer always wrote a pending row next to its
+link), so they come over as 'approved', same as those views write now.
+"""
+from django.db import migrations, models
+
+BATCH = 5000
+
+
+def copy_links_to_authorships(apps, schema_editor):
+    Paper = apps.get_model("academic", "Paper")
+    PaperAuthorship = apps.get_model("academic", "PaperAuthorship")
+    Through = Paper.authors.through
+    db = schema_editor.connection.alias
+
+    rows = Through.objects.using(db).values_list("paper_id", "faculty_id").order_by("pk")
+    batch = []
+    for paper_id, faculty_id in rows.iterator(chunk_size=BATCH):
+        batch.append(PaperAuthorship(paper_id=paper_id, faculty_id=faculty_id, status="approved"))
+        if len(batch) >= BATCH:
+            PaperAuthorship.objects.using(db).bulk_create(batch, ignore_conflicts=True)
+            batch = []
+    PaperAuthorship.objects.using(db).bulk_create(batch, ignore_conflicts=True)
+
+
+def copy_authorships_to_links(apps, schema_editor):
+    Paper = apps.get_model("academic", "Paper")
+    PaperAuthorship = apps.get_model("academic", "PaperAuthorship")
+    Through = Paper.authors.through
+    db = schema_editor.connection.alias
+
+    rows = PaperAuthorship.objects.using(db).values_list("paper_id", "faculty_id").order_by("pk")
+    batch = []
+    for paper_id, faculty_id in rows.iterator(chunk_size=BATCH):
+        batch.append(Through(paper_id=paper_id, faculty_id=faculty_id))
+        if len(batch) >= BATCH:
+            Through.objects.using(db).bulk_create(batch, ignore_conflicts=True)
+            batch = []
+    Through.objects.using(db).bulk_create(batch, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("academic", "0006_admin_search_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(copy_links_to_authorships, copy_authorships_to_links),
+        migrations.RemoveField(
+            model_name="paper",
+            name="authors",
+        ),
+        migrations.AddField(
+            model_name="paper",
+            name="authors",
+            field=models.ManyToManyField(
+                blank=True, related_name="papers", through="academic.PaperAuthorship", to="academic.faculty"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="paperauthorship",
+            index=models.Index(fields=["faculty", "status"], name="authorship_faculty_status_idx"),
+        ),
+    ]
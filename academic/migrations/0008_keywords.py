@@ -0,0 +1,34 @@
+# Generated by Django 5.2.7 on 2026-10-19 18:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academic', '0007_unify_paper_authors'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='KeywordStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('docs', models.PositiveBigIntegerField(default=0)),
+                ('df', models.BinaryField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='KeywordSourceHash',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('paper', 'Paper'), ('patent', 'Patent'), ('faculty', 'Faculty')], max_length=10)),
+                ('object_id', models.BigIntegerField()),
+                ('text_hash', models.CharField(max_length=40)),
+            ],
+            options={
+                'unique_together': {('kind', 'object_id')},
+            },
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.7 on 2026-10-19 18:56
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academic', '0008_keywords'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='faculty',
+            name='citation_score',
+            field=models.FloatField(default=0.0),
+        ),
+        migrations.AddField(
+            model_name='paper',
+            name='citation_score',
+            field=models.FloatField(default=0.0),
+        ),
+        migrations.AddField(
+            model_name='paper',
+            name='pub_year',
+            field=models.SmallIntegerField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='faculty',
+            index=models.Index(condition=models.Q(('is_approved', True), ('profile_visibility', True)), fields=['department', '-citation_score', 'id'], name='faculty_dept_score_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='faculty',
+            index=models.Index(condition=models.Q(('is_approved', True), ('profile_visibility', True)), fields=['-citation_score', 'id'], name='faculty_score_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='paper',
+            index=models.Index(fields=['pub_year', '-citation_score', 'id'], name='paper_year_score_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='paper',
+            index=models.Index(fields=['-citation_score', 'id'], name='paper_score_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.7 on 2026-10-19 19:08
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academic', '0009_rankings'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MergedPaperDOI',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('doi', models.CharField(max_length=255, unique=True)),
+                ('merged_at', models.DateTimeField(auto_now_add=True)),
+                ('paper', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='merged_dois', to='academic.paper')),
+            ],
+        ),
+    ]
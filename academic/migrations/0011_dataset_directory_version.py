@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-19 19:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academic', '0010_merged_paper_doi'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='datasetversion',
+            name='directory_version',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+    ]
@@ -3,6 +3,9 @@
 from django.db import models
 from django.contrib.auth.models import User
 
+# what the public lists show (and the partial ranking indexes cover)
+PUBLIC_FACULTY = models.Q(is_approved=True, profile_visibility=True)
+
 class Faculty(models.Model):
     # Existing fields (keep yours as-is)
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name="faculty_profile", null=True, blank=True)
@@ -31,14 +34,38 @@ class Faculty(models.Model):
     average_citations = models.FloatField(default=0.0)
 
     department_affiliations = models.JSONField(default=list, blank=True)  # list[str]
-    dois     = models.JSONField(default=list, blank=True)                 # list[str]
-    titles   = models.JSONField(default=list, blank=True)                 # list[str]
-
+    # AcademicMetrics dois/titles are no longer copied onto the row:
+    # DOIs live in FacultySourceDOI, titles come from the linked papers.
 
     # Raw categories + merged flat keywords for search
     categories           = models.JSONField(default=list, blank=True)  # the raw labels
     keywords             = models.JSONField(default=list, blank=True)  # merged top/mid/low
 
+    # sum of their papers' citation scores, recomputed in bulk (academic.ranking)
+    citation_score = models.FloatField(default=0.0)
+
+    class Meta:
+        indexes = [
+            # ranking top-N over public faculty, in the exact ORDER BY of
+            # academic.ranking; id is the tie-break and makes them index-only
+            models.Index(fields=["department", "-citation_score", "id"],
+                         condition=PUBLIC_FACULTY, name="faculty_dept_score_idx"),
+            models.Index(fields=["-citation_score", "id"],
+                         condition=PUBLIC_FACULTY, name="faculty_score_idx"),
+        ]
+
+    @property
+    def dois(self):
+        return [s.doi for s in self.source_dois.all()]
+
+    @property
+    def titles(self):
+        """Titles of the papers they approved (lists prefetch them: approved_authorships())."""
+        authorships = getattr(self, "approved_authorships", None)
+        if authorships is None:
+            authorships = approved_authorships().queryset.filter(faculty=self)
+        return [a.paper.title for a in authorships]
+
     def __str__(self):
         return self.name or f"{(self.first_name or '').strip()} {(self.last_name or '').strip()}".strip() or self.faculty_id
 
@@ -54,7 +81,8 @@ class Paper(models.Model):
     license_url = models.URLField(blank=True, null=True)
     ai_keywords = models.JSONField(blank=True, null=True)
     faculty_keywords = models.JSONField(blank=True, null=True)
-    authors = models.ManyToManyField('Faculty', blank=True, related_name='papers')  # we’ll use this link
+    # one row per (paper, faculty) link, carrying the faculty's review status
+    authors = models.ManyToManyField('Faculty', through='PaperAuthorship', blank=True, related_name='papers')
 
     # NEW rich paper fields
     tc_count = models.IntegerField(default=0)
@@ -64,6 +92,16 @@ class Paper(models.Model):
     keywords = models.JSONField(default=list, blank=True)  # merged categories
     themes   = models.JSONField(default=list, blank=True)  # AcademicMetrics “themes”
 
+    # citations normalized by field and year, recomputed in bulk (academic.ranking)
+    pub_year = models.SmallIntegerField(blank=True, null=True)
+    citation_score = models.FloatField(default=0.0)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["pub_year", "-citation_score", "id"], name="paper_year_score_idx"),
+            models.Index(fields=["-citation_score", "id"], name="paper_score_idx"),
+        ]
+
     def __str__(self):
         return self.title
 
@@ -95,6 +133,10 @@ class Patent(models.Model):
         return self.title
 
 class PaperAuthorship(models.Model):
+    """
+    The Paper.authors through table. Links made by the importer or by
+    uploads start as 'pending' until the faculty member reviews them.
+    """
     STATUS_CHOICES = [
         ('pending',  'Pending'),
         ('approved', 'Approved'),
@@ -106,7 +148,155 @@ class PaperAuthorship(models.Model):
     decided_at = models.DateTimeField(blank=True, null=True)
 
     class Meta:
-        unique_together = ('paper', 'faculty')
+        unique_together = ('paper', 'faculty')  # also the index for lookups by paper
+        indexes = [
+            models.Index(fields=['faculty', 'status'], name='authorship_faculty_status_idx'),
+        ]
+
+    def __str__(self):
+        # only use related rows that are already loaded (select_related);
+        # a lazy fetch here is one query per row in any list
+        faculty = self.faculty if self._meta.get_field("faculty").is_cached(self) else f"faculty #{self.faculty_id}"
+        paper = self.paper.title if self._meta.get_field("paper").is_cached(self) else f"paper #{self.paper_id}"
+        return f"{faculty} - {paper} ({self.status})"
+
+
+def approved_authorships():
+    """Prefetch for Faculty.titles: approved authorships with just the paper titles."""
+    return models.Prefetch(
+        "authorships",
+        queryset=PaperAuthorship.objects.filter(status="approved").select_related("paper")
+        .only("faculty", "paper__title").order_by("paper_id"),
+        to_attr="approved_authorships",
+    )
+
+
+class FacultySourceDOI(models.Model):
+    """
+    DOIs AcademicMetrics lists for a faculty member (lowercased). Staging
+    data for the importer's DOI linking, indexed on doi.
+    """
+    faculty = models.ForeignKey(Faculty, on_delete=models.CASCADE, related_name='source_dois')
+    doi = models.CharField(max_length=255, db_index=True)
+
+    class Meta:
+        unique_together = ('faculty', 'doi')
+
+    def __str__(self):
+        return f"{self.faculty_id}: {self.doi}"
+
+
+class PaperSignature(models.Model):
+    """MinHash signatures of a paper's normalized title / title+abstract (see academic.dedup)."""
+    paper = models.OneToOneField(Paper, on_delete=models.CASCADE, primary_key=True, related_name='signature')
+    text_hash = models.CharField(max_length=40)  # sha1 of the normalized text, to skip unchanged rows
+    title_minhash = models.BinaryField(blank=True, null=True)
+    text_minhash = models.BinaryField(blank=True, null=True)
+
+    def __str__(self):
+        return f"signature of paper {self.paper_id}"
+
+
+class PaperLSHBucket(models.Model):
+    """One row per (paper, LSH band); papers sharing a key are duplicate candidates."""
+    key = models.BigIntegerField(db_index=True)
+    paper = models.ForeignKey(Paper, on_delete=models.CASCADE, related_name='+')
+
+    def __str__(self):
+        return f"{self.key} -> {self.paper_id}"
+
+
+class PaperDuplicate(models.Model):
+    STATUS_CHOICES = [
+        ('pending',   'Pending'),
+        ('dismissed', 'Dismissed'),  # merged pairs disappear with the merged paper
+    ]
+    paper        = models.ForeignKey(Paper, on_delete=models.CASCADE, related_name='duplicate_candidates')  # newer copy
+    duplicate_of = models.ForeignKey(Paper, on_delete=models.CASCADE, related_name='+')                     # kept on merge
+    similarity = models.FloatField()
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ('paper', 'duplicate_of')
+
+    def __str__(self):
+        return f"{self.paper_id} ~ {self.duplicate_of_id} ({self.similarity:.2f}, {self.status})"
+
+
+class MergedPaperDOI(models.Model):
+    """
+    DOI (lowercased) of a paper merged away by dedup.merge_papers, pointing
+    at the paper it went into. The importer files records with this DOI
+    under that paper instead of recreating the duplicate.
+    """
+    doi = models.CharField(max_length=255, unique=True)
+    paper = models.ForeignKey(Paper, on_delete=models.CASCADE, related_name='merged_dois')
+    merged_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.doi} -> {self.paper_id}"
+
+
+class DatasetVersion(models.Model):
+    """
+    Single row counting changes to the public dataset (faculty / papers).
+    Bumped once per committed transaction that touched them (academic.dataset),
+    so per-process indexes and caches know when to rebuild.
+    directory_version only counts the changes that show in the public
+    faculty directory / profiles (academic.snapshot rebuilds on it).
+    """
+    version = models.PositiveBigIntegerField(default=0)
+    directory_version = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"dataset v{self.version}"
+
+
+class ImportCheckpoint(models.Model):
+    """
+    Progress of an `import_full_dataset --checkpoint` run, committed together
+    with each chunk so `--resume` can continue from the last one.
+    """
+    faculty_sha256 = models.CharField(max_length=64)
+    papers_sha256  = models.CharField(max_length=64)
+    options = models.JSONField(default=dict, blank=True)   # args that change what gets imported
+    phase   = models.CharField(max_length=20)               # faculty / papers / link_doi / link_name / dedup / done
+    offset  = models.IntegerField(default=0)                # records of `phase` already committed
+    metrics = models.JSONField(default=dict, blank=True)    # per-phase counters, see the command
+    started_at  = models.DateTimeField(auto_now_add=True)
+    updated_at  = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+
+    def __str__(self):
+        state = "done" if self.finished_at else f"{self.phase}@{self.offset}"
+        return f"import {self.started_at:%Y-%m-%d %H:%M} ({state})"
+
+
+class KeywordSourceHash(models.Model):
+    """sha1 of the text a row's ai keywords were last extracted from (see academic.keywords)."""
+    KIND_CHOICES = [
+        ('paper',   'Paper'),
+        ('patent',  'Patent'),
+        ('faculty', 'Faculty'),
+    ]
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    object_id = models.BigIntegerField()
+    text_hash = models.CharField(max_length=40)
+
+    class Meta:
+        unique_together = ('kind', 'object_id')
+
+    def __str__(self):
+        return f"{self.kind} {self.object_id}: {self.text_hash}"
+
+
+class KeywordStats(models.Model):
+    """Corpus document frequencies for keyword idf: one row, pk=1 (see academic.keywords)."""
+    docs = models.PositiveBigIntegerField(default=0)
+    df = models.BinaryField()  # zlib-compressed int32 vector of N_FEATURES hashed buckets
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
-        return f"{self.faculty} - {self.paper.title} ({self.status})"
\ No newline at end of file
+        return f"keyword stats over {self.docs} documents"
@@ -0,0 +1,135 @@
+"""
+Citation ranking scores, recomputed in bulk after imports (and by
+`manage.py compute_rankings`).
+
+Paper.citation_score normalizes tc_count by field and age: it is divided by
+the mean tc_count of papers in the same field (first merged keyword) and
+publication year, so 1.0 means "cited as much as its cohort" and a 2024
+paper is not buried under 2005 ones. Small cohorts are shrunk towards the
+year's overall mean by PRIOR papers' worth. Paper.pub_year is the earliest
+of the publication dates; undated papers form their own cohort.
+
+Faculty.citation_score is the sum of their papers' scores (rejected
+authorships excluded).
+
+Top-N reads (top_papers / top_faculty) walk the (year/department, score, id)
+indexes and stop after N entries, asking only for ids, so they do not
+depend on the size of the catalog; the N rows are fetched by pk after.
+Scores go stale between recomputes; new papers score 0 until the next one.
+"""
+from django.db import transaction
+from django.db.models import Sum
+
+from . import dataset
+from .models import PUBLIC_FACULTY, Faculty, Paper, PaperAuthorship
+
+PRIOR = 10          # pseudo-papers at the year mean added to every cohort
+MAX_LIMIT = 100
+
+
+def _year(*dates):
+    years = [d.year for d in dates if d]
+    return min(years) if years else None
+
+
+def _field(keywords):
+    if isinstance(keywords, list) and keywords and isinstance(keywords[0], str):
+        return keywords[0].strip().lower()
+    return ""
+
+
+def _pages(queryset, fields, chunk_size):
+    """values_list rows in pk order, one keyset page at a time (safe to write in between)."""
+    last = 0
+    while True:
+        rows = list(queryset.filter(pk__gt=last).order_by("pk").values_list("pk", *fields)[:chunk_size])
+        if not rows:
+            return
+        yield rows
+        last = rows[-1][0]
+
+
+PAPER_FIELDS = ("tc_count", "date_published_online", "date_published_print", "date_published", "keywords")
+
+
+def _cohorts(chunk_size):
+    """Expected citations per (field, year), shrunk towards the year mean."""
+    cohorts, years = {}, {}
+    for rows in _pages(Paper.objects.all(), PAPER_FIELDS, chunk_size):
+        for _, tc, online, printed, published, keywords in rows:
+            year = _year(online, printed, published)
+            for table, key in ((cohorts, (_field(keywords), year)), (years, year)):
+                n, total = table.get(key, (0, 0))
+                table[key] = (n + 1, total + tc)
+    expected = {}
+    for (field, year), (n, total) in cohorts.items():
+        year_n, year_total = years[year]
+        expected[field, year] = (total + PRIOR * year_total / year_n) / (n + PRIOR)
+    return expected
+
+
+def score_papers(chunk_size=2000, progress=None):
+    """Recompute Paper.pub_year / citation_score; returns the number of rows changed."""
+    expected = _cohorts(chunk_size)
+    updated = seen = 0
+    for rows in _pages(Paper.objects.all(), (*PAPER_FIELDS, "pub_year", "citation_score"), chunk_size):
+        changed = []
+        for pk, tc, online, printed, published, keywords, old_year, old_score in rows:
+            year = _year(online, printed, published)
+            mean = expected[_field(keywords), year]
+            score = round(tc / mean, 4) if mean > 0 else 0.0
+            if (year, score) != (old_year, old_score):
+                changed.append(Paper(pk=pk, pub_year=year, citation_score=score))
+        if changed:
+            with transaction.atomic():
+                Paper.objects.bulk_update(changed, ["pub_year", "citation_score"], batch_size=500)
+            updated += len(changed)
+        seen += len(rows)
+        if progress:
+            progress(seen)
+    return updated
+
+
+def score_faculty(chunk_size=2000):
+    """Recompute Faculty.citation_score from the paper scores; returns the number changed."""
+    sums = dict(
+        PaperAuthorship.objects.exclude(status="rejected").order_by()
+        .values("faculty_id").annotate(score=Sum("paper__citation_score"))
+        .values_list("faculty_id", "score")
+    )
+    updated = 0
+    for rows in _pages(Faculty.objects.all(), ("citation_score",), chunk_size):
+        changed = [
+            Faculty(pk=pk, citation_score=round(sums.get(pk) or 0.0, 4))
+            for pk, old in rows if round(sums.get(pk) or 0.0, 4) != old
+        ]
+        if changed:
+            with transaction.atomic():
+                Faculty.objects.bulk_update(changed, ["citation_score"], batch_size=500)
+            updated += len(changed)
+    return updated
+
+
+def recompute(chunk_size=2000, progress=None):
+    counts = {"papers": score_papers(chunk_size, progress), "faculty": score_faculty(chunk_size)}
+    if any(counts.values()):
+        dataset.mark_changed(directory=bool(counts["faculty"]))
+    return counts
+
+
+# ----------------------------------------
+# Top-N
+# ----------------------------------------
+
+def top_papers(year=None, limit=20):
+    """Paper ids, best score first; year=None ranks the whole catalog."""
+    qs = Paper.objects.all() if year is None else Paper.objects.filter(pub_year=year)
+    return list(qs.order_by("-citation_score", "pk").values_list("pk", flat=True)[:min(limit, MAX_LIMIT)])
+
+
+def top_faculty(department=None, limit=20):
+    """Public faculty ids, best score first, optionally within one department."""
+    qs = Faculty.objects.filter(PUBLIC_FACULTY)
+    if department is not None:
+        qs = qs.filter(department=department)
+    return list(qs.order_by("-citation_score", "pk").values_list("pk", flat=True)[:min(limit, MAX_LIMIT)])
@@ -0,0 +1,43 @@
+import orjson
+from rest_framework.renderers import BaseRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import msgpack
+except ImportError:  # optional: only needed for application/msgpack clients
+    msgpack = None
+
+_fallback = JSONEncoder()
+
+
+def _default(obj):
+    # anything orjson can't do natively (Decimal, lazy strings, ...) goes
+    # through DRF's encoder, so output matches the stock JSONRenderer
+    return _fallback.default(obj)
+
+
+class ORJSONRenderer(BaseRenderer):
+    """Drop-in for rest_framework.renderers.JSONRenderer, backed by orjson."""
+
+    media_type = "application/json"
+    format = "json"
+    charset = None  # orjson always emits utf-8 bytes
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return orjson.dumps(data, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+class MsgPackRenderer(BaseRenderer):
+    """application/msgpack, for clients that send that Accept header."""
+
+    media_type = "application/msgpack"
+    format = "msgpack"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return msgpack.packb(data, default=_default, use_bin_type=True)
@@ -2,25 +2,64 @@
 
 from rest_framework import serializers
 from django.contrib.auth.models import User
-from .models import Faculty, Paper, Patent, Project
+from .models import Faculty, Paper, Patent, Project, approved_authorships
+
+# Faculty.dois / .titles are derived from relations now, so list endpoints
+# only return them when asked: ?include=dois,titles
+OPTIONAL_FACULTY_FIELDS = ("dois", "titles")
+
+
+def requested_includes(request):
+    if request is None:
+        return set()
+    raw = request.GET.get("include") or ""
+    return {f.strip() for f in raw.split(",")} & set(OPTIONAL_FACULTY_FIELDS)
+
+
+def prefetch_faculty_includes(queryset, includes):
+    if "dois" in includes:
+        queryset = queryset.prefetch_related("source_dois")
+    if "titles" in includes:
+        queryset = queryset.prefetch_related(approved_authorships())
+    return queryset
+
 
 class FacultySerializer(serializers.ModelSerializer):
+    dois = serializers.ListField(child=serializers.CharField(), read_only=True)
+    titles = serializers.ListField(child=serializers.CharField(), read_only=True)
+
     class Meta:
         model = Faculty
         fields = "__all__"
-        read_only_fields = ["user"]
+        read_only_fields = ["user", "citation_score"]
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # ?include= on requests; the directory snapshot passes its own
+        includes = set(self.context.get("include") or requested_includes(self.context.get("request")))
+        for name in OPTIONAL_FACULTY_FIELDS:
+            if name not in includes:
+                self.fields.pop(name)
 
 class FacultyProfileSerializer(serializers.ModelSerializer):
+    dois = serializers.ListField(child=serializers.CharField(), read_only=True)
+    titles = serializers.ListField(child=serializers.CharField(), read_only=True)
+
     class Meta:
         model = Faculty
         fields = "__all__"
-        read_only_fields = ["user", "faculty_id", "created_at", "updated_at"]
+        read_only_fields = ["user", "faculty_id", "created_at", "updated_at", "citation_score"]
 
 class PaperSerializer(serializers.ModelSerializer):
     class Meta:
         model = Paper
         fields = "__all__"
-        read_only_fields = ("authors",)
+        read_only_fields = ("authors", "pub_year", "citation_score")
+
+class DashboardPaperSerializer(PaperSerializer):
+    # annotated by FacultyDashboardView: the logged-in faculty's PaperAuthorship
+    # status for this paper
+    authorship_status = serializers.CharField(read_only=True, allow_null=True)
 
 class ProjectSerializer(serializers.ModelSerializer):
     class Meta:
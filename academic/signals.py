@@ -0,0 +1,92 @@
+from django.contrib.auth.models import User
+from django.db.models.signals import m2m_changed, post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from . import dataset, dedup
+from .models import Faculty, Paper, PaperAuthorship
+
+# .authentication and .snapshot are imported inside the receivers: they pull
+# in simplejwt and the DRF serializer stack, which `migrate` and friends
+# never need.
+
+
+def _public(faculty):
+    # deferred fields count as public: can't tell without a query
+    fields = faculty.__dict__
+    return fields.get("is_approved", True) and fields.get("profile_visibility", True)
+
+
+def _in_directory(faculty):
+    """The row is or was public, so saving/deleting it changes the directory."""
+    return getattr(faculty, "_was_public", True) or _public(faculty)
+
+
+@receiver(post_init, sender=Faculty)
+def remember_public_state(sender, instance, **kwargs):
+    instance._was_public = _public(instance)
+
+
+@receiver([post_save, post_delete], sender=User)
+def drop_cached_user(sender, instance, **kwargs):
+    from .authentication import invalidate_user
+    invalidate_user(instance)
+
+
+@receiver([post_save, post_delete], sender=Faculty)
+def drop_cached_faculty(sender, instance, **kwargs):
+    from .authentication import invalidate_faculty
+    invalidate_faculty(instance)
+
+
+@receiver(post_save, sender=Paper)
+def index_paper_for_duplicates(sender, instance, raw=False, **kwargs):
+    if raw or dedup.is_paused():
+        return
+    dedup.index_on_commit(instance)
+
+
+@receiver([post_save, post_delete], sender=Paper)
+def bump_dataset_version(sender, raw=False, **kwargs):
+    if not raw:
+        dataset.mark_changed()
+
+
+@receiver([post_save, post_delete], sender=Faculty)
+def bump_directory_version(sender, instance, raw=False, **kwargs):
+    # every field of a public row is in the directory or the profiles;
+    # unapproved signups and hidden profiles aren't
+    if not raw:
+        dataset.mark_changed(directory=_in_directory(instance))
+
+
+@receiver(post_save, sender=PaperAuthorship)
+def bump_version_on_authorship_save(sender, instance, created, raw=False, **kwargs):
+    # profiles list approved titles; a new pending link doesn't show there
+    if not raw:
+        dataset.mark_changed(directory=not (created and instance.status == "pending"))
+
+
+@receiver(post_delete, sender=PaperAuthorship)
+def bump_version_on_authorship_delete(sender, instance, **kwargs):
+    dataset.mark_changed(directory=instance.status != "pending")
+
+
+@receiver(m2m_changed, sender=PaperAuthorship)
+def bump_dataset_version_on_link(sender, action, **kwargs):
+    # paper.authors.add()/remove() write the through rows without post_save
+    if action in ("post_add", "post_remove", "post_clear"):
+        dataset.mark_changed(directory=True)
+
+
+@receiver([post_save, post_delete], sender=Faculty)
+def rebuild_directory_snapshot(sender, instance, raw=False, **kwargs):
+    # approvals, un-approvals/hiding and edits of public rows change the snapshot
+    if not raw and _in_directory(instance):
+        from . import snapshot
+        snapshot.schedule()
+
+
+@receiver(post_save, sender=Faculty)
+def remember_saved_public_state(sender, instance, **kwargs):
+    # registered after the receivers above, which needed the old state
+    instance._was_public = _public(instance)
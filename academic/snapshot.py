@@ -0,0 +1,243 @@
+"""
+Static snapshot of the public faculty directory.
+
+build() renders the approved + visible faculty list (the /api/faculty/
+payload) and one public profile per faculty member into content-hashed JSON
+files under STATIC_ROOT/snapshot/, each with .gz (and .br when Brotli is
+installed) next to it, then writes snapshot/manifest.json pointing at the
+current files. MediaWhiteNoiseMiddleware serves all of it without reaching a
+view: hashed files as immutable, the manifest with a short max-age.
+
+The manifest's "version" is the dataset's directory version
+(dataset.current_directory_version()), which only moves for changes that
+show here: faculty rows and authorship decisions, not every paper save.
+Rebuilds run after imports (synchronously, from the importer) and after
+faculty saves such as approvals (debounced, on a background thread once the
+transaction commits). A request for the manifest also schedules a rebuild
+when the directory version moved past the snapshot's, which is how other
+instances with their own disk catch up. build() checks again under the
+build lock, so workers that queued up behind one build don't repeat it.
+"""
+import gzip
+import hashlib
+import json
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from importlib.util import find_spec
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from . import dataset
+from .fastpath import plan_for
+from .models import DatasetVersion, Faculty
+from .renderers import ORJSONRenderer
+from .serializers import OPTIONAL_FACULTY_FIELDS, FacultySerializer, prefetch_faculty_includes
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_DIR = "snapshot"
+MANIFEST = "manifest.json"
+HASH_LEN = 12
+KEEP_PREVIOUS = True  # files of the previous manifest stay for clients that still hold it
+
+_paused = ContextVar("snapshot_paused", default=False)
+
+
+def root():
+    return Path(settings.STATIC_ROOT) / SNAPSHOT_DIR
+
+
+def url_prefix():
+    return f"{settings.STATIC_URL.rstrip('/')}/{SNAPSHOT_DIR}/"
+
+
+def is_hashed_name(name):
+    stem, _, ext = os.path.basename(name).rpartition(".")
+    digest = stem.rpartition(".")[2]
+    return ext == "json" and len(digest) == HASH_LEN and all(c in "0123456789abcdef" for c in digest)
+
+
+# ----------------------------------------
+# Writing
+# ----------------------------------------
+
+def _write_variants(path, body):
+    """path + .gz (+ .br): all rendered to temp files first, then swapped in together."""
+    variants = {path: body, path.with_name(path.name + ".gz"): gzip.compress(body, 9, mtime=0)}
+    if find_spec("brotli"):
+        import brotli
+        variants[path.with_name(path.name + ".br")] = brotli.compress(body)
+    temps = {}
+    try:
+        for target, data in variants.items():
+            temps[target] = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+            temps[target].write_bytes(data)
+        for target, tmp in temps.items():
+            os.replace(tmp, target)
+    finally:
+        for tmp in temps.values():
+            tmp.unlink(missing_ok=True)
+
+
+def _write_hashed(directory, stem, data):
+    """Write `data` as <stem>.<hash>.json (+ compressed) unless it exists; returns the relative path."""
+    body = ORJSONRenderer().render(data)
+    name = f"{stem}.{hashlib.sha256(body).hexdigest()[:HASH_LEN]}.json"
+    path = directory / name
+    if not path.exists():
+        directory.mkdir(parents=True, exist_ok=True)
+        _write_variants(path, body)
+    return path.relative_to(root()).as_posix()
+
+
+def read_manifest():
+    try:
+        return json.loads((root() / MANIFEST).read_bytes())
+    except (OSError, ValueError):
+        return None
+
+
+@contextmanager
+def _build_lock():
+    # workers of one instance share the directory; one build at a time
+    import fcntl  # Unix only, and only needed when building
+
+    root().mkdir(parents=True, exist_ok=True)
+    with open(root() / ".lock", "w") as fh:
+        fcntl.flock(fh, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(fh, fcntl.LOCK_UN)
+
+
+def build(chunk_size=500, force=False):
+    """
+    Render the directory + profiles and swap in a new manifest. Returns the
+    manifest; unless `force`, that is the one on disk when it is already
+    at the current directory version (another worker built it meanwhile).
+    """
+    with _build_lock():
+        version = DatasetVersion.objects.filter(pk=1).values_list("directory_version", flat=True).first() or 0
+        previous = read_manifest()
+        if not force and previous and previous.get("version", -1) >= version:
+            _State.disk_version = previous["version"]
+            return previous
+
+        public = Faculty.objects.filter(is_approved=True, profile_visibility=True).order_by("pk")
+        prefix = url_prefix()
+
+        directory = _write_hashed(root(), "directory", plan_for(FacultySerializer).rows(public))
+        profiles = {}
+        # the public list serializer with every optional field: what ?include=dois,titles returns
+        context = {"include": OPTIONAL_FACULTY_FIELDS}
+        ids = list(public.values_list("pk", flat=True))
+        for i in range(0, len(ids), chunk_size):
+            chunk = prefetch_faculty_includes(Faculty.objects.filter(pk__in=ids[i:i + chunk_size]),
+                                              OPTIONAL_FACULTY_FIELDS)
+            for fac in chunk:
+                rel = _write_hashed(root() / "faculty", str(fac.pk), FacultySerializer(fac, context=context).data)
+                profiles[str(fac.pk)] = prefix + rel
+
+        manifest = {
+            "version": version,
+            "generated_at": timezone.now().isoformat(),
+            "count": len(ids),
+            "directory": prefix + directory,
+            "faculty": profiles,
+        }
+        _write_variants(root() / MANIFEST, json.dumps(manifest, separators=(",", ":")).encode())
+        _cleanup(manifest, previous if KEEP_PREVIOUS else None)
+        _State.disk_version = version
+        return manifest
+
+
+def _referenced(manifest):
+    if not manifest:
+        return set()
+    prefix = url_prefix()
+    urls = [manifest.get("directory", ""), *manifest.get("faculty", {}).values()]
+    return {u[len(prefix):] for u in urls if u.startswith(prefix)}
+
+
+def _cleanup(manifest, previous):
+    keep = _referenced(manifest) | _referenced(previous)
+    for path in root().rglob("*.json*"):
+        rel = path.relative_to(root()).as_posix()
+        base = rel[:-3] if rel.endswith((".gz", ".br")) else rel
+        if is_hashed_name(base) and base not in keep:
+            path.unlink(missing_ok=True)
+
+
+# ----------------------------------------
+# Triggers
+# ----------------------------------------
+
+@contextmanager
+def deferred():
+    """Don't schedule rebuilds per save (bulk jobs call build() once at the end)."""
+    token = _paused.set(True)
+    try:
+        yield
+    finally:
+        _paused.reset(token)
+
+
+class _State:
+    lock = threading.Lock()
+    running = False
+    again = False
+    disk_version = None   # directory version of the snapshot on disk, as last seen
+    disk_mtime = None
+
+
+def schedule():
+    """Rebuild in the background once the current transaction commits (debounced)."""
+    if _paused.get():
+        return
+    transaction.on_commit(_start)
+
+
+def _start():
+    with _State.lock:
+        if _State.running:
+            _State.again = True  # the running build may have missed this change
+            return
+        _State.running = True
+    threading.Thread(target=_run, daemon=True, name="snapshot-build").start()
+
+
+def _run():
+    try:
+        while True:
+            try:
+                build()
+            except Exception:
+                logger.exception("directory snapshot build failed")
+            with _State.lock:
+                if not _State.again:
+                    _State.running = False
+                    return
+                _State.again = False
+    finally:
+        connection.close()  # this thread's own DB connection
+
+
+def ensure_current():
+    """For manifest requests: schedule a rebuild if the snapshot is missing or behind the directory."""
+    try:
+        mtime = (root() / MANIFEST).stat().st_mtime
+    except OSError:
+        mtime = None
+    if mtime != _State.disk_mtime:
+        manifest = read_manifest() if mtime is not None else None
+        _State.disk_mtime = mtime
+        _State.disk_version = manifest.get("version") if manifest else None
+    if _State.disk_version is None or _State.disk_version < dataset.current_directory_version():
+        _start()
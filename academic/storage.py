@@ -0,0 +1,55 @@
+import hashlib
+import os
+
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+
+
+class ContentHashStorage(FileSystemStorage):
+    """
+    Media storage that names every upload after the sha256 of its content,
+    e.g. 'faculty_photos/3f/3fa1...c9.jpg'.
+
+    - the same bytes always map to the same name, so re-uploads are deduped
+    - a name never changes meaning, so media can be cached forever
+      (see academic.middleware.MediaWhiteNoiseMiddleware)
+    """
+
+    HASH_LENGTH = 64
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not hasattr(content, "chunks"):
+            content = File(content, name)
+
+        name = self.hashed_name(name, content)
+        if self.exists(name):
+            # identical file already stored -> reuse it
+            return name
+        return super().save(name, content, max_length=max_length)
+
+    def hashed_name(self, name, content):
+        sha = hashlib.sha256()
+        if hasattr(content, "seek"):
+            content.seek(0)
+        for chunk in content.chunks():
+            sha.update(chunk)
+        if hasattr(content, "seek"):
+            content.seek(0)
+        digest = sha.hexdigest()
+
+        dirname, filename = os.path.split(name)
+        ext = os.path.splitext(filename)[1].lower()
+        return os.path.join(dirname, digest[:2], digest + ext).replace("\\", "/")
+
+    @classmethod
+    def is_hashed_name(cls, name):
+        stem = os.path.splitext(os.path.basename(name))[0]
+        if len(stem) != cls.HASH_LENGTH:
+            return False
+        try:
+            int(stem, 16)
+        except ValueError:
+            return False
+        return True
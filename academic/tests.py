@@ -1,3 +1,1066 @@
-from django.test import TestCase
+import json
+import shutil
+import tempfile
+import time
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+
+from django.core.files.base import ContentFile
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from .storage import ContentHashStorage
+
+
+class ContentHashStorageTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        self.storage = ContentHashStorage(location=self.media_root)
+
+    def test_identical_uploads_are_deduped(self):
+        a = self.storage.save("faculty_photos/me.JPG", ContentFile(b"same bytes"))
+        b = self.storage.save("faculty_photos/other.jpg", ContentFile(b"same bytes"))
+        c = self.storage.save("faculty_photos/me.jpg", ContentFile(b"new bytes"))
+
+        self.assertEqual(a, b)
+        self.assertNotEqual(a, c)
+        self.assertTrue(a.startswith("faculty_photos/") and a.endswith(".jpg"))
+        self.assertTrue(ContentHashStorage.is_hashed_name(a))
+
+    def test_media_served_with_immutable_headers(self):
+        name = self.storage.save("faculty_photos/me.png", ContentFile(b"\x89PNG fake"))
+
+        with override_settings(MEDIA_ROOT=self.media_root):
+            response = self.client.get(f"/media/{name}")
+            self.assertEqual(response.status_code, 200)
+            self.assertIn("immutable", response["Cache-Control"])
+            self.assertTrue(response.has_header("ETag"))
+
+            ranged = self.client.get(f"/media/{name}", HTTP_RANGE="bytes=0-3")
+            self.assertEqual(ranged.status_code, 206)
+
+
+class FacultyJWTAuthenticationTests(TestCase):
+    def setUp(self):
+        from django.contrib.auth.models import User
+        from .authentication import auth_cache
+        from .models import Faculty
+
+        auth_cache.clear()
+        self.user = User.objects.create_user(username="ada", password="pw123456")
+        self.faculty = Faculty.objects.create(
+            user=self.user, faculty_id="ada-l", name="Ada L", is_approved=True
+        )
+        res = self.client.post(
+            "/api/token/", {"username": "ada", "password": "pw123456"}, content_type="application/json"
+        )
+        self.auth = {"HTTP_AUTHORIZATION": f"Bearer {res.json()['access']}"}
+
+    def test_token_carries_faculty_claims(self):
+        from rest_framework_simplejwt.tokens import AccessToken
+
+        token = AccessToken(self.auth["HTTP_AUTHORIZATION"].split()[1])
+        self.assertEqual(token["faculty_id"], self.faculty.pk)
+
+    def test_list_request_skips_profile_query(self):
+        with self.assertNumQueries(2):  # the user (is_active check) + the paper list itself
+            res = self.client.get("/api/faculty/papers/", **self.auth)
+        self.assertEqual(res.status_code, 200)
+
+    def test_deactivated_user_is_rejected_at_once(self):
+        self.client.get("/api/faculty/papers/", **self.auth)
+        # .update(): no signal, as when another worker deactivates the account
+        type(self.user).objects.filter(pk=self.user.pk).update(is_active=False)
+        self.assertEqual(self.client.get("/api/faculty/papers/", **self.auth).status_code, 401)
+
+    def test_photo_upload_does_not_revert_other_changes(self):
+        from django.core.files.uploadedfile import SimpleUploadedFile
+        from .models import Faculty
+
+        media = override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+        media.enable()
+        self.addCleanup(media.disable)
+        self.addCleanup(shutil.rmtree, media.options["MEDIA_ROOT"], ignore_errors=True)
+
+        self.client.get("/api/faculty/me/", **self.auth)  # caches the row
+        # .update(): no signal, as when an import or another worker changes it
+        Faculty.objects.filter(pk=self.faculty.pk).update(is_approved=False, bio="from elsewhere")
+        res = self.client.post("/api/faculty/upload-photo/", {"photo": SimpleUploadedFile("me.png", b"png")}, **self.auth)
+        self.assertEqual(res.status_code, 200)
+
+        fac = Faculty.objects.get(pk=self.faculty.pk)
+        self.assertEqual((fac.is_approved, fac.bio), (False, "from elsewhere"))
+        self.assertTrue(fac.photo.name.startswith("faculty_photos/"))
+
+    def test_profile_changes_invalidate_cache(self):
+        self.client.get("/api/faculty/me/", **self.auth)
+        self.faculty.bio = "updated"
+        self.faculty.save()
+        res = self.client.get("/api/faculty/me/", **self.auth)
+        self.assertEqual(res.json()["bio"], "updated")
+
+
+class ReplicaRouterTests(SimpleTestCase):
+    def setUp(self):
+        from django.core.cache import cache
+        from .db_router import PrimaryReplicaRouter, ReplicaRoutingMiddleware
+
+        cache.clear()
+        self.router = PrimaryReplicaRouter(replicas=["replica1"])
+        self.seen = []
+
+        def view(request):
+            from django.http import HttpResponse
+            from .models import Paper
+            self.seen.append(self.router.db_for_read(Paper))
+            return HttpResponse(status=201 if request.method == "POST" else 200)
+
+        self.view = view
+        self.middleware = ReplicaRoutingMiddleware(self.call_view)
+
+    def call_view(self, request):
+        self.middleware.process_view(request, self.current_view, (), {})
+        return self.current_view(request)
+
+    def request(self, method, view=None, **extra):
+        from django.test import RequestFactory
+        self.current_view = view or self.view
+        req = getattr(RequestFactory(), method)("/api/faculty/", **extra)
+        return self.middleware(req)
+
+    def test_outside_requests_reads_stay_on_primary(self):
+        from .models import Paper
+        self.assertEqual(self.router.db_for_read(Paper), "default")
+        self.assertEqual(self.router.db_for_write(Paper), "default")
+
+    def test_anonymous_get_reads_from_replica(self):
+        self.request("get")
+        self.assertEqual(self.seen, ["replica1"])
+
+    def test_marked_views_read_from_primary(self):
+        from .db_router import use_primary
+        self.request("get", view=use_primary(lambda r: self.view(r)))
+        self.assertEqual(self.seen, ["default"])
+
+    def test_writer_is_pinned_by_cookie(self):
+        from .db_router import PIN_COOKIE
+
+        response = self.request("post")
+        cookie = response.cookies[PIN_COOKIE]
+        self.assertEqual(cookie["max-age"], 10)
+        self.request("get", HTTP_COOKIE=f"{PIN_COOKIE}={cookie.value}")
+        self.request("get")
+        self.assertEqual(self.seen, ["default", "default", "replica1"])
+
+    def test_replica_safe_post_reads_from_replica_and_does_not_pin(self):
+        from .db_router import PIN_COOKIE, PIN_HEADER, replica_safe
+
+        response = self.request("post", view=replica_safe(lambda r: self.view(r)))
+        self.assertNotIn(PIN_COOKIE, response.cookies)
+        self.assertNotIn(PIN_HEADER, response)
+        self.request("post", view=replica_safe(lambda r: self.view(r)), HTTP_COOKIE=f"{PIN_COOKIE}=1")
+        self.assertEqual(self.seen, ["replica1", "default"])  # a recent writer still reads its writes
+
+    def test_cross_site_writer_is_pinned_by_echoed_header(self):
+        from unittest import mock
+        from .db_router import PIN_HEADER
+
+        pin = self.request("post", HTTP_AUTHORIZATION="Bearer abc")[PIN_HEADER]
+        self.request("get", HTTP_X_PRIMARY_PIN=pin)
+        self.request("get", HTTP_X_PRIMARY_PIN="1:forged:sig")
+        with mock.patch("django.core.signing.time.time", return_value=time.time() + 11):
+            self.request("get", HTTP_X_PRIMARY_PIN=pin)  # expired
+        self.assertEqual(self.seen, ["default", "default", "replica1", "replica1"])
+
+    def test_pin_header_passes_cors(self):
+        from django.test import Client
+
+        res = Client().options("/api/faculty/", HTTP_ORIGIN="https://scoup-frontend.vercel.app",
+                               HTTP_ACCESS_CONTROL_REQUEST_METHOD="GET",
+                               HTTP_ACCESS_CONTROL_REQUEST_HEADERS="authorization,x-primary-pin")
+        self.assertIn("x-primary-pin", res["Access-Control-Allow-Headers"])
+        res = Client().get("/api/async/search/", HTTP_ORIGIN="https://scoup-frontend.vercel.app")
+        self.assertIn("X-Primary-Pin", res["Access-Control-Expose-Headers"])
+
+    def test_bearer_pin_only_with_a_shared_cache(self):
+        auth = {"HTTP_AUTHORIZATION": "Bearer abc"}
+        self.request("post", **auth)
+        self.request("get", **auth)  # LocMem is per worker: no header pin
+        with override_settings(CACHES={"default": {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": tempfile.mkdtemp(),
+        }}):
+            from django.core.cache import cache
+            self.addCleanup(shutil.rmtree, cache._dir, ignore_errors=True)
+            self.request("post", **auth)
+            self.request("get", **auth)
+            self.request("get", HTTP_AUTHORIZATION="Bearer someone-else")
+        self.assertEqual(self.seen, ["default", "replica1", "default", "default", "replica1"])
+
+
+class ReplicaRoutingIntegrationTests(SimpleTestCase):
+    """Real primary + replica SQLite files, routed through the full stack in a subprocess."""
+
+    SCRIPT = r"""
+import json
+from django.test import Client
+from academic import db_router, snapshot
+
+seen = []
+db_for_read = db_router.PrimaryReplicaRouter.db_for_read
+def spy(self, model, **hints):
+    alias = db_for_read(self, model, **hints)
+    seen.append(alias)
+    return alias
+db_router.PrimaryReplicaRouter.db_for_read = spy
+
+def step(client, method, path, **kw):
+    del seen[:]
+    status = getattr(client, method)(path, **kw).status_code
+    return [status, sorted(set(seen))]
+
+writer = Client()
+with snapshot.deferred():  # no background rebuild reading (and writing files) meanwhile
+    steps = [
+        step(writer, "get", "/api/faculty/"),
+        step(writer, "post", "/api/faculty/signup/",
+             data={"username": "ada", "password": "pw123456", "email": "ada@example.com"},
+             content_type="application/json"),
+        step(writer, "get", "/api/faculty/"),
+        step(Client(), "get", "/api/faculty/"),
+    ]
+print(json.dumps(steps))
+"""
+
+    def test_read_after_write_goes_to_primary(self):
+        import os
+        import subprocess
+        import sys
+        from pathlib import Path
+        from django.conf import settings
+
+        tmp = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, tmp, ignore_errors=True)
+        env = {
+            **os.environ,
+            "DJANGO_SETTINGS_MODULE": "scoupdb.settings",
+            "DATABASE_URL": f"sqlite:///{tmp / 'primary.sqlite3'}",
+            "DATABASE_REPLICA_URLS": f"sqlite:///{tmp / 'replica.sqlite3'}",
+            "LIST_CACHE_TTL": "0",
+        }
+        env.pop("REDIS_URL", None)
+
+        def run(*args):
+            return subprocess.run([sys.executable, "manage.py", *args], cwd=settings.BASE_DIR,
+                                  env=env, capture_output=True, text=True, check=True).stdout
+
+        run("migrate", "-v0")
+        shutil.copy(tmp / "primary.sqlite3", tmp / "replica.sqlite3")  # "replicated"
+        steps = json.loads(run("shell", "-c", self.SCRIPT).strip().splitlines()[-1])
+        self.assertEqual(steps, [
+            [200, ["replica1"]],
+            [201, ["default"]],
+            [200, ["default"]],   # the pin cookie came back with the next read
+            [200, ["replica1"]],  # other clients keep using the replica
+        ])
+
+
+class FacultyDerivedListsTests(TestCase):
+    def setUp(self):
+        from .coalesce import lists
+        lists.clear()  # the list cache outlives each test's rolled-back data
+
+    def test_dois_and_titles_only_on_request(self):
+        from .models import Faculty, FacultySourceDOI, Paper
+
+        fac = Faculty.objects.create(faculty_id="f1", name="F One", is_approved=True)
+        FacultySourceDOI.objects.create(faculty=fac, doi="10.1/a")
+        Paper.objects.create(doi="10.1/A", title="Paper A").authors.add(fac, through_defaults={"status": "approved"})
+        Paper.objects.create(doi="10.1/B", title="Paper B").authors.add(fac, through_defaults={"status": "rejected"})
+        Paper.objects.create(doi="10.1/C", title="Paper C").authors.add(fac)  # pending
+
+        plain = self.client.get("/api/faculty/").json()[0]
+        self.assertNotIn("dois", plain)
+        self.assertNotIn("titles", plain)
+
+        with self.assertNumQueries(3):
+            full = self.client.get("/api/faculty/?include=dois,titles").json()[0]
+        self.assertEqual(full["dois"], ["10.1/a"])
+        self.assertEqual(full["titles"], ["Paper A"])
+
+
+class FastPathTests(TestCase):
+    def setUp(self):
+        from .coalesce import lists
+        lists.clear()
+
+    def test_fast_rows_match_serializer_output(self):
+        import datetime
+        from django.test import RequestFactory
+        from .fastpath import plan_for
+        from .models import Faculty, Paper
+        from .serializers import FacultySerializer, PaperSerializer
+
+        a = Faculty.objects.create(faculty_id="a", name="A", is_approved=True, photo="faculty_photos/x y.jpg",
+                                   keywords=["ml", "nlp"])
+        b = Faculty.objects.create(faculty_id="b", name="B", is_approved=True)
+        p = Paper.objects.create(doi="10.1/p", title="P", date_published_online=datetime.date(2021, 3, 4))
+        p.authors.add(a, b)
+        Paper.objects.create(doi="10.1/q", title="Q")
+
+        request = RequestFactory().get("/api/faculty/")
+        for serializer_class, qs in ((FacultySerializer, Faculty.objects.all()), (PaperSerializer, Paper.objects.all())):
+            expected = serializer_class(qs, many=True, context={"request": request}).data
+            got = plan_for(serializer_class).rows(qs, request)
+            self.assertEqual(got, [dict(r) for r in expected])
+            self.assertEqual([list(r) for r in got], [list(r) for r in expected])  # key order
+
+    def test_list_endpoint_renders_json_and_msgpack(self):
+        from .models import Faculty
+
+        Faculty.objects.create(faculty_id="a", name="A", is_approved=True)
+        res = self.client.get("/api/faculty/")
+        self.assertEqual(res["Content-Type"], "application/json")
+        self.assertEqual(res.json()[0]["name"], "A")
+
+        try:
+            import msgpack
+        except ImportError:
+            return
+        res = self.client.get("/api/faculty/", HTTP_ACCEPT="application/msgpack")
+        self.assertEqual(msgpack.unpackb(res.content)[0]["name"], "A")
+
+
+class AsyncViewsTests(TestCase):
+    def setUp(self):
+        from django.contrib.auth.models import User
+        from .authentication import auth_cache
+        from .coalesce import lists
+        from .models import Faculty, FacultySourceDOI, Paper, PaperAuthorship
+
+        auth_cache.clear()
+        lists.clear()
+        user = User.objects.create_user(username="ada", password="pw123456")
+        self.ada = Faculty.objects.create(user=user, faculty_id="ada", name="Ada Lovelace",
+                                          department="Mathematics", is_approved=True, keywords=["engines"])
+        Faculty.objects.create(faculty_id="alan", name="Alan Turing", department="Computing", is_approved=True)
+        Faculty.objects.create(faculty_id="h", name="Hidden Ada", is_approved=True, profile_visibility=False)
+        FacultySourceDOI.objects.create(faculty=self.ada, doi="10.1/notes")
+        paper = Paper.objects.create(doi="10.1/notes", title="Notes on the Analytical Engine", tc_count=3)
+        PaperAuthorship.objects.create(paper=paper, faculty=self.ada, status="approved")
+        res = self.client.post("/api/token/", {"username": "ada", "password": "pw123456"},
+                               content_type="application/json")
+        self.bearer = f"Bearer {res.json()['access']}"
+
+    async def test_faculty_list_matches_sync_view(self):
+        for query in ("", "?include=dois,titles"):
+            got = (await self.async_client.get(f"/api/async/faculty/{query}")).json()
+            expected = await sync_to_async(lambda: self.client.get(f"/api/faculty/{query}").json())()
+            self.assertEqual(got, expected)
+            self.assertEqual(len(expected), 2)
+
+    async def test_faculty_list_uses_the_list_cache(self):
+        self.assertEqual((await self.async_client.get("/api/async/faculty/"))["X-Cache"], "miss")
+        self.assertEqual((await self.async_client.get("/api/async/faculty/?junk=1"))["X-Cache"], "hit")
+
+    async def test_faculty_me_matches_sync_view(self):
+        res = await self.async_client.get("/api/async/faculty/me/", AUTHORIZATION=self.bearer)
+        expected = await sync_to_async(
+            lambda: self.client.get("/api/faculty/me/", HTTP_AUTHORIZATION=self.bearer).json()
+        )()
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.json(), expected)
+        self.assertEqual((await self.async_client.get("/api/async/faculty/me/")).status_code, 401)
+
+    async def test_search_finds_public_faculty_and_papers(self):
+        res = (await self.async_client.get("/api/async/search/?q=ada")).json()
+        self.assertEqual([f["name"] for f in res["faculty"]], ["Ada Lovelace"])
+        self.assertEqual(res["papers"], [])
+        res = (await self.async_client.get("/api/async/search/?q=engine")).json()
+        self.assertEqual([p["doi"] for p in res["papers"]], ["10.1/notes"])
+        self.assertEqual((await self.async_client.get("/api/async/search/")).json(), {"faculty": [], "papers": []})
+
+    def test_own_middleware_stays_async(self):
+        from asgiref.sync import iscoroutinefunction
+        from .db_router import ReplicaRoutingMiddleware
+        from .middleware import MediaWhiteNoiseMiddleware
+
+        async def view(request):
+            return None
+
+        for middleware in (ReplicaRoutingMiddleware, MediaWhiteNoiseMiddleware):
+            self.assertTrue(iscoroutinefunction(middleware(view)), middleware)
+            self.assertFalse(iscoroutinefunction(middleware(lambda request: None)), middleware)
+
+    async def test_paper_list_is_not_published(self):
+        self.assertEqual((await self.async_client.get("/api/async/papers/")).status_code, 404)
+
+
+class FacultyDashboardTests(TestCase):
+    def setUp(self):
+        from django.contrib.auth.models import User
+        from .authentication import auth_cache
+        from .models import Faculty
+
+        auth_cache.clear()
+        User.objects.create_user(username="ada", password="pw123456")
+        self.faculty = Faculty.objects.create(
+            user=User.objects.get(username="ada"), faculty_id="ada-l", name="Ada L", is_approved=True
+        )
+        token = self.client.post(
+            "/api/token/", {"username": "ada", "password": "pw123456"}, content_type="application/json"
+        ).json()["access"]
+        self.auth = {"HTTP_AUTHORIZATION": f"Bearer {token}"}
+
+    def add_items(self, n, offset=0):
+        from .models import Paper, PaperAuthorship, Patent, Project
+
+        for i in range(offset, offset + n):
+            paper = Paper.objects.create(doi=f"10.1/{i}", title=f"P{i}", tc_count=i)
+            PaperAuthorship.objects.create(paper=paper, faculty=self.faculty, status="approved")
+            Project.objects.create(title=f"Pr{i}").faculty.add(self.faculty)
+            Patent.objects.create(title=f"Pa{i}", patent_number=f"N{i}").faculty.add(self.faculty)
+
+    def fetch(self):
+        self.client.get("/api/faculty/dashboard/", **self.auth)  # warm the faculty cache
+        with self.assertNumQueries(7):  # user + 3 lists + 3 pk prefetches
+            res = self.client.get("/api/faculty/dashboard/", **self.auth)
+        self.assertEqual(res.status_code, 200)
+        return res.json()
+
+    def test_query_count_does_not_grow_with_items(self):
+        self.add_items(1)
+        one = self.fetch()
+        self.add_items(5, offset=1)
+        six = self.fetch()
+
+        self.assertEqual(one["counts"]["papers"], 1)
+        self.assertEqual(six["counts"]["papers"], 6)
+        self.assertEqual(six["counts"]["authorships"]["approved"], 6)
+        self.assertEqual(six["papers"][0]["authorship_status"], "approved")
+        self.assertEqual(len(six["projects"]), 6)
+        self.assertEqual(six["profile"]["faculty_id"], "ada-l")
+
+    def test_status_is_this_faculty_members_own(self):
+        from .models import Faculty, PaperAuthorship
+
+        self.add_items(1)
+        other = Faculty.objects.create(faculty_id="bob", name="Bob")
+        PaperAuthorship.objects.create(paper_id=PaperAuthorship.objects.get().paper_id, faculty=other, status="rejected")
+
+        data = self.fetch()
+        self.assertEqual([p["authorship_status"] for p in data["papers"]], ["approved"])
+        self.assertEqual(sorted(data["papers"][0]["authors"]), sorted([self.faculty.pk, other.pk]))
+
+    def test_own_papers_are_approved_and_all_linked_papers_are_listed(self):
+        from .models import Paper, PaperAuthorship
+
+        res = self.client.post("/api/faculty/papers/", {"doi": "10.1/mine", "title": "Mine"},
+                               content_type="application/json", **self.auth)
+        self.assertEqual(res.status_code, 201)
+        self.assertEqual(res.json()["authorship_status"], "approved")
+        self.assertEqual(PaperAuthorship.objects.get(paper__doi="10.1/mine").status, "approved")
+
+        for status in ("pending", "rejected"):
+            paper = Paper.objects.create(doi=f"10.1/{status}", title=status)
+            PaperAuthorship.objects.create(paper=paper, faculty=self.faculty, status=status)
+        listed = self.client.get("/api/faculty/papers/", **self.auth).json()
+        self.assertEqual(
+            sorted((p["doi"], p["authorship_status"]) for p in listed),
+            [("10.1/mine", "approved"), ("10.1/pending", "pending"), ("10.1/rejected", "rejected")],
+        )
+        self.assertEqual(self.faculty.titles, ["Mine"])
+
+
+class PaperDedupTests(TestCase):
+    ABSTRACT = (
+        "We study cache replacement policies for large scale key value stores and show that "
+        "a simple frequency based admission filter improves hit rates across production traces."
+    )
+
+    def test_near_duplicate_flagged_on_insert(self):
+        from .models import Paper, PaperDuplicate
+
+        # indexed when the saving transaction commits
+        with self.captureOnCommitCallbacks(execute=True):
+            a = Paper.objects.create(doi="10.1/preprint", title="Admission Filters for Key-Value Caches",
+                                     abstract=self.ABSTRACT)
+        with self.captureOnCommitCallbacks(execute=True):
+            Paper.objects.create(doi="10.1/other", title="Graph neural networks for molecule design",
+                                 abstract="Something else entirely about chemistry and graphs.")
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            b = Paper.objects.create(doi="10.1/published", title="Admission filters for key value caches.",
+                                     abstract=self.ABSTRACT + " Extended version.")
+            b.save()
+            self.assertEqual(PaperDuplicate.objects.count(), 0)
+        self.assertEqual(sum(getattr(cb, "args", None) == (b.pk,) for cb in callbacks), 1)  # one index, not two
+
+        pairs = list(PaperDuplicate.objects.values_list("paper_id", "duplicate_of_id"))
+        self.assertEqual(pairs, [(b.id, a.id)])
+
+    def test_batch_scan_and_merge_moves_authorships(self):
+        from . import dedup
+        from .models import Faculty, Paper, PaperAuthorship, PaperDuplicate
+
+        f1 = Faculty.objects.create(faculty_id="f1", name="F1", article_count=5)
+        f2 = Faculty.objects.create(faculty_id="f2", name="F2", article_count=5)
+        with dedup.indexing_paused():
+            keep = Paper.objects.create(doi="10.1/a", title="Admission Filters for Key-Value Caches", tc_count=3)
+            dup = Paper.objects.create(doi="10.1/b", title="Admission filters for key-value caches",
+                                       abstract=self.ABSTRACT, tc_count=7)
+        self.assertEqual(PaperDuplicate.objects.count(), 0)
+
+        indexed, flagged = dedup.scan(rebuild=True)
+        self.assertEqual((indexed, flagged), (2, 1))
+
+        PaperAuthorship.objects.create(paper=keep, faculty=f1, status="pending")
+        PaperAuthorship.objects.create(paper=dup, faculty=f1, status="approved")
+        PaperAuthorship.objects.create(paper=dup, faculty=f2, status="pending")
+
+        dedup.merge_papers(keep, dup)
+        keep.refresh_from_db()
+        self.assertFalse(Paper.objects.filter(pk=dup.pk).exists())
+        self.assertEqual(set(keep.authors.values_list("id", flat=True)), {f1.id, f2.id})
+        self.assertEqual(
+            dict(keep.authorships.values_list("faculty_id", "status")),
+            {f1.id: "approved", f2.id: "pending"},
+        )
+        self.assertEqual((keep.abstract, keep.tc_count), (self.ABSTRACT, 7))
+        self.assertEqual(PaperDuplicate.objects.count(), 0)
+        # f1 had both copies counted, f2 still has its one paper
+        self.assertEqual(dict(Faculty.objects.values_list("faculty_id", "article_count")), {"f1": 4, "f2": 5})
+        self.assertEqual(dedup.merged_into(["10.1/B"]), {"10.1/b": keep.pk})
+
+
+class TypeaheadTests(TestCase):
+    def setUp(self):
+        from . import typeahead
+        typeahead._State.index = typeahead._State.version = None
+
+    def test_prefix_matches_any_word_ranked_by_citations(self):
+        from .models import Faculty, Paper
+
+        Faculty.objects.create(faculty_id="a", name="John Smith", department="Physics",
+                               keywords=["Quantum Optics"], total_citations=10, is_approved=True)
+        Faculty.objects.create(faculty_id="b", name="Jane Smithers", department="Computer Science",
+                               total_citations=500, is_approved=True)
+        Faculty.objects.create(faculty_id="c", name="Hidden Smithson", total_citations=9999)  # not approved
+        Paper.objects.create(doi="10.1/q", title="Q", keywords=["quantum computing"], tc_count=40)
+
+        res = self.client.get("/api/autocomplete/?q=smi").json()["results"]
+        self.assertEqual([r["label"] for r in res], ["Jane Smithers", "John Smith"])
+
+        res = self.client.get("/api/autocomplete/?q=Quan&limit=5").json()["results"]
+        self.assertEqual([(r["type"], r["label"]) for r in res],
+                         [("keyword", "quantum computing"), ("keyword", "quantum optics")])
+
+        res = self.client.get("/api/autocomplete/?q=computer sc").json()["results"]
+        self.assertEqual(res[0]["label"], "Computer Science")
+
+
+class DoiResolveTests(TestCase):
+    def setUp(self):
+        from . import doi_lookup, dataset
+        doi_lookup.clear()
+        dataset._cached.update(version=None, checked=0.0)
+
+    def test_batch_resolve_is_cached_until_authorships_change(self):
+        from .models import Faculty, Paper, PaperAuthorship
+
+        ada = Faculty.objects.create(faculty_id="ada", name="Ada", is_approved=True)
+        alan = Faculty.objects.create(faculty_id="alan", name="Alan", is_approved=True)
+        hidden = Faculty.objects.create(faculty_id="h", name="Hidden", is_approved=True, profile_visibility=False)
+        paper = Paper.objects.create(doi="10.1/Abc", title="A", tc_count=7)
+        PaperAuthorship.objects.create(paper=paper, faculty=ada, status="approved")
+        PaperAuthorship.objects.create(paper=paper, faculty=hidden, status="approved")
+        pending = PaperAuthorship.objects.create(paper=paper, faculty=alan)
+
+        body = {"dois": ["https://doi.org/10.1/abc", "10.9/missing", "  "]}
+        with self.assertNumQueries(2):  # dataset version + one batch
+            res = self.client.post("/api/papers/resolve/", body, content_type="application/json").json()
+        self.assertEqual((res["found"], res["missing"]), (1, 2))
+        hit = res["results"]["https://doi.org/10.1/abc"]
+        self.assertEqual((hit["id"], hit["doi"], hit["tc_count"]), (paper.pk, "10.1/Abc", 7))
+        self.assertEqual([a["name"] for a in hit["authors"]], ["Ada"])
+        self.assertIsNone(res["results"]["10.9/missing"])
+
+        with self.assertNumQueries(0):
+            self.client.post("/api/papers/resolve/", body, content_type="application/json")
+
+        from unittest import mock
+        from . import dataset
+
+        with mock.patch.object(dataset, "mark_changed") as mark_changed:
+            pending.status = "approved"
+            pending.save()
+        mark_changed.assert_called_once()
+        dataset.bump()  # what the commit would run
+        res = self.client.post("/api/papers/resolve/", body, content_type="application/json")
+        self.assertNotIn("X-Primary-Pin", res)  # a lookup, not a write: callers stay on the replicas
+        self.assertEqual(sorted(a["name"] for a in res.json()["results"]["https://doi.org/10.1/abc"]["authors"]),
+                         ["Ada", "Alan"])
+
+    def test_rejects_bad_payloads(self):
+        from . import doi_lookup
+
+        self.assertEqual(self.client.post("/api/papers/resolve/", {"dois": "10.1/a"},
+                                          content_type="application/json").status_code, 400)
+        too_many = {"dois": ["10.1/x"] * (doi_lookup.MAX_DOIS + 1)}
+        self.assertEqual(self.client.post("/api/papers/resolve/", too_many,
+                                          content_type="application/json").status_code, 400)
+
+
+class SingleFlightCacheTests(SimpleTestCase):
+    def test_one_rebuild_while_others_get_the_stale_value(self):
+        import threading
+        import time
+        from .coalesce import SingleFlightCache
+
+        cache = SingleFlightCache(ttl=60, stale=300, wait=5)
+        cache.get("k", 1, lambda: "v1")
+        cache._entries["k"].expires = time.monotonic() - 1  # expired, still servable stale
+        release, builds = threading.Event(), []
+
+        def rebuild():
+            builds.append(1)
+            release.wait(5)
+            return "v2"
+
+        leader = threading.Thread(target=cache.get, args=("k", 1, rebuild))
+        leader.start()
+        while "k" not in cache._flights:
+            pass
+        served = [cache.get("k", 1, rebuild) for _ in range(20)]
+        release.set()
+        leader.join()
+
+        self.assertEqual(served, [("v1", "stale")] * 20)
+        self.assertEqual(len(builds), 1)
+        self.assertEqual(cache.get("k", 1, rebuild), ("v2", "hit"))
+        stats = cache.stats()
+        self.assertEqual((stats["builds"], stats["coalesced_total"]), (2, 20))
+
+    def test_cold_key_waits_for_the_leader(self):
+        import threading
+        import time
+        from .coalesce import SingleFlightCache
+
+        cache = SingleFlightCache(ttl=60, stale=300, wait=5)
+        release, results = threading.Event(), []
+
+        def slow():
+            release.wait(5)
+            return "v"
+
+        leader = threading.Thread(target=cache.get, args=("k", 1, slow))
+        leader.start()
+        while "k" not in cache._flights:
+            pass
+        follower = threading.Thread(target=lambda: results.append(cache.get("k", 1, lambda: "own")))
+        follower.start()
+        time.sleep(0.1)  # let it block on the flight
+        release.set()
+        leader.join()
+        follower.join()
+        self.assertEqual(results, [("v", "coalesced")])
+
+    def test_version_bump_and_early_refresh_rebuild(self):
+        from . import coalesce
+
+        cache = coalesce.SingleFlightCache(ttl=60, stale=300, wait=5)
+        cache.get("k", 1, lambda: "v1")
+        self.assertEqual(cache.get("k", 2, lambda: "v2"), ("v2", "miss"))
+
+        cache._entries["k"].delta = 1e9  # a very slow build: refresh well ahead of expiry
+        self.assertEqual(cache.get("k", 2, lambda: "v3"), ("v3", "early"))
+
+
+class ListCacheTests(TestCase):
+    def setUp(self):
+        from .coalesce import lists
+        lists.clear()
+
+    def test_public_lists_are_served_from_the_cache(self):
+        from .models import Faculty
+
+        Faculty.objects.create(faculty_id="a", name="A", is_approved=True)
+        self.assertEqual(self.client.get("/api/faculty/")["X-Cache"], "miss")
+        with self.assertNumQueries(0):  # the dataset version is polled, not per request
+            res = self.client.get("/api/faculty/")
+        self.assertEqual((res["X-Cache"], res.json()[0]["name"]), ("hit", "A"))
+        self.assertEqual(self.client.get("/api/faculty/?include=titles")["X-Cache"], "miss")
+
+    @override_settings(ALLOWED_HOSTS=["a.example.com", "b.example.com"])
+    def test_media_urls_follow_the_requests_host(self):
+        from .models import Faculty
+
+        Faculty.objects.create(faculty_id="a", name="A", is_approved=True, photo="faculty_photos/a.png")
+        for url in ("/api/faculty/", "/api/faculty/?include=titles"):  # fast path and DRF serializer
+            first = self.client.get(url, HTTP_HOST="a.example.com")
+            self.assertEqual(first.json()[0]["photo"], "http://a.example.com/media/faculty_photos/a.png")
+            other = self.client.get(url, HTTP_HOST="b.example.com", secure=True)
+            self.assertEqual(other["X-Cache"], "hit")
+            self.assertEqual(other.json()[0]["photo"], "https://b.example.com/media/faculty_photos/a.png")
+
+    def test_unrelated_params_share_one_entry(self):
+        from .coalesce import lists
+
+        self.assertEqual(self.client.get("/api/faculty/?include=titles,dois")["X-Cache"], "miss")
+        for query in ("include=dois,titles", "include=titles,dois&_=1", "include=dois,titles,bogus&x=2"):
+            self.assertEqual(self.client.get(f"/api/faculty/?{query}")["X-Cache"], "hit", query)
+        self.assertEqual(self.client.get("/api/faculty/?utm_source=mail")["X-Cache"], "miss")
+        self.assertEqual(self.client.get("/api/faculty/?cb=123")["X-Cache"], "hit")
+        self.assertEqual(lists.stats()["keys"], 2)
+
+
+class ImportCheckpointTests(TestCase):
+    def setUp(self):
+        from pathlib import Path
+
+        self.tmp = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.tmp, ignore_errors=True)
+        faculty = [{"_id": "ada", "name": "Ada Lovelace", "dois": ["10.1/P0"]},
+                   {"_id": "alan", "name": "Alan Turing"}]
+        papers = [{"doi": f"10.1/p{i}", "title": f"Paper number {i}",
+                   "faculty_members": ["Alan Turing"] if i == 4 else []} for i in range(5)]
+        (self.tmp / "faculty.json").write_text(json.dumps(faculty))
+        (self.tmp / "papers.json").write_text(json.dumps(papers))
+        static = override_settings(STATIC_ROOT=str(self.tmp / "static"))  # the directory snapshot
+        static.enable()
+        self.addCleanup(static.disable)
+
+    def run_import(self, *extra):
+        from io import StringIO
+        from django.core.management import call_command
+
+        call_command(
+            "import_full_dataset", "--faculty", str(self.tmp / "faculty.json"),
+            "--papers", str(self.tmp / "papers.json"), "--chunk-size", "2",
+            "--report", str(self.tmp / "report.json"), *extra, stdout=StringIO(),
+        )
+
+    def test_resume_continues_after_a_failed_chunk(self):
+        import json
+        from unittest import mock
+        from .management.commands.import_full_dataset import PHASES, Command
+        from .models import ImportCheckpoint, Paper, PaperAuthorship
+
+        real = Command.import_papers
+        calls = []
+
+        def flaky(cmd, batch, m):
+            calls.append(len(batch))
+            if len(calls) == 2:
+                raise RuntimeError("boom")
+            real(cmd, batch, m)
+
+        with mock.patch.object(Command, "import_papers", flaky), self.assertRaises(RuntimeError):
+            self.run_import("--checkpoint")
+
+        cp = ImportCheckpoint.objects.get()
+        self.assertEqual((cp.phase, cp.offset), ("papers", 2))
+        self.assertEqual(Paper.objects.count(), 2)  # first chunk committed, second rolled back
+
+        self.run_import("--resume")
+
+        cp.refresh_from_db()
+        self.assertIsNotNone(cp.finished_at)
+        self.assertEqual(Paper.objects.count(), 5)
+        self.assertEqual(
+            set(PaperAuthorship.objects.values_list("paper__doi", "faculty__faculty_id")),
+            {("10.1/p0", "ada"), ("10.1/p4", "alan")},
+        )
+        report = json.loads((self.tmp / "report.json").read_text())
+        self.assertEqual(report["phases"]["papers"]["created"], 5)
+        self.assertEqual(list(report["phases"]), [*PHASES, "ranking"])
+
+    def test_no_report_file_unless_asked(self):
+        import os
+        from io import StringIO
+        from django.core.management import call_command
+
+        cwd = os.getcwd()
+        os.chdir(self.tmp)
+        self.addCleanup(os.chdir, cwd)
+        out = StringIO()
+        call_command("import_full_dataset", "--faculty", "faculty.json", "--papers", "papers.json", stdout=out)
+        self.assertEqual(sorted(p.name for p in self.tmp.iterdir()), ["faculty.json", "papers.json", "static"])
+        self.assertIn("papers", out.getvalue())  # the table is still printed
+
+    def test_reimport_keeps_merged_papers_merged(self):
+        from . import dedup
+        from .models import Faculty, Paper
+
+        faculty = [{"_id": "ada", "name": "Ada Lovelace", "dois": ["10.1/p0", "10.1/p1"], "article_count": 2}]
+        (self.tmp / "faculty.json").write_text(json.dumps(faculty))
+        self.run_import()
+        ada = Faculty.objects.get(faculty_id="ada")
+        self.assertEqual(set(ada.papers.values_list("doi", flat=True)), {"10.1/p0", "10.1/p1"})
+
+        dedup.merge_papers(Paper.objects.get(doi="10.1/p0"), Paper.objects.get(doi="10.1/p1"))
+        self.run_import()
+
+        self.assertFalse(Paper.objects.filter(doi="10.1/p1").exists())
+        self.assertEqual(list(ada.papers.values_list("doi", flat=True)), ["10.1/p0"])
+        ada.refresh_from_db()
+        self.assertEqual(ada.article_count, 1)
+        report = json.loads((self.tmp / "report.json").read_text())
+        self.assertEqual(report["phases"]["papers"]["merged"], 1)
+
+    def test_resume_refuses_changed_source_files(self):
+        from django.core.management.base import CommandError
+        from .models import ImportCheckpoint
+
+        ImportCheckpoint.objects.create(faculty_sha256="0" * 64, papers_sha256="0" * 64,
+                                        options={"max": 0}, phase="papers", offset=2)
+        with self.assertRaises(CommandError):
+            self.run_import("--resume")
+
+
+@override_settings(STORAGES={
+    "default": {"BACKEND": "academic.storage.ContentHashStorage"},
+    "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+})
+class AdminChangelistTests(TestCase):
+    def setUp(self):
+        from django.contrib.auth.models import User
+
+        self.client.force_login(User.objects.create_superuser("root", "root@example.com", "pw"))
+
+    def add_rows(self, n, offset=0):
+        from .models import Faculty, Paper, PaperAuthorship
+
+        for i in range(offset, offset + n):
+            fac = Faculty.objects.create(faculty_id=f"f{i}", name=f"Faculty {i}")
+            paper = Paper.objects.create(doi=f"10.1/{i}", title=f"Paper {i}")
+            PaperAuthorship.objects.create(paper=paper, faculty=fac)
+
+    def count_queries(self, url):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(self.client.get(url).status_code, 200)
+        return len(ctx)
+
+    def test_changelists_run_a_fixed_number_of_queries(self):
+        urls = [
+            "/admin/academic/faculty/",
+            "/admin/academic/paper/",
+            "/admin/academic/paperauthorship/",
+            "/admin/academic/paperauthorship/?q=10.1/1",
+        ]
+        self.add_rows(2)
+        few = [self.count_queries(u) for u in urls]
+        self.add_rows(20, offset=2)
+        self.assertEqual([self.count_queries(u) for u in urls], few)
+
+    def test_bulk_status_actions(self):
+        from .models import PaperAuthorship
+
+        self.add_rows(3)
+        ids = list(PaperAuthorship.objects.values_list("pk", flat=True)[:2])
+        self.client.post("/admin/academic/paperauthorship/", {
+            "action": "mark_approved", "_selected_action": ids,
+        })
+        self.assertEqual(
+            sorted(PaperAuthorship.objects.values_list("status", flat=True)),
+            ["approved", "approved", "pending"],
+        )
+        self.assertFalse(PaperAuthorship.objects.filter(status="approved", decided_at=None).exists())
+
+
+class StartupImportsTests(SimpleTestCase):
+    def test_heavy_dependencies_are_not_imported_at_startup(self):
+        from .management.commands.bench_startup import SETUP_WATCH, WATCH, Command
+
+        result = Command().probe("scoupdb.wsgi")
+        self.assertEqual([m for m in result["loaded"] if m in WATCH], [])
+        self.assertEqual([m for m in result["setup_loaded"] if m in SETUP_WATCH], [])
+
+
+class KeywordExtractionTests(TestCase):
+    def test_extracts_and_only_reprocesses_changed_text(self):
+        from . import keywords
+        from .models import Faculty, Paper, PaperAuthorship
+
+        fac = Faculty.objects.create(faculty_id="k", name="K", bio="Research on graph neural networks.")
+        texts = [
+            ("Graph neural networks for molecule property prediction",
+             "We propose graph neural networks that predict molecule properties."),
+            ("Protein folding with attention", "Attention models for protein folding."),
+            ("Soil moisture sensing", "Low cost soil moisture sensors for farms."),
+        ]
+        papers = [Paper.objects.create(doi=f"10.2/{i}", title=t, abstract=a) for i, (t, a) in enumerate(texts)]
+        PaperAuthorship.objects.create(paper=papers[0], faculty=fac)
+        PaperAuthorship.objects.create(paper=papers[2], faculty=fac, status="rejected")
+
+        stats, built = keywords.get_stats()
+        self.assertTrue(built)
+        self.assertEqual(keywords.update_documents("paper", stats=stats, count_new=False), 3)
+        self.assertEqual(keywords.update_faculty(stats=stats), 1)
+
+        papers[0].refresh_from_db()
+        fac.refresh_from_db()
+        self.assertIn("graph neural networks", papers[0].ai_keywords)
+        self.assertNotIn("we", " ".join(papers[0].ai_keywords).split())
+        self.assertTrue(fac.ai_keywords.startswith("graph neural networks"))
+        self.assertNotIn("soil moisture", fac.ai_keywords)  # rejected authorship
+
+        # nothing changed -> nothing rewritten
+        self.assertEqual(keywords.update_documents("paper"), 0)
+        self.assertEqual(keywords.update_faculty(), 0)
+
+        Paper.objects.filter(pk=papers[1].pk).update(abstract="Attention models for protein design.")
+        self.assertEqual(keywords.update_documents("paper"), 1)
+        self.assertEqual(keywords.Stats.load().docs, 3)  # re-extracted, not a new document
+
+
+class DirectorySnapshotTests(TestCase):
+    def setUp(self):
+        from . import snapshot
+
+        self.static_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.static_root, ignore_errors=True)
+        static = override_settings(STATIC_ROOT=self.static_root)
+        static.enable()
+        self.addCleanup(static.disable)
+        snapshot._State.disk_version = snapshot._State.disk_mtime = None
+
+    def test_build_and_serve(self):
+        from . import dataset, snapshot
+        from .models import Faculty, Paper, PaperAuthorship
+
+        fac = Faculty.objects.create(faculty_id="a", name="Ada", is_approved=True)
+        Faculty.objects.create(faculty_id="b", name="Hidden")  # not approved
+        PaperAuthorship.objects.create(paper=Paper.objects.create(doi="10.3/a", title="On Engines"),
+                                       faculty=fac, status="approved")
+        PaperAuthorship.objects.create(paper=Paper.objects.create(doi="10.3/b", title="Not Mine"),
+                                       faculty=fac, status="rejected")
+
+        manifest = snapshot.build()
+        self.assertEqual(manifest["count"], 1)
+        self.assertEqual(list(manifest["faculty"]), [str(fac.pk)])
+
+        res = self.client.get("/static/snapshot/manifest.json")
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(b"".join(res.streaming_content), (snapshot.root() / "manifest.json").read_bytes())
+
+        res = self.client.get(manifest["directory"], HTTP_ACCEPT_ENCODING="gzip")
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res["Content-Encoding"], "gzip")
+        self.assertIn("immutable", res["Cache-Control"])
+
+        profile = self.client.get(manifest["faculty"][str(fac.pk)])
+        self.assertEqual(json.loads(b"".join(profile.streaming_content))["titles"], ["On Engines"])
+
+        # unchanged data -> same files; approving someone -> new directory, old one kept once
+        forced = snapshot.build(force=True)
+        self.assertEqual(forced["directory"], manifest["directory"])
+        Faculty.objects.filter(faculty_id="b").update(is_approved=True)
+        self.assertEqual(snapshot.build(), forced)  # directory version didn't move: nothing to do
+        dataset.bump(directory=True)
+        newer = snapshot.build()
+        self.assertNotEqual(newer["directory"], manifest["directory"])
+        self.assertEqual(self.client.get(manifest["directory"]).status_code, 200)
+        for suffix in ("", ".gz"):
+            self.assertTrue((snapshot.root() / f"manifest.json{suffix}").exists())
+        self.assertEqual([p.name for p in snapshot.root().glob(".*.tmp")], [])
+
+    def test_only_directory_changes_trigger_a_rebuild(self):
+        from unittest import mock
+        from . import dataset, snapshot
+        from .models import DatasetVersion
+
+        snapshot.build()
+        snapshot._State.disk_mtime = None
+        dataset.bump()  # e.g. a paper save
+        with mock.patch.object(snapshot, "_start") as start:
+            snapshot.ensure_current()
+            self.assertEqual(start.call_count, 0)
+            dataset.bump(directory=True)
+            snapshot.ensure_current()
+            self.assertEqual(start.call_count, 1)
+        self.assertEqual(DatasetVersion.objects.values_list("version", "directory_version").get(), (2, 1))
+
+    def test_faculty_save_schedules_rebuild_after_commit(self):
+        from unittest import mock
+        from . import snapshot
+        from .models import Faculty
+
+        with mock.patch.object(snapshot, "_start") as start:
+            with self.captureOnCommitCallbacks(execute=True):
+                Faculty.objects.create(faculty_id="c", name="Cleo", is_approved=True)
+            self.assertEqual(start.call_count, 1)
+            with snapshot.deferred(), self.captureOnCommitCallbacks(execute=True):
+                Faculty.objects.create(faculty_id="d", name="Dan", is_approved=True)
+            self.assertEqual(start.call_count, 1)
+
+    def test_only_public_faculty_changes_schedule_a_rebuild(self):
+        from unittest import mock
+        from . import snapshot
+        from .models import DatasetVersion, Faculty
+
+        def saves(fac, **changes):
+            for name, value in changes.items():
+                setattr(fac, name, value)
+            with self.captureOnCommitCallbacks(execute=True):
+                fac.save()
+
+        with mock.patch.object(snapshot, "_start") as start:
+            with self.captureOnCommitCallbacks(execute=True):
+                fac = Faculty.objects.create(faculty_id="e", name="Eve")  # signup, not approved yet
+            saves(fac, bio="pending review")
+            self.assertEqual(start.call_count, 0)
+            self.assertEqual(DatasetVersion.objects.get().directory_version, 0)
+
+            saves(fac, is_approved=True)
+            saves(fac, profile_visibility=False)  # was public: drops out of the snapshot
+            self.assertEqual(start.call_count, 2)
+            saves(Faculty.objects.get(pk=fac.pk), bio="hidden edit")
+            self.assertEqual(start.call_count, 2)
+
+            with self.captureOnCommitCallbacks(execute=True):
+                fac.delete()
+            self.assertEqual(start.call_count, 2)
+
+
+class RankingTests(TestCase):
+    def test_scores_are_normalized_by_field_and_year(self):
+        import datetime
+        from . import ranking
+        from .models import Faculty, Paper, PaperAuthorship
+
+        def paper(doi, tc, year, field="ml"):
+            return Paper.objects.create(doi=doi, title=doi, tc_count=tc, keywords=[field],
+                                        date_published_print=datetime.date(year, 6, 1),
+                                        date_published_online=datetime.date(year, 1, 1))
+
+        new_low, new_high = paper("10.1/a", 10, 2024), paper("10.1/b", 30, 2024)
+        old_low, old_high = paper("10.1/c", 100, 2010), paper("10.1/d", 300, 2010)
+        Paper.objects.create(doi="10.1/e", title="undated", tc_count=5)
+
+        ada = Faculty.objects.create(faculty_id="ada", name="Ada", department="Physics", is_approved=True)
+        bob = Faculty.objects.create(faculty_id="bob", name="Bob", department="Physics", is_approved=True)
+        Faculty.objects.create(faculty_id="eve", name="Eve", department="Physics")  # not public
+        PaperAuthorship.objects.create(paper=new_high, faculty=ada, status="approved")
+        PaperAuthorship.objects.create(paper=new_low, faculty=bob)
+        PaperAuthorship.objects.create(paper=old_high, faculty=bob, status="rejected")
+
+        self.assertEqual(ranking.recompute(), {"papers": 5, "faculty": 2})
+        self.assertEqual(ranking.recompute(), {"papers": 0, "faculty": 0})  # unchanged rows are skipped
+
+        new_high.refresh_from_db()
+        old_high.refresh_from_db()
+        # each is 1.5x its (smoothed) cohort mean, despite 10x fewer citations
+        self.assertEqual((new_high.pub_year, new_high.citation_score), (2024, 1.5))
+        self.assertEqual(old_high.citation_score, 1.5)
+
+        res = self.client.get("/api/rankings/papers/?year=2024").json()
+        self.assertEqual([p["doi"] for p in res["results"]], ["10.1/b", "10.1/a"])
+        res = self.client.get("/api/rankings/papers/?limit=2").json()
+        self.assertEqual([p["doi"] for p in res["results"]], ["10.1/b", "10.1/d"])
+
+        res = self.client.get("/api/rankings/faculty/?department=Physics").json()
+        self.assertEqual([(f["name"], f["citation_score"]) for f in res["results"]], [("Ada", 1.5), ("Bob", 0.5)])
+        self.assertEqual(self.client.get("/api/rankings/papers/?year=last").status_code, 400)
@@ -0,0 +1,140 @@
+"""
+In-process typeahead over faculty names, departments and keywords.
+
+Terms live in one sorted list; a prefix query is two bisects plus picking
+the best-weighted matches in that slice. Prefixes of up to PRECOMPUTED_PREFIX
+characters (the ones that match huge slices) have their top results worked
+out at build time. Weights are citations: a faculty member's
+total_citations, the summed citations of a department's faculty, and for a
+keyword the citations of every faculty member / paper carrying it.
+
+The index is rebuilt on a background thread when the dataset version moves;
+requests keep using the previous index until the new one is swapped in.
+"""
+import heapq
+import logging
+import threading
+from bisect import bisect_left
+
+from django.db import connection
+
+from . import dataset
+from .dedup import normalize
+from .models import Faculty, Paper
+
+logger = logging.getLogger(__name__)
+
+MAX_LIMIT = 20
+PRECOMPUTED_PREFIX = 3
+
+
+class PrefixIndex:
+    def __init__(self, entries):
+        """
+        entries: {(kind, label, ref): weight}. Every entry is reachable by
+        its whole normalized label and by each word in it, so "smi" finds
+        "John Smith".
+        """
+        self.items = []    # (kind, label, ref, weight), one per entry
+        pairs = []         # (term, item index)
+        for i, ((kind, label, ref), weight) in enumerate(entries.items()):
+            self.items.append((kind, label, ref, weight))
+            norm = normalize(label)
+            if not norm:
+                continue
+            terms = {norm, *norm.split()}
+            pairs.extend((t, i) for t in terms)
+        pairs.sort()
+        self.terms = [t for t, _ in pairs]
+        self.refs = [i for _, i in pairs]
+
+        self.top = {}
+        for n in range(1, PRECOMPUTED_PREFIX + 1):
+            prefixes = {t[:n] for t in self.terms if len(t) >= n}
+            for p in prefixes:
+                self.top[p] = self._scan(p, MAX_LIMIT)
+
+    def _scan(self, prefix, limit):
+        lo = bisect_left(self.terms, prefix)
+        hi = bisect_left(self.terms, prefix + "\uffff", lo)
+        best = {}
+        for i in self.refs[lo:hi]:
+            best[i] = self.items[i][3]
+        return heapq.nlargest(limit, best, key=best.__getitem__)
+
+    def search(self, query, limit=10):
+        prefix = normalize(query)
+        if not prefix:
+            return []
+        limit = max(1, min(limit, MAX_LIMIT))
+        hits = self.top.get(prefix)
+        hits = hits[:limit] if hits is not None else self._scan(prefix, limit)
+        return [
+            {"type": kind, "label": label, "id": ref, "weight": weight}
+            for kind, label, ref, weight in (self.items[i] for i in hits)
+        ]
+
+
+def build_index():
+    entries = {}
+
+    def add(kind, label, ref, weight):
+        label = (label or "").strip()
+        if label:
+            key = (kind, label.lower() if kind == "keyword" else label, ref)
+            entries[key] = entries.get(key, 0) + (weight or 0)
+
+    rows = Faculty.objects.filter(is_approved=True, profile_visibility=True).values_list(
+        "id", "name", "first_name", "last_name", "department", "keywords", "total_citations"
+    )
+    for pk, name, first, last, dept, keywords, cites in rows.iterator(chunk_size=2000):
+        display = name or f"{first or ''} {last or ''}".strip()
+        add("faculty", display, pk, cites)
+        add("department", dept, None, cites)
+        for kw in keywords or []:
+            if isinstance(kw, str):
+                add("keyword", kw, None, cites)
+
+    for keywords, cites in Paper.objects.values_list("keywords", "tc_count").iterator(chunk_size=5000):
+        for kw in keywords or []:
+            if isinstance(kw, str):
+                add("keyword", kw, None, cites)
+
+    return PrefixIndex(entries)
+
+
+class _State:
+    index = None
+    version = None
+    building = False
+    lock = threading.Lock()
+
+
+def _rebuild(version):
+    try:
+        index = build_index()
+        with _State.lock:
+            _State.index, _State.version = index, version
+    except Exception:
+        logger.exception("typeahead index rebuild failed")
+    finally:
+        with _State.lock:
+            _State.building = False
+        connection.close()  # this thread's own DB connection
+
+
+def get_index():
+    version = dataset.current_version()
+    with _State.lock:
+        index, stale = _State.index, _State.version != version
+        start = stale and index is not None and not _State.building
+        if start:
+            _State.building = True
+    if index is None:
+        # first request in this worker: build inline
+        index = build_index()
+        with _State.lock:
+            _State.index, _State.version = index, version
+    elif start:
+        threading.Thread(target=_rebuild, args=(version,), daemon=True, name="typeahead-rebuild").start()
+    return index
@@ -1,7 +1,5 @@
 from django.urls import path
-from django.conf import settings
-from django.conf.urls.static import static
-from . import views
+from . import views, async_views
 from .views import (
     FacultyListCreateView,
     faculty_me,
@@ -20,10 +18,15 @@ urlpatterns = [
 
     path('faculty/', FacultyListCreateView.as_view(), name='faculty-list'),
     path('faculty/me/', faculty_me, name='faculty_me'),
+    path('faculty/dashboard/', views.FacultyDashboardView.as_view(), name='faculty-dashboard'),
     path("papers/", views.MyPapersListCreateView.as_view(), name="my-papers"),
+    path("papers/resolve/", views.resolve_dois, name="resolve-dois"),
     path("projects/", views.MyProjectsListCreateView.as_view(), name="my-projects"),
     path("patents/", views.MyPatentsListCreateView.as_view(), name="my-patents"),
     path("faculty/signup/", views.faculty_signup, name="faculty_signup"),
+    path("autocomplete/", views.autocomplete, name="autocomplete"),
+    path("rankings/papers/", views.top_papers, name="top-papers"),
+    path("rankings/faculty/", views.top_faculty, name="top-faculty"),
     path("token/", TokenObtainPairView.as_view(), name="token_obtain_pair"),
     path("token/refresh/", TokenRefreshView.as_view(), name="token_refresh"),
     path("faculty/papers/", MyPapersListCreateView.as_view(), name="my-papers"),
@@ -31,4 +34,9 @@ urlpatterns = [
     path("faculty/patents/", MyPatentsListCreateView.as_view()),
     path("faculty/upload-photo/", FacultyPhotoUploadView.as_view()),
 path("faculty/upload-cv-papers/", FacultyUploadCVPapers.as_view(), name="upload-cv-papers"),
-] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+
+    # async read path (same payloads; only pays off under ASGI, see scoupdb/asgi.py)
+    path("async/faculty/", async_views.faculty_list, name="async-faculty-list"),
+    path("async/faculty/me/", async_views.faculty_me, name="async-faculty-me"),
+    path("async/search/", async_views.search, name="async-search"),
+]
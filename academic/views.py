@@ -1,8 +1,14 @@
 
 import uuid
+from collections import Counter
+
+from django.db.models import F, Prefetch
 from rest_framework import generics
 from .models import Faculty, Paper, Patent, Project
 from .serializers import (
+    DashboardPaperSerializer,
+    prefetch_faculty_includes,
+    requested_includes,
     FacultySerializer,
     FacultyProfileSerializer,
     PaperSerializer,
@@ -16,6 +22,10 @@ from rest_framework import status
 from django.contrib.auth.models import User
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.decorators import api_view
+from rest_framework.views import APIView
+from .db_router import replica_safe, use_primary
+from .fastpath import FastListMixin, plan_for
+from . import doi_lookup, ranking, typeahead
 
 
 
@@ -25,13 +35,42 @@ from django.http import HttpResponse
 def home(request):
     return HttpResponse("<h1>Welcome to the Scoup Database!</h1><p>Go to <a href='/admin/'>Admin</a></p>")
 
-class FacultyListCreateView(generics.ListCreateAPIView):
+
+def get_faculty(request, fresh=False):
+    """
+    The logged-in faculty. FacultyJWTAuthentication hands us a lazy handle
+    built from the token (no query until a field is read); anything else
+    falls back to the normal reverse one-to-one.
+
+    The handle may be up to AUTH_CACHE_TTL seconds old: fine for reads and
+    for filtering by its pk, not for saving. Pass fresh=True for a row
+    that is about to be written.
+    """
+    faculty = getattr(request.user, "faculty", None)
+    if faculty is None:
+        return request.user.faculty_profile
+    if fresh:
+        return Faculty.objects.get(pk=faculty.pk)
+    return faculty
+
+class FacultyListCreateView(FastListMixin, generics.ListCreateAPIView):
+    cache_list = True  # public; one rebuild per expiry, see academic.coalesce
+
     def get_queryset(self): #returns only verified faculty
-        return Faculty.objects.filter(is_approved=True, profile_visibility=True)
-        
+        qs = Faculty.objects.filter(is_approved=True, profile_visibility=True)
+        return prefetch_faculty_includes(qs, requested_includes(self.request))
+
+    def use_fast_list(self, request):
+        # ?include=dois,titles needs the derived lists -> full serializer
+        return super().use_fast_list(request) and not requested_includes(request)
+
+    def cache_key(self, request):
+        # ?include is the only param the list depends on; order and junk don't count
+        return (request.path, tuple(sorted(requested_includes(request))))
+
     serializer_class = FacultySerializer
 
-class PaperListCreateView(generics.ListCreateAPIView):
+class PaperListCreateView(FastListMixin, generics.ListCreateAPIView):
     queryset = Paper.objects.all()
     serializer_class = PaperSerializer
 
@@ -110,58 +149,190 @@ def faculty_signup(request):
         status=status.HTTP_201_CREATED,
     )
 
-class FacultyDashboardView(generics.RetrieveAPIView):
-    serializer_class = FacultySerializer
+class FacultyDashboardView(APIView):
+    """
+    Everything the dashboard shows after login in one response: profile,
+    papers (with this faculty's authorship status), projects, patents and
+    counts. Query count is fixed no matter how many items there are:
+    papers / projects / patents plus one pk-only prefetch each (the profile
+    comes from the auth cache).
+    """
     permission_classes = [IsAuthenticated]
+    use_primary = True  # own data, must see own writes
+
+    def get(self, request):
+        faculty = get_faculty(request)
+        context = {"request": request}
+
+        pks_only = Faculty.objects.only("id")  # serializers only need the pks
+        papers = list(
+            # status comes from the same authorship row the filter joins
+            Paper.objects.filter(authorships__faculty=faculty.pk)
+            .annotate(authorship_status=F("authorships__status"))
+            .prefetch_related(Prefetch("authors", queryset=pks_only))
+            .order_by("-tc_count", "pk")
+        )
+        projects = list(
+            Project.objects.filter(faculty=faculty.pk).prefetch_related(Prefetch("faculty", queryset=pks_only))
+        )
+        patents = list(
+            Patent.objects.filter(faculty=faculty.pk).prefetch_related(Prefetch("faculty", queryset=pks_only))
+        )
 
-    def get_object(self):
-        return self.request.user.faculty_profile
+        by_status = Counter(p.authorship_status for p in papers)
+        return Response({
+            "profile": FacultySerializer(faculty, context=context).data,
+            "papers": DashboardPaperSerializer(papers, many=True, context=context).data,
+            "projects": ProjectSerializer(projects, many=True, context=context).data,
+            "patents": PatentSerializer(patents, many=True, context=context).data,
+            "counts": {
+                "papers": len(papers),
+                "projects": len(projects),
+                "patents": len(patents),
+                "citations": sum(p.tc_count for p in papers),
+                "authorships": {
+                    s: by_status.get(s, 0) for s in ("pending", "approved", "rejected")
+                },
+            },
+        })
 
 
+@use_primary
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
 def faculty_me(request):
-    faculty = request.user.faculty_profile
+    faculty = get_faculty(request)
     serializer = FacultyProfileSerializer(faculty)
     return Response(serializer.data)
 
 
+@api_view(["GET"])
+@permission_classes([AllowAny])
+def autocomplete(request):
+    """Search-box suggestions: ?q=<prefix>&limit=<n> (faculty, departments, keywords)."""
+    query = request.query_params.get("q", "")
+    try:
+        limit = int(request.query_params.get("limit", 10))
+    except ValueError:
+        limit = 10
+    return Response({"query": query, "results": typeahead.get_index().search(query, limit)})
+
+
+@replica_safe  # a lookup that only takes its DOI list as a POST body
+@api_view(["POST"])
+@permission_classes([AllowAny])
+def resolve_dois(request):
+    """
+    {"dois": [...]} -> {"results": {doi: {id, doi, tc_count, authors} or null}}
+    for up to doi_lookup.MAX_DOIS DOIs; authors are the approved ones.
+    """
+    dois = request.data.get("dois") if isinstance(request.data, dict) else None
+    if not isinstance(dois, list) or not all(isinstance(d, str) for d in dois):
+        return Response({"error": "Expected {\"dois\": [\"10.xxxx/...\", ...]}."}, status=status.HTTP_400_BAD_REQUEST)
+    if len(dois) > doi_lookup.MAX_DOIS:
+        return Response(
+            {"error": f"At most {doi_lookup.MAX_DOIS} DOIs per request."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    results = doi_lookup.resolve(dois)
+    return Response({
+        "found": sum(r is not None for r in results.values()),
+        "missing": sum(r is None for r in results.values()),
+        "results": results,
+    })
+
+
+def _ranked(serializer_class, model, ids, request):
+    # rows for ids already in rank order (N of them, fetched by pk)
+    queryset = model.objects.filter(pk__in=ids)
+    plan = plan_for(serializer_class)
+    if plan is not None:
+        rows = plan.rows(queryset, request)
+    else:
+        rows = serializer_class(queryset, many=True, context={"request": request}).data
+    by_id = {row["id"]: row for row in rows}
+    return [by_id[pk] for pk in ids if pk in by_id]
+
+
+def _ranking_params(request, name, cast=str):
+    """(value or None, limit); ValueError for a malformed value."""
+    raw = request.query_params.get(name)
+    try:
+        limit = int(request.query_params.get("limit", 20))
+    except ValueError:
+        limit = 20
+    return (cast(raw) if raw not in (None, "") else None), max(1, min(limit, ranking.MAX_LIMIT))
+
+
+@api_view(["GET"])
+@permission_classes([AllowAny])
+def top_papers(request):
+    """?year=2024&limit=20: papers by citation score (citations normalized by field and year)."""
+    try:
+        year, limit = _ranking_params(request, "year", int)
+    except ValueError:
+        return Response({"error": "year must be a number."}, status=status.HTTP_400_BAD_REQUEST)
+    ids = ranking.top_papers(year, limit)
+    return Response({"year": year, "results": _ranked(PaperSerializer, Paper, ids, request)})
+
+
+@api_view(["GET"])
+@permission_classes([AllowAny])
+def top_faculty(request):
+    """?department=<name>&limit=20: public faculty by the summed citation score of their papers."""
+    department, limit = _ranking_params(request, "department")
+    ids = ranking.top_faculty(department, limit)
+    return Response({"department": department, "results": _ranked(FacultySerializer, Faculty, ids, request)})
+
+
 # ----------------------------------------
 # PAPERS for logged-in faculty
 # ----------------------------------------
-class MyPapersListCreateView(generics.ListCreateAPIView):
-    serializer_class = PaperSerializer
+class MyPapersListCreateView(FastListMixin, generics.ListCreateAPIView):
+    # every linked paper, pending/rejected too, with this faculty's status
+    # on it (same as the dashboard); the annotation isn't a model field, so
+    # this list always takes the serializer path
+    serializer_class = DashboardPaperSerializer
     permission_classes = [IsAuthenticated]
+    use_primary = True  # own data, must see own writes
 
     def get_queryset(self):
-        return Paper.objects.filter(authors=self.request.user.faculty_profile)
+        # status comes from the same authorship row the filter joins
+        return (
+            Paper.objects.filter(authorships__faculty=get_faculty(self.request).pk)
+            .annotate(authorship_status=F("authorships__status"))
+            .prefetch_related(Prefetch("authors", queryset=Faculty.objects.only("id")))
+        )
 
     def perform_create(self, serializer):
         paper = serializer.save()
-        paper.authors.add(self.request.user.faculty_profile)
-        paper.save()
+        # they added it themselves: nothing left to review
+        paper.authors.add(get_faculty(self.request).pk, through_defaults={"status": "approved"})
+        paper.authorship_status = "approved"
 
 
-class MyProjectsListCreateView(generics.ListCreateAPIView):
+class MyProjectsListCreateView(FastListMixin, generics.ListCreateAPIView):
     serializer_class = ProjectSerializer
     permission_classes = [IsAuthenticated]
+    use_primary = True  # own data, must see own writes
 
     def get_queryset(self):
-        return Project.objects.filter(faculty=self.request.user.faculty_profile)
+        return Project.objects.filter(faculty=get_faculty(self.request).pk)
 
     def perform_create(self, serializer):
-        serializer.save(faculty=self.request.user.faculty_profile)
+        serializer.save(faculty=[get_faculty(self.request).pk])
 
 
-class MyPatentsListCreateView(generics.ListCreateAPIView):
+class MyPatentsListCreateView(FastListMixin, generics.ListCreateAPIView):
     serializer_class = PatentSerializer
     permission_classes = [IsAuthenticated]
+    use_primary = True  # own data, must see own writes
 
     def get_queryset(self):
-        return Patent.objects.filter(faculty=self.request.user.faculty_profile)
+        return Patent.objects.filter(faculty=get_faculty(self.request).pk)
 
     def perform_create(self, serializer):
-        serializer.save(faculty=self.request.user.faculty_profile)
+        serializer.save(faculty=[get_faculty(self.request).pk])
 
 
 from rest_framework.parsers import MultiPartParser, FormParser
@@ -172,16 +343,17 @@ from rest_framework.permissions import IsAuthenticated
 class FacultyPhotoUploadView(APIView):
     parser_classes = (MultiPartParser, FormParser)
     permission_classes = [IsAuthenticated]
+    use_primary = True  # own data, must see own writes
 
     def post(self, request, *args, **kwargs):
-        faculty = request.user.faculty_profile  # FIXED
         photo = request.data.get("photo")
 
         if not photo:
             return Response({"error": "No photo uploaded"}, status=400)
 
+        faculty = get_faculty(request, fresh=True)
         faculty.photo = photo
-        faculty.save()
+        faculty.save(update_fields=["photo", "updated_at"])
 
         return Response({
             "message": "Photo updated",
@@ -193,20 +365,23 @@ class FacultyPhotoUploadView(APIView):
 # ============================
 
 from rest_framework.parsers import MultiPartParser, FormParser
-import pdfplumber
 
 class FacultyUploadCVPapers(APIView):
     parser_classes = (MultiPartParser, FormParser)
     permission_classes = [IsAuthenticated]
+    use_primary = True  # own data, must see own writes
 
     def post(self, request, *args, **kwargs):
-        faculty = request.user.faculty_profile
+        faculty = get_faculty(request)
         file = request.FILES.get("file")
 
         if not file:
             return Response({"error": "No PDF uploaded"}, status=400)
 
         # --- Extract text from PDF using pdfplumber ---
+        # imported here: pdfplumber drags in pdfminer + Pillow, and this is
+        # the only endpoint that needs them
+        import pdfplumber
         try:
             with pdfplumber.open(file) as pdf:
                 full_text = "\n".join([page.extract_text() or "" for page in pdf.pages])
@@ -236,7 +411,7 @@ class FacultyUploadCVPapers(APIView):
                 doi=item["doi"],
                 defaults={"title": item["title"] or "Untitled Paper"}
             )
-            paper.authors.add(faculty)
+            paper.authors.add(faculty.pk, through_defaults={"status": "approved"})
             created.append({"title": paper.title, "doi": paper.doi})
 
         return Response({
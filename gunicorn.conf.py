@@ -0,0 +1,30 @@
+"""
+gunicorn settings, picked up automatically from the working directory
+(render.yaml's startCommand runs from the repo root).
+
+preload_app: Django is set up and the URLconf (every view module) imported
+once in the master, then workers fork with those pages shared copy-on-write
+instead of each importing everything again. Heavy optional dependencies
+(pdfplumber, numpy) stay lazy and are only imported by the worker that first
+needs them. `python manage.py bench_startup` tracks the per-worker cost.
+
+Set GUNICORN_PRELOAD=0 to go back to per-worker loading. Worker count and
+timeout keep gunicorn's defaults (WEB_CONCURRENCY or 1 worker, 30 s).
+"""
+import os
+
+preload_app = os.environ.get("GUNICORN_PRELOAD", "1") != "0"
+
+
+def when_ready(server):
+    if not server.cfg.preload_app:
+        return
+    # resolve the URLconf now so its imports land in the master
+    from django.urls import get_resolver
+    get_resolver().url_patterns
+
+
+def post_fork(server, worker):
+    # never share a DB socket opened in the master with the workers
+    from django.db import connections
+    connections.close_all()
@@ -5,6 +5,37 @@ It exposes the ASGI callable as a module-level variable named ``application``.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
+
+Deployment modes
+----------------
+sync (default, render.yaml):
+    gunicorn scoupdb.wsgi:application
+
+async (uvicorn workers, serves the /api/async/... read endpoints
+without tying a worker to each slow client or upload):
+    gunicorn scoupdb.asgi:application -k uvicorn.workers.UvicornWorker
+
+Sync DRF views keep working under ASGI (Django runs them in a thread).
+Keep CONN_MAX_AGE at 0 in async mode (DB_CONN_MAX_AGE=0): persistent
+connections are per-thread and async views hop threads.
+Compare both with `python manage.py loadtest` (see its --help).
+
+Measured (1 CPU, SQLite, 200 public faculty, one worker each,
+DB_CONN_MAX_AGE=0, loadtest -c 500 -d 20):
+
+    stack                          list cache   req/s    p50 ms    p99 ms
+    gunicorn sync /api/faculty/     off          74.0    6689.5    6902.6
+    uvicorn /api/async/faculty/     off          47.8   10520.6   11075.6
+    gunicorn sync /api/faculty/     on          486.6    1046.8    1213.3
+    uvicorn /api/async/faculty/     on          224.8    2208.3    2488.0
+
+The async list builds its rows like the sync one (.values() fast path,
+list cache) in a thread, and our own middleware is async capable, so the
+event loop is not blocked while a list renders. What is left of the gap
+is Django's stock middleware (sessions, CSRF, auth, messages, ...): under
+ASGI each of them hops to a thread and back, about 16 hops per request
+(cProfile), which the sync deployment never pays. Async is for slow
+clients and uploads, not for raw list throughput.
 """
 
 import os
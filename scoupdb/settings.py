@@ -1,6 +1,8 @@
+from importlib.util import find_spec
 from pathlib import Path
 import os
 import dj_database_url
+from corsheaders.defaults import default_headers
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -30,21 +32,49 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',  
+    'academic.middleware.MediaWhiteNoiseMiddleware',  # whitenoise + /media/
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'academic.db_router.ReplicaRoutingMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "academic.authentication.FacultyJWTAuthentication",
     ),
+    "DEFAULT_RENDERER_CLASSES": [
+        "academic.renderers.ORJSONRenderer",
+        *(["academic.renderers.MsgPackRenderer"] if find_spec("msgpack") else []),
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
 }
 
+SIMPLE_JWT = {
+    # puts the faculty_id claim into the tokens
+    "TOKEN_OBTAIN_SERIALIZER": "academic.authentication.FacultyTokenObtainPairSerializer",
+}
+
+# how often (seconds) a worker checks whether the dataset changed,
+# e.g. to rebuild the typeahead index
+DATASET_VERSION_POLL = int(os.environ.get("DATASET_VERSION_POLL", 10))
+
+# seconds an authenticated user/faculty row stays in the per-process cache
+AUTH_CACHE_TTL = int(os.environ.get("AUTH_CACHE_TTL", 30))
+
+# DOI -> paper results kept per process by the batch resolve endpoint
+DOI_CACHE_SIZE = int(os.environ.get("DOI_CACHE_SIZE", 50000))
+
+# public list responses (faculty, papers): seconds fresh, seconds a stale
+# copy may be served while one request rebuilds it, and how long requests
+# with nothing to serve wait for that rebuild. TTL 0 disables the cache.
+LIST_CACHE_TTL = int(os.environ.get("LIST_CACHE_TTL", 60))
+LIST_CACHE_STALE = int(os.environ.get("LIST_CACHE_STALE", 300))
+LIST_CACHE_WAIT = float(os.environ.get("LIST_CACHE_WAIT", 5))
+
 ROOT_URLCONF = 'scoupdb.urls'
 
 TEMPLATES = [
@@ -70,11 +100,36 @@ WSGI_APPLICATION = 'scoupdb.wsgi.application'
 DATABASES = {
     "default": dj_database_url.config(
         default="sqlite:///db.sqlite3",    # fallback for local dev
-        conn_max_age=600,
+        conn_max_age=int(os.environ.get("DB_CONN_MAX_AGE", 600)),  # 0 under ASGI
         ssl_require=os.environ.get("RENDER", False)
     )
 }
 
+# optional read replicas: DATABASE_REPLICA_URLS="postgres://...,postgres://..."
+# (routing rules in academic/db_router.py)
+for i, url in enumerate(filter(None, os.environ.get("DATABASE_REPLICA_URLS", "").split(",")), 1):
+    DATABASES[f"replica{i}"] = dj_database_url.parse(
+        url.strip(),
+        conn_max_age=DATABASES["default"]["CONN_MAX_AGE"],
+        ssl_require=os.environ.get("RENDER", False),
+    )
+    DATABASES[f"replica{i}"]["TEST"] = {"MIRROR": "default"}
+
+DATABASE_ROUTERS = ["academic.db_router.PrimaryReplicaRouter"]
+
+# seconds a client keeps reading from the primary after a write
+REPLICA_PIN_SECONDS = int(os.environ.get("REPLICA_PIN_SECONDS", 10))
+
+# shared cache (replica pins for bearer clients, see academic/db_router.py);
+# without REDIS_URL each worker has its own LocMem cache
+if os.environ.get("REDIS_URL"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.environ["REDIS_URL"],
+        }
+    }
+
 if os.environ.get("RENDER"):
     DEBUG = False
 
@@ -95,7 +150,16 @@ USE_TZ = True
 
 STATIC_URL = '/static/'
 STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
-STATICFILES_STORAGE = "whitenoise.storage.CompressedManifestStaticFilesStorage"
+
+# uploads are stored under their content hash (deduped, cacheable forever)
+STORAGES = {
+    "default": {
+        "BACKEND": "academic.storage.ContentHashStorage",
+    },
+    "staticfiles": {
+        "BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage",
+    },
+}
 
 
 CORS_ALLOWED_ORIGINS = [
@@ -111,6 +175,11 @@ CORS_ALLOWED_ORIGINS = [
     "https://scoup-frontend-gfuswkjyy-ope-m-ades-projects.vercel.app",
 ]
 
+# read-your-writes pin (academic.db_router): the frontend reads it from
+# write responses and sends it back on the next requests
+CORS_EXPOSE_HEADERS = ["X-Primary-Pin"]
+CORS_ALLOW_HEADERS = (*default_headers, "x-primary-pin")
+
 
 CSRF_TRUSTED_ORIGINS = [
     "http://127.0.0.1:3000",
@@ -125,6 +194,11 @@ CSRF_TRUSTED_ORIGINS = [
     "https://scoup-frontend-gfuswkjyy-ope-m-ades-projects.vercel.app",
 ]
 
+# read-your-writes pin (academic.db_router): the frontend reads it from
+# write responses and sends it back on the next requests
+CORS_EXPOSE_HEADERS = ["X-Primary-Pin"]
+CORS_ALLOW_HEADERS = (*default_headers, "x-primary-pin")
+
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 MEDIA_URL = "/media/"
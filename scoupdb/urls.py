@@ -16,8 +16,6 @@ Including another URLconf
 """
 from django.contrib import admin
 from django.urls import path, include
-from django.conf import settings
-from django.conf.urls.static import static
 from academic import views
 
 
@@ -25,4 +23,4 @@ urlpatterns = [
         path("", views.home),
 	path('admin/', admin.site.urls),
 	path('api/', include('academic.urls')),
-]+ static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+]